@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import deque
+
+from action_mapper import ADJUSTMENT_ACTIONS, execute_action, execute_adjustment
+from frame_pipeline import LatencyStats
+
+
+class _Pending:
+    __slots__ = ("action", "kind", "steps", "queued_at")
+
+    def __init__(self, action, kind, steps, queued_at):
+        self.action = action
+        self.kind = kind
+        self.steps = steps
+        self.queued_at = queued_at
+
+
+class ActionExecutor:
+    """
+    Runs desktop actions on a worker thread so the detection thread never waits on
+    OS side effects (PowerShell, osascript, key injection).
+
+    The queue is bounded. Volume/brightness/scroll steps still waiting in the queue
+    are merged into one net adjustment of their kind (up + up + down = one step up).
+    A one-shot action already waiting is not queued a second time. Per-action latency
+    (queued to finished) and execution time are recorded for the status message.
+    """
+
+    def __init__(self, max_pending=16):
+        self.max_pending = max_pending
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+        self.submitted = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self._latency = {}
+        self._execution = {}
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="ActionThread", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def submit(self, action_name):
+        """Queue an action; returns False if it was dropped (duplicate one-shot or full queue)."""
+        if self._thread is None:
+            self.start()
+
+        now = time.time()
+        adjustment = ADJUSTMENT_ACTIONS.get(action_name)
+        with self._cond:
+            self.submitted += 1
+            if adjustment is not None:
+                kind, steps = adjustment
+                for pending in self._pending:
+                    if pending.kind == kind:
+                        pending.steps += steps
+                        self.coalesced += 1
+                        return True
+            elif any(pending.action == action_name for pending in self._pending):
+                self.dropped += 1
+                return False
+
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return False
+
+            if adjustment is not None:
+                self._pending.append(_Pending(kind, kind, steps, now))
+            else:
+                self._pending.append(_Pending(action_name, None, 0, now))
+            self._cond.notify()
+            return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                pending = self._pending.popleft()
+
+            started = time.time()
+            if pending.kind is not None:
+                if pending.steps:
+                    execute_adjustment(pending.kind, pending.steps)
+            else:
+                execute_action(pending.action)
+            finished = time.time()
+
+            with self._cond:
+                self.executed += 1
+                self._stats(self._latency, pending.action).add(finished - pending.queued_at)
+                self._stats(self._execution, pending.action).add(finished - started)
+
+    @staticmethod
+    def _stats(table, action):
+        stats = table.get(action)
+        if stats is None:
+            stats = table[action] = LatencyStats(window=60)
+        return stats
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "queue_depth": len(self._pending),
+                "submitted": self.submitted,
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "latency": {action: stats.snapshot() for action, stats in self._latency.items()},
+                "execution": {action: stats.snapshot() for action, stats in self._execution.items()},
+            }
+
+
+action_executor = ActionExecutor()
@@ -1,61 +1,60 @@
+from action_registry import ActionRegistry
 from desktop_controller import desktop_controller
 
 ACTION_MAP = {
-    "Swipe Left": "previous_track",
+    "Swipe Left": "prev_track",
     "Swipe Right": "next_track",
     "Thumbs Up": "play_pause",
-    "Peace Sign": "volume_mute",
+    "Peace Sign": "mute",
     "Open Palm": "volume_up",
     "Closed Fist": "volume_down"
 }
 
+# Repeatable step actions: (adjustment kind, direction). Queued steps of the same
+# kind are merged into one net adjustment by the action executor.
+ADJUSTMENT_ACTIONS = {
+    "volume_up": ("volume", 1),
+    "volume_down": ("volume", -1),
+    "brightness_up": ("brightness", 1),
+    "brightness_down": ("brightness", -1),
+    "scroll_up": ("scroll", 1),
+    "scroll_down": ("scroll", -1),
+}
+
+action_registry = ActionRegistry()
+
+for _name, _description in (
+    ("prev_track", "Previous track"),
+    ("next_track", "Next track"),
+    ("play_pause", "Play / pause"),
+    ("mute", "Mute"),
+    ("volume_up", "Volume up"),
+    ("volume_down", "Volume down"),
+    ("scroll_up", "Scroll up"),
+    ("scroll_down", "Scroll down"),
+    ("brightness_up", "Brightness up"),
+    ("brightness_down", "Brightness down"),
+    ("switch_tab", "Switch tab"),
+    ("switch_desktop_left", "Desktop left"),
+    ("switch_desktop_right", "Desktop right"),
+    ("screenshot", "Screenshot"),
+    ("minimize_window", "Minimize window"),
+):
+    action_registry.register(_name, getattr(desktop_controller, _name), description=_description)
+
+# Names used by older gestures.json files.
+action_registry.alias("previous_track", "prev_track")
+action_registry.alias("volume_mute", "mute")
+
+action_registry.register_adjustment("volume", desktop_controller.adjust_volume)
+action_registry.register_adjustment("brightness", desktop_controller.adjust_brightness)
+action_registry.register_adjustment("scroll", desktop_controller.scroll)
+
+def execute_adjustment(kind, steps):
+    """Applies a net volume/brightness/scroll change of `steps` steps in one OS call."""
+    print(f"Adjusting {kind} by {steps:+d}")
+    action_registry.adjust(kind, steps)
+
 def execute_action(action_name):
     """Executes the mapped action safely using the platform-specific controller."""
-    try:
-
-        if action_name == "prev_track":
-            desktop_controller.prev_track()
-        elif action_name == "next_track":
-            desktop_controller.next_track()
-        elif action_name == "play_pause":
-            desktop_controller.play_pause()
-
-        elif action_name == "mute":
-            desktop_controller.mute()
-        elif action_name == "volume_up":
-            desktop_controller.volume_up()
-        elif action_name == "volume_down":
-            desktop_controller.volume_down()
-
-        elif action_name == "scroll_up":
-            desktop_controller.scroll_up()
-        elif action_name == "scroll_down":
-            desktop_controller.scroll_down()
-
-        elif action_name == "brightness_up":
-            desktop_controller.brightness_up()
-        elif action_name == "brightness_down":
-            desktop_controller.brightness_down()
-
-        elif action_name == "switch_tab":
-            desktop_controller.switch_tab()
-        elif action_name == "switch_desktop_left":
-            desktop_controller.switch_desktop_left()
-        elif action_name == "switch_desktop_right":
-            desktop_controller.switch_desktop_right()
-        elif action_name == "screenshot":
-            desktop_controller.screenshot()
-        elif action_name == "minimize_window":
-
-            import pyautogui
-            import platform
-            if platform.system() == "Darwin":
-                pyautogui.hotkey("command", "m")
-            else:
-                pyautogui.hotkey("win", "down")
-
-        else:
-            print(f"Unknown or unmapped action: {action_name}")
-
-    except Exception as e:
-        print(f"Error executing action {action_name}: {e}")
+    action_registry.execute(action_name)
@@ -0,0 +1,280 @@
+import bisect
+import json
+import os
+import shlex
+import subprocess
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+from frame_pipeline import LatencyStats
+from input_backends import check_key, get_backend
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket counts everything slower.
+HISTOGRAM_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Actions handled by the detection loop itself rather than dispatched to the desktop.
+ENGINE_ACTIONS = ("None", "toggle_cursor")
+
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+class ActionMetrics:
+    """Call count, failures and a latency histogram for one action."""
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.last_error = None
+        self.histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        self.latency = LatencyStats(window=120)
+
+    def record(self, seconds, error=None):
+        self.calls += 1
+        if error is not None:
+            self.failures += 1
+            self.last_error = str(error)
+        self.histogram[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, seconds * 1000)] += 1
+        self.latency.add(seconds)
+
+    def snapshot(self):
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "latency": self.latency.snapshot(),
+            "histogram": {"buckets_ms": list(HISTOGRAM_BUCKETS_MS), "counts": list(self.histogram)},
+        }
+
+
+class Action:
+    __slots__ = ("name", "run", "kind", "description")
+
+    def __init__(self, name, run, kind="builtin", description=""):
+        self.name = name
+        self.run = run
+        self.kind = kind
+        self.description = description
+
+    def describe(self):
+        return {"name": self.name, "kind": self.kind, "description": self.description}
+
+
+def build_macro(spec):
+    """
+    Keyboard macro: "steps" is a list of hotkeys ("ctrl+shift+t"), {"text": "..."} to type
+    and {"wait": seconds} pauses. Key names are checked here, so a typo is reported when
+    actions.json is loaded rather than when the gesture fires.
+    """
+    steps = []
+    for step in spec.get("steps") or []:
+        if isinstance(step, str):
+            keys = [key.strip() for key in step.split("+") if key.strip()]
+            if not keys:
+                raise ValueError("empty hotkey in macro")
+            for key in keys:
+                check_key(key)
+            steps.append(("hotkey", keys))
+        elif isinstance(step, dict) and "text" in step:
+            steps.append(("text", str(step["text"])))
+        elif isinstance(step, dict) and "wait" in step:
+            wait = float(step["wait"])
+            if not 0 <= wait <= 5:
+                raise ValueError("macro waits must be between 0 and 5 seconds")
+            steps.append(("wait", wait))
+        else:
+            raise ValueError(f"Unknown macro step: {step!r}")
+    if not steps:
+        raise ValueError("macro needs at least one step")
+
+    def run():
+        for kind, value in steps:
+            if kind == "hotkey":
+                get_backend().hotkey(*value)
+            elif kind == "text":
+                get_backend().write(value)
+            else:
+                time.sleep(value)
+
+    return run
+
+
+def build_webhook(spec):
+    """HTTP request to a service on this machine: "url", optional "method" (POST) and JSON "body"."""
+    url = spec.get("url")
+    parsed = urllib.parse.urlparse(url or "")
+    if parsed.scheme not in ("http", "https") or parsed.hostname not in LOCAL_HOSTS:
+        raise ValueError("webhook url must be http(s) on localhost")
+    method = str(spec.get("method", "POST")).upper()
+    timeout = float(spec.get("timeout", 2.0))
+    data = None
+    headers = {}
+    if "body" in spec:
+        data = json.dumps(spec["body"]).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+
+    def run():
+        request = urllib.request.Request(url, data=data, headers=headers, method=method)
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+
+    return run
+
+
+def build_shell(spec):
+    """Command run without a shell: "command" is an argument list or a string split like a shell would."""
+    command = spec.get("command")
+    argv = shlex.split(command) if isinstance(command, str) else [str(arg) for arg in command or []]
+    if not argv:
+        raise ValueError("shell action needs a command")
+    timeout = float(spec.get("timeout", 5.0))
+
+    def run():
+        result = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"exit code {result.returncode}: {result.stderr.strip()[:200]}")
+
+    return run
+
+
+PLUGIN_TYPES = {
+    "macro": build_macro,
+    "webhook": build_webhook,
+    "shell": build_shell,
+}
+
+
+def register_plugin_type(kind, builder):
+    """Add an action type for actions.json; `builder(spec)` validates the entry and returns a callable."""
+    PLUGIN_TYPES[kind] = builder
+
+
+class ActionRegistry:
+    """
+    Maps action names to prebuilt callables, so executing an action is one dict lookup.
+
+    Built-in actions are registered at import; plugin actions (macros, webhooks, shell
+    commands) come from actions.json and are rebuilt as a whole on reload. Every call
+    records its count, failures and latency.
+    """
+
+    def __init__(self):
+        self._builtin = {}
+        self._plugins = {}
+        self._aliases = {}
+        self._adjustments = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, run, kind="builtin", description=""):
+        self._builtin[name] = Action(name, run, kind, description)
+
+    def alias(self, alias, name):
+        """Accept an older or alternative name for an action."""
+        self._aliases[alias] = name
+
+    def register_adjustment(self, kind, run):
+        """`run(steps)` applies a net volume/brightness/scroll change."""
+        self._adjustments[kind] = run
+
+    def resolve(self, name):
+        """Canonical name of an action, or None if there is no such action."""
+        name = self._aliases.get(name, name)
+        if name in ENGINE_ACTIONS or name in self._builtin or name in self._plugins:
+            return name
+        return None
+
+    def get(self, name):
+        name = self._aliases.get(name, name)
+        return self._builtin.get(name) or self._plugins.get(name)
+
+    def check(self, name):
+        """Raises ValueError if `name` is not a known action."""
+        if self.resolve(name) is None:
+            raise ValueError(f"Unknown action: {name}")
+
+    def validate_gestures(self, gestures):
+        """
+        Rewrite aliased action names in the gesture list to their canonical names.
+        Returns the (gesture name, action) pairs that are not known actions.
+        """
+        unknown = []
+        for gesture in gestures:
+            action = gesture.get("action")
+            resolved = self.resolve(action)
+            if resolved is None:
+                unknown.append((gesture.get("name"), action))
+            elif resolved != action:
+                gesture["action"] = resolved
+        return unknown
+
+    def load_plugins(self, path="actions.json"):
+        """(Re)build plugin actions from a JSON list of {"name", "type", ...}; returns error messages."""
+        if not os.path.exists(path):
+            with self._lock:
+                self._plugins = {}
+            return []
+        try:
+            with open(path, "r") as f:
+                specs = json.load(f)
+        except (OSError, ValueError) as e:
+            return [f"Could not read {path}: {e}"]
+
+        plugins, errors = {}, []
+        for spec in specs if isinstance(specs, list) else []:
+            name = spec.get("name") if isinstance(spec, dict) else None
+            builder = PLUGIN_TYPES.get(spec.get("type")) if isinstance(spec, dict) else None
+            if not name or builder is None:
+                errors.append(f"Invalid action entry: {spec!r}")
+                continue
+            if name in self._builtin or name in ENGINE_ACTIONS or name in plugins:
+                errors.append(f"Action {name} is already defined")
+                continue
+            try:
+                plugins[name] = Action(name, builder(spec), spec["type"], spec.get("description", ""))
+            except (ValueError, TypeError) as e:
+                errors.append(f"Action {name}: {e}")
+        with self._lock:
+            self._plugins = plugins
+        return errors
+
+    def execute(self, name):
+        """Run an action; returns False if it is unknown or failed."""
+        action = self.get(name)
+        if action is None:
+            print(f"Unknown or unmapped action: {name}")
+            return False
+        return self._call(action.name, action.run)
+
+    def adjust(self, kind, steps):
+        run = self._adjustments.get(kind)
+        if run is None:
+            print(f"Unknown adjustment: {kind}")
+            return False
+        return self._call(kind, run, steps)
+
+    def _call(self, name, run, *args):
+        error = None
+        started = time.perf_counter()
+        try:
+            run(*args)
+        except Exception as e:
+            error = e
+            print(f"Error executing action {name}: {e}")
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            metrics = self._metrics.get(name)
+            if metrics is None:
+                metrics = self._metrics[name] = ActionMetrics()
+            metrics.record(elapsed, error)
+        return error is None
+
+    def describe(self):
+        actions = list(self._builtin.values()) + list(self._plugins.values())
+        return [action.describe() for action in actions]
+
+    def snapshot(self):
+        with self._lock:
+            return {name: metrics.snapshot() for name, metrics in self._metrics.items()}
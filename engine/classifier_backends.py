@@ -0,0 +1,417 @@
+import copy
+import time
+import numpy as np
+
+
+class ClassifierBackend:
+    """
+    Interface for the model behind GestureClassifier.
+
+    fit() takes a contiguous (N, 63) float32 matrix of normalized landmarks and a label
+    vector. Inference is pure numpy: predict_proba_one() for the per-frame hot path and
+    predict_proba() for batches, both returning probabilities ordered like classes_.
+
+    Published backends are never mutated: without_class() and with_class() return
+    updated copies so the caller can swap its reference atomically.
+    """
+
+    name = None
+    supports_incremental = False
+
+    def __init__(self):
+        self.classes_ = None
+        # Boolean mask over classes_ of gestures deleted since the last fit.
+        self.removed = None
+
+    def fit(self, X, y):
+        raise NotImplementedError
+
+    def predict_proba(self, X):
+        raise NotImplementedError
+
+    def predict_proba_one(self, x):
+        return self.predict_proba(x.reshape(1, -1))[0]
+
+    @property
+    def nbytes(self):
+        raise NotImplementedError
+
+    def predicts(self, label):
+        """Whether `label` is a class of this model that has not been removed since the last fit."""
+        match = self.classes_ == label
+        if not match.any():
+            return False
+        return self.removed is None or not self.removed[match].any()
+
+    def without_class(self, label):
+        """
+        Copy of this backend that no longer predicts `label`. The class keeps its output
+        with the probability zeroed and the other outputs are not renormalized, so the
+        deleted pose stays low-confidence instead of turning into its nearest gesture.
+        """
+        removed = np.zeros(len(self.classes_), dtype=bool) if self.removed is None else self.removed.copy()
+        removed |= self.classes_ == label
+        other = copy.copy(self)
+        other.removed = removed
+        return other
+
+    def with_class(self, label, X):
+        """Copy of this backend with `label` (re)fitted from X alone. Only if supports_incremental."""
+        raise NotImplementedError(f"{self.name} backend needs a full refit")
+
+    def refit_without(self, label):
+        """Copy of this backend as if `label` had never been fitted. Only if supports_incremental."""
+        raise NotImplementedError(f"{self.name} backend needs a full refit")
+
+    def _suppress(self, probabilities):
+        if self.removed is not None:
+            probabilities[..., self.removed] = 0.0
+        return probabilities
+
+    # Attributes saved by to_arrays() and restored by from_arrays().
+    ARRAYS = ()
+    PARAMS = ()
+
+    def to_arrays(self):
+        """(params, arrays) describing the fitted model, for model_format.save_model_file."""
+        params = {name: getattr(self, name) for name in self.PARAMS}
+        arrays = {name: getattr(self, name) for name in self.ARRAYS}
+        arrays["classes_"] = np.asarray(self.classes_).astype(str)
+        if self.removed is not None:
+            arrays["removed"] = self.removed
+        return params, arrays
+
+    @classmethod
+    def from_arrays(cls, params, arrays):
+        backend = cls(**{k: v for k, v in params.items() if k in cls.PARAMS})
+        for name in cls.ARRAYS:
+            setattr(backend, name, arrays[name])
+        backend.classes_ = arrays["classes_"]
+        backend.removed = arrays.get("removed")
+        backend._after_load(params)
+        return backend
+
+    def _after_load(self, params):
+        pass
+
+    def _encode_labels(self, y):
+        self.classes_, indices = np.unique(np.asarray(y), return_inverse=True)
+        return indices
+
+
+def _softmax(z):
+    z = z - z.max(axis=-1, keepdims=True)
+    np.exp(z, out=z)
+    z /= z.sum(axis=-1, keepdims=True)
+    return z
+
+
+class RandomForestBackend(ClassifierBackend):
+    """sklearn RandomForest for fitting, evaluated through a CompiledForest."""
+
+    name = "random_forest"
+
+    def __init__(self, n_estimators=100):
+        super().__init__()
+        self.n_estimators = n_estimators
+        self.model = None
+        self.engine = None
+
+    @classmethod
+    def from_model(cls, model):
+        from forest_inference import CompiledForest
+        backend = cls(n_estimators=len(model.estimators_))
+        backend.model = model
+        backend.engine = CompiledForest.from_sklearn(model)
+        backend.classes_ = backend.engine.classes_
+        return backend
+
+    def fit(self, X, y):
+        from sklearn.ensemble import RandomForestClassifier
+        from forest_inference import CompiledForest
+        self.model = RandomForestClassifier(n_estimators=self.n_estimators)
+        self.model.fit(X, y)
+        self.engine = CompiledForest.from_sklearn(self.model)
+        self.classes_ = self.engine.classes_
+
+    def predict_proba(self, X):
+        return self._suppress(self.engine.predict_proba(X))
+
+    def predict_proba_one(self, x):
+        return self._suppress(self.engine.predict_proba_one(x))
+
+    def to_arrays(self):
+        engine = self.engine
+        params = {"n_estimators": self.n_estimators, "max_depth": engine.max_depth}
+        arrays = {
+            "roots": engine.roots, "feature": engine.feature, "threshold": engine.threshold,
+            "left": engine.left, "right": engine.right, "leaf_proba": engine.leaf_proba,
+            "classes_": np.asarray(engine.classes_).astype(str),
+        }
+        if self.removed is not None:
+            arrays["removed"] = self.removed
+        return params, arrays
+
+    @classmethod
+    def from_arrays(cls, params, arrays):
+        from forest_inference import CompiledForest
+        backend = cls(n_estimators=params["n_estimators"])
+        backend.engine = CompiledForest(
+            arrays["classes_"], arrays["roots"], arrays["feature"], arrays["threshold"],
+            arrays["left"], arrays["right"], arrays["leaf_proba"], params["max_depth"],
+        )
+        backend.classes_ = backend.engine.classes_
+        backend.removed = arrays.get("removed")
+        return backend
+
+    @property
+    def nbytes(self):
+        return self.engine.nbytes
+
+
+class CentroidBackend(ClassifierBackend):
+    """
+    Nearest class centroid. Probabilities are a softmax over negative squared
+    distances, scaled by the pooled within-class variance.
+    """
+
+    name = "centroid"
+    supports_incremental = True
+    ARRAYS = ("centroids", "counts", "sq_dist")
+
+    def __init__(self):
+        super().__init__()
+        self.centroids = None
+        self.counts = None
+        self.sq_dist = None
+        self.inv_scale = 1.0
+
+    @staticmethod
+    def _class_stats(X):
+        centroid = X.mean(axis=0)
+        return centroid, len(X), float(np.sum((X - centroid) ** 2))
+
+    def _update_scale(self):
+        spread = self.sq_dist.sum() / max(self.counts.sum(), 1)
+        self.inv_scale = 1.0 / (2.0 * max(float(spread), 1e-6))
+
+    def fit(self, X, y):
+        indices = self._encode_labels(y)
+        X = np.asarray(X, dtype=np.float32)
+        stats = [self._class_stats(X[indices == k]) for k in range(len(self.classes_))]
+        self.centroids = np.stack([s[0] for s in stats]).astype(np.float32)
+        self.counts = np.array([s[1] for s in stats], dtype=np.int64)
+        self.sq_dist = np.array([s[2] for s in stats], dtype=np.float64)
+        self._update_scale()
+
+    def with_class(self, label, X):
+        centroid, count, sq_dist = self._class_stats(np.asarray(X, dtype=np.float32))
+        other = copy.copy(self)
+        match = np.flatnonzero(self.classes_ == label)
+        if len(match):
+            k = match[0]
+            other.centroids = self.centroids.copy()
+            other.counts = self.counts.copy()
+            other.sq_dist = self.sq_dist.copy()
+            other.centroids[k], other.counts[k], other.sq_dist[k] = centroid, count, sq_dist
+            if self.removed is not None:
+                other.removed = self.removed.copy()
+                other.removed[k] = False
+        else:
+            other.classes_ = np.append(self.classes_, label)
+            other.centroids = np.vstack([self.centroids, centroid[None, :]]).astype(np.float32)
+            other.counts = np.append(self.counts, count)
+            other.sq_dist = np.append(self.sq_dist, sq_dist)
+            if self.removed is not None:
+                other.removed = np.append(self.removed, False)
+        other._update_scale()
+        return other
+
+    def refit_without(self, label):
+        keep = self.classes_ != label
+        other = copy.copy(self)
+        other.classes_ = self.classes_[keep]
+        other.removed = None if self.removed is None else self.removed[keep]
+        other.centroids = self.centroids[keep]
+        other.counts = self.counts[keep]
+        other.sq_dist = self.sq_dist[keep]
+        other._update_scale()
+        return other
+
+    def _after_load(self, params):
+        self._update_scale()
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        d2 = (X * X).sum(axis=1)[:, None] - 2.0 * X @ self.centroids.T + (self.centroids ** 2).sum(axis=1)
+        return self._suppress(_softmax(-d2 * self.inv_scale))
+
+    @property
+    def nbytes(self):
+        return self.centroids.nbytes
+
+
+class LinearBackend(ClassifierBackend):
+    """Multinomial logistic regression; fitted with sklearn, evaluated as a single matmul."""
+
+    name = "linear"
+    ARRAYS = ("coef", "intercept")
+    PARAMS = ("C",)
+
+    def __init__(self, C=10.0):
+        super().__init__()
+        self.C = C
+        self.coef = None
+        self.intercept = None
+
+    def fit(self, X, y):
+        from sklearn.linear_model import LogisticRegression
+        indices = self._encode_labels(y)
+        model = LogisticRegression(C=self.C, max_iter=1000)
+        model.fit(X, indices)
+        coef, intercept = model.coef_, model.intercept_
+        if len(self.classes_) == 2:
+            coef = np.vstack([-coef, coef]) / 2
+            intercept = np.array([-intercept[0], intercept[0]]) / 2
+        self.coef = np.ascontiguousarray(coef.T, dtype=np.float32)
+        self.intercept = intercept.astype(np.float32)
+
+    def predict_proba(self, X):
+        return self._suppress(_softmax(np.asarray(X, dtype=np.float32) @ self.coef + self.intercept))
+
+    @property
+    def nbytes(self):
+        return self.coef.nbytes + self.intercept.nbytes
+
+
+class MLPBackend(ClassifierBackend):
+    """One-hidden-layer ReLU network trained with mini-batch Adam, all in numpy."""
+
+    name = "mlp"
+    PARAMS = ("hidden", "epochs", "batch_size", "learning_rate", "weight_decay", "seed")
+
+    def __init__(self, hidden=64, epochs=60, batch_size=64, learning_rate=0.01, weight_decay=1e-4, seed=0):
+        super().__init__()
+        self.hidden = hidden
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self.weight_decay = weight_decay
+        self.seed = seed
+        self.params = None
+
+    def fit(self, X, y):
+        indices = self._encode_labels(y)
+        X = np.asarray(X, dtype=np.float32)
+        n, d = X.shape
+        k = len(self.classes_)
+        rng = np.random.default_rng(self.seed)
+
+        params = [
+            (rng.standard_normal((d, self.hidden)) * np.sqrt(2.0 / d)).astype(np.float32),
+            np.zeros(self.hidden, dtype=np.float32),
+            (rng.standard_normal((self.hidden, k)) * np.sqrt(1.0 / self.hidden)).astype(np.float32),
+            np.zeros(k, dtype=np.float32),
+        ]
+        m = [np.zeros_like(p) for p in params]
+        v = [np.zeros_like(p) for p in params]
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        one_hot = np.eye(k, dtype=np.float32)[indices]
+        step = 0
+
+        for _ in range(self.epochs):
+            order = rng.permutation(n)
+            for start in range(0, n, self.batch_size):
+                batch = order[start:start + self.batch_size]
+                xb, yb = X[batch], one_hot[batch]
+                w1, b1, w2, b2 = params
+
+                hidden = np.maximum(xb @ w1 + b1, 0)
+                grad_out = (_softmax(hidden @ w2 + b2) - yb) / len(batch)
+                grad_hidden = (grad_out @ w2.T) * (hidden > 0)
+                grads = [
+                    xb.T @ grad_hidden + self.weight_decay * w1,
+                    grad_hidden.sum(axis=0),
+                    hidden.T @ grad_out + self.weight_decay * w2,
+                    grad_out.sum(axis=0),
+                ]
+
+                step += 1
+                for i, g in enumerate(grads):
+                    m[i] = beta1 * m[i] + (1 - beta1) * g
+                    v[i] = beta2 * v[i] + (1 - beta2) * g * g
+                    m_hat = m[i] / (1 - beta1 ** step)
+                    v_hat = v[i] / (1 - beta2 ** step)
+                    params[i] -= (self.learning_rate * m_hat / (np.sqrt(v_hat) + eps)).astype(np.float32)
+
+        self.params = params
+
+    def predict_proba(self, X):
+        w1, b1, w2, b2 = self.params
+        hidden = np.maximum(np.asarray(X, dtype=np.float32) @ w1 + b1, 0)
+        return self._suppress(_softmax(hidden @ w2 + b2))
+
+    def to_arrays(self):
+        params, arrays = super().to_arrays()
+        arrays.update(zip(("w1", "b1", "w2", "b2"), self.params))
+        return params, arrays
+
+    @classmethod
+    def from_arrays(cls, params, arrays):
+        backend = super().from_arrays(params, arrays)
+        backend.params = [arrays["w1"], arrays["b1"], arrays["w2"], arrays["b2"]]
+        return backend
+
+    @property
+    def nbytes(self):
+        return sum(p.nbytes for p in self.params)
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (RandomForestBackend, CentroidBackend, LinearBackend, MLPBackend)
+}
+
+DEFAULT_BACKEND = RandomForestBackend.name
+
+
+def create_backend(name):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown classifier backend '{name}'. Available: {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
+
+
+def benchmark_backends(X_train, y_train, X_test, y_test, names=None, latency_samples=200):
+    """
+    Fit every backend on the same split and measure accuracy, training time,
+    single-sample inference latency and model size.
+    """
+    X_test = np.ascontiguousarray(X_test, dtype=np.float32)
+    y_test = np.asarray(y_test)
+    results = []
+
+    for name in names or BACKENDS:
+        backend = create_backend(name)
+
+        started = time.perf_counter()
+        backend.fit(X_train, y_train)
+        train_seconds = time.perf_counter() - started
+
+        predicted = backend.classes_[np.argmax(backend.predict_proba(X_test), axis=1)]
+        accuracy = float(np.mean(predicted == y_test)) if len(y_test) else 0.0
+
+        probe = X_test[:latency_samples] if len(X_test) else np.zeros((1, X_train.shape[1]), dtype=np.float32)
+        started = time.perf_counter()
+        for x in probe:
+            backend.predict_proba_one(x)
+        infer_seconds = (time.perf_counter() - started) / len(probe)
+
+        results.append({
+            "backend": name,
+            "accuracy": round(accuracy * 100, 2),
+            "train_ms": round(train_seconds * 1000, 1),
+            "infer_us": round(infer_seconds * 1e6, 1),
+            "size_bytes": int(backend.nbytes),
+        })
+
+    return results
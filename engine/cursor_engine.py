@@ -0,0 +1,252 @@
+import math
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from frame_pipeline import LatencyStats
+
+# Below this filtered speed (px/s) the hand counts as still, for the jitter metric.
+STILL_SPEED = 60.0
+# Prediction fades in between STILL_SPEED and this speed, so it doesn't amplify jitter at rest.
+PREDICT_SPEED = 4 * STILL_SPEED
+# Without a new landmark update for this long the output thread goes idle.
+IDLE_AFTER = 0.25
+# Never extrapolate further than this past the newest sample.
+MAX_EXTRAPOLATION = 0.1
+
+
+class OneEuroFilter:
+    """
+    One Euro filter (Casiez et al.) over a 2D point: a low-pass filter whose cutoff rises
+    with speed, so a still hand is smoothed hard (no jitter) and a fast one barely at all
+    (no lag). `min_cutoff` (Hz) sets the smoothing at rest, `beta` how fast it opens up.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.01, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.velocity = np.zeros(2)
+        self._time = 0.0
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, point, timestamp):
+        point = np.asarray(point, dtype=np.float64)
+        if self.value is None:
+            self.value = point.copy()
+            self._time = timestamp
+            return self.value
+        dt = timestamp - self._time
+        if dt <= 0:
+            return self.value
+        self._time = timestamp
+
+        raw_velocity = (point - self.value) / dt
+        self.velocity += self._alpha(self.d_cutoff, dt) * (raw_velocity - self.velocity)
+        cutoff = self.min_cutoff + self.beta * float(np.hypot(*self.velocity))
+        self.value += self._alpha(cutoff, dt) * (point - self.value)
+        return self.value
+
+
+class CursorEngine:
+    """
+    Moves the cursor from its own output thread at `rate` Hz, decoupled from the
+    detection cadence.
+
+    The detection thread pushes screen-space targets with their capture timestamps.
+    They are smoothed by a One Euro filter. Between updates the output thread
+    extrapolates the filtered position along the filtered velocity, `prediction`
+    seconds ahead of the capture time (bounded by MAX_EXTRAPOLATION), which hides most
+    of the capture-to-screen latency. Prediction only applies once the hand is clearly
+    moving, since extrapolating a noisy velocity at rest would add jitter. Each tick
+    eases towards that target, so a new sample never makes the cursor jump.
+
+    Metrics for tuning:
+    - jitter_px: RMS deviation of the output (and of the raw input) while the hand is still.
+    - latency: capture time of a sample to the first cursor move that includes it.
+    """
+
+    def __init__(self, move, rate=120.0, prediction=0.04, min_cutoff=1.0, beta=0.01, ease=0.012):
+        self._move = move
+        self.rate = rate
+        self.prediction = prediction
+        self.ease = ease
+        self.filter = OneEuroFilter(min_cutoff, beta)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+        self._sample = None
+        self._sample_time = 0.0
+        self._pending_capture = None
+        self._output = None
+        self._held = False
+        # (left, top, right, bottom) of the desktop, set by the cursor mapping.
+        self.bounds = None
+        self.last_output = None
+
+        self.latency = LatencyStats(window=240)
+        self.move_time = LatencyStats(window=240)
+        self._still_output = deque(maxlen=120)
+        self._still_raw = deque(maxlen=120)
+        self.samples = 0
+        self.moves = 0
+
+    def configure(self, rate=None, prediction=None, min_cutoff=None, beta=None):
+        with self._cond:
+            if rate is not None:
+                self.rate = float(rate)
+            if prediction is not None:
+                self.prediction = float(prediction)
+            if min_cutoff is not None:
+                self.filter.min_cutoff = float(min_cutoff)
+            if beta is not None:
+                self.filter.beta = float(beta)
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="CursorThread", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def push(self, x, y, timestamp):
+        """New target in screen pixels, measured from a frame captured at `timestamp`."""
+        if self._thread is None:
+            self.start()
+        with self._cond:
+            raw = np.array((x, y), dtype=np.float64)
+            value = self.filter.filter(raw, timestamp).copy()
+            if float(np.hypot(*self.filter.velocity)) < STILL_SPEED:
+                self._still_raw.append(raw)
+            else:
+                self._still_raw.clear()
+            self._sample = (value, self.filter.velocity.copy(), timestamp)
+            self._sample_time = time.time()
+            if self._pending_capture is None:
+                self._pending_capture = timestamp
+            self.samples += 1
+            self._cond.notify()
+
+    def hold(self, held):
+        """Keep the cursor where it is (e.g. while pinching to click)."""
+        with self._cond:
+            self._held = held
+
+    def release(self):
+        """Forget the hand, so the next push starts from where it is instead of gliding there."""
+        with self._cond:
+            self.filter.reset()
+            self._sample = None
+            self._output = None
+            self._pending_capture = None
+            self._still_output.clear()
+            self._still_raw.clear()
+
+    def _target(self, now):
+        value, velocity, captured = self._sample
+        speed = float(np.hypot(*velocity))
+        gain = min(max((speed - STILL_SPEED) / (PREDICT_SPEED - STILL_SPEED), 0.0), 1.0)
+        ahead = min(now - captured + self.prediction, MAX_EXTRAPOLATION + self.prediction)
+        target = value + velocity * (gain * max(ahead, 0.0))
+        if self.bounds is not None:
+            np.clip(target, self.bounds[:2], self.bounds[2:], out=target)
+        return target
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        while True:
+            with self._cond:
+                while self._running and (self._sample is None or time.time() - self._sample_time > IDLE_AFTER):
+                    self._output = None
+                    self._cond.wait(IDLE_AFTER)
+                if not self._running:
+                    return
+                now = time.time()
+                target = self._target(now)
+                held = self._held
+                captured, self._pending_capture = self._pending_capture, None
+                interval = 1.0 / max(self.rate, 1.0)
+                still = float(np.hypot(*self._sample[1])) < STILL_SPEED
+
+                if self._output is None:
+                    output = target
+                else:
+                    blend = 1.0 - math.exp(-interval / self.ease) if self.ease > 0 else 1.0
+                    output = self._output + (target - self._output) * blend
+
+            if not held and (self._output is None or float(np.abs(output - self._output).max()) >= 0.5):
+                started = time.perf_counter()
+                try:
+                    self._move(float(output[0]), float(output[1]))
+                    self.last_output = (float(output[0]), float(output[1]))
+                except Exception as e:
+                    print(f"Cursor move error: {e}")
+                self.move_time.add(time.perf_counter() - started)
+                self.moves += 1
+
+            finished = time.time()
+            with self._cond:
+                if self._sample is not None:
+                    self._output = output
+                if captured is not None:
+                    self.latency.add(finished - captured)
+                if still:
+                    self._still_output.append(output)
+                else:
+                    self._still_output.clear()
+
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+    @staticmethod
+    def _rms(points):
+        if len(points) < 2:
+            return 0.0
+        points = np.array(points)
+        return round(float(np.sqrt(((points - points.mean(axis=0)) ** 2).sum(axis=1).mean())), 2)
+
+    def snapshot(self):
+        with self._cond:
+            jitter, raw_jitter = self._rms(self._still_output), self._rms(self._still_raw)
+            settings = {
+                "rate": self.rate,
+                "prediction_ms": round(self.prediction * 1000, 1),
+                "min_cutoff": self.filter.min_cutoff,
+                "beta": self.filter.beta,
+            }
+        latency = self.latency.snapshot()
+        return {
+            "active": self._sample is not None and time.time() - self._sample_time <= IDLE_AFTER,
+            "samples": self.samples,
+            "moves": self.moves,
+            "jitter_px": jitter,
+            "raw_jitter_px": raw_jitter,
+            "latency": latency,
+            # Latency the user sees once prediction has taken its share off.
+            "compensated_ms": round(max(latency["avg_ms"] - self.prediction * 1000, 0.0), 2),
+            "move": self.move_time.snapshot(),
+            "settings": settings,
+        }
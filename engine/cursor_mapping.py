@@ -0,0 +1,348 @@
+import json
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+# Fingertip region (normalized frame coordinates) used before any calibration.
+DEFAULT_REGION = (0.05, 0.05, 0.95, 0.85)
+MAPPING_MODES = ("absolute", "trackpad")
+CURVES = ("linear", "power", "sigmoid")
+
+# Region calibration keeps this share of samples on each side as outliers.
+REGION_PERCENTILE = 2.0
+MIN_REGION_SAMPLES = 30
+
+# Trackpad: hand speed (frame widths per second) where acceleration is centred, and a
+# per-update dead zone so a resting hand doesn't creep.
+REFERENCE_SPEED = 0.5
+DEAD_ZONE = 0.002
+
+
+def region_matrix(left, top, right, bottom):
+    """Affine 3x3 matrix taking a frame region onto the unit square."""
+    width, height = right - left, bottom - top
+    if width <= 0 or height <= 0:
+        raise ValueError("calibration region is empty")
+    return np.array([
+        [1.0 / width, 0.0, -left / width],
+        [0.0, 1.0 / height, -top / height],
+        [0.0, 0.0, 1.0],
+    ])
+
+
+def fit_transform(hand_points, screen_points):
+    """
+    3x3 matrix mapping hand points (normalized frame coordinates) to screen points
+    (normalized desktop coordinates): an exact affine map for 3 pairs, a least-squares
+    homography (DLT) for 4 or more.
+    """
+    src = np.asarray(hand_points, dtype=np.float64).reshape(-1, 2)
+    dst = np.asarray(screen_points, dtype=np.float64).reshape(-1, 2)
+    if len(src) != len(dst) or len(src) < 3:
+        raise ValueError("need at least 3 calibration points")
+
+    if len(src) == 3:
+        A = np.hstack([src, np.ones((3, 1))])
+        if abs(np.linalg.det(A)) < 1e-9:
+            raise ValueError("calibration points are collinear")
+        affine = np.linalg.solve(A, dst).T
+        return np.vstack([affine, [0.0, 0.0, 1.0]])
+
+    rows = []
+    for (x, y), (u, v) in zip(src, dst):
+        rows.append([-x, -y, -1, 0, 0, 0, u * x, u * y, u])
+        rows.append([0, 0, 0, -x, -y, -1, v * x, v * y, v])
+    _, singular, vt = np.linalg.svd(np.array(rows))
+    if singular[-2] < 1e-9:
+        raise ValueError("calibration points are degenerate")
+    matrix = vt[-1].reshape(3, 3)
+    if abs(matrix[2, 2]) < 1e-12:
+        raise ValueError("calibration points are degenerate")
+    return matrix / matrix[2, 2]
+
+
+class AccelerationCurve:
+    """Pointer acceleration for trackpad mode: gain as a function of hand speed."""
+
+    def __init__(self, kind="sigmoid", sensitivity=1.5, acceleration=1.5):
+        self.configure(kind, sensitivity, acceleration)
+
+    def configure(self, kind=None, sensitivity=None, acceleration=None):
+        if kind is not None:
+            if kind not in CURVES:
+                raise ValueError(f"Unknown acceleration curve: {kind}")
+            self.kind = kind
+        if sensitivity is not None:
+            if not 0.1 <= float(sensitivity) <= 10.0:
+                raise ValueError("sensitivity must be between 0.1 and 10")
+            self.sensitivity = float(sensitivity)
+        if acceleration is not None:
+            if not 0.0 <= float(acceleration) <= 5.0:
+                raise ValueError("acceleration must be between 0 and 5")
+            self.acceleration = float(acceleration)
+
+    def gain(self, speed):
+        if self.kind == "linear":
+            return self.sensitivity
+        if self.kind == "power":
+            return self.sensitivity * max(speed / REFERENCE_SPEED, 0.25) ** self.acceleration
+        return self.sensitivity * (1.0 + self.acceleration / (1.0 + math.exp(-(speed - REFERENCE_SPEED) / 0.15)))
+
+
+class DisplayWatcher:
+    """
+    Caches the monitor layout and re-reads it at most every `interval` seconds, so a
+    resolution or monitor change is picked up within that time without an OS query
+    on every frame. `on_change(monitors)` runs when the layout differs.
+    """
+
+    def __init__(self, query, on_change, interval=2.0):
+        self.query = query
+        self.on_change = on_change
+        self.interval = interval
+        self.monitors = None
+        self.changes = 0
+        self._checked = 0.0
+
+    def check(self, now, force=False):
+        if not force and self.monitors is not None and now - self._checked < self.interval:
+            return self.monitors
+        self._checked = now
+        try:
+            monitors = [tuple(int(v) for v in m) for m in self.query()]
+        except Exception as e:
+            print(f"Display query failed: {e}")
+            return self.monitors
+        if monitors and monitors != self.monitors:
+            if self.monitors is not None:
+                self.changes += 1
+                print(f"Display layout changed: {monitors}")
+            self.monitors = monitors
+            self.on_change(monitors)
+        return self.monitors
+
+
+class CursorMapper:
+    """
+    Fingertip (normalized frame coordinates) to desktop pixels.
+
+    Absolute mode maps through the calibration transform (a 3x3 matrix onto the unit
+    square) composed with the desktop rectangle spanning all monitors. The composition
+    is precomputed whenever the calibration or display layout changes, so each frame is
+    one projective multiply. Points that fall between monitors of different sizes are
+    moved onto the nearest monitor.
+
+    Trackpad mode moves the cursor by the fingertip's displacement times an
+    acceleration curve's gain; `reset()` (hand lost) acts as lifting the finger.
+
+    Region calibration records fingertip positions for a few seconds while the user
+    sweeps the area they find comfortable and maps its robust bounding box to the
+    desktop; point calibration fits an affine map or homography to pairs of hand and
+    screen positions.
+    """
+
+    def __init__(self, query_monitors, on_layout=None, path="calibration.json"):
+        self.path = path
+        # Called with the new desktop bounds (left, top, right, bottom) after a layout change.
+        self.on_layout = on_layout
+        self.mode = "absolute"
+        self.curve = AccelerationCurve()
+        self._lock = threading.Lock()
+        self.calibration = {"kind": "default", "matrix": region_matrix(*DEFAULT_REGION).tolist()}
+        self._calibration_matrix = region_matrix(*DEFAULT_REGION)
+        self._matrix = None
+        self._desktop = (0, 0, 1, 1)
+        self._monitors = [(0, 0, 1, 1)]
+        self._recording = None
+        self._last_hand = None
+        self._position = None
+        self._seed = None
+        self.displays = DisplayWatcher(query_monitors, self._layout_changed)
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                calibration = json.load(f)
+            matrix = np.array(calibration["matrix"], dtype=np.float64).reshape(3, 3)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring calibration in {self.path}: {e}")
+            return
+        self.calibration, self._calibration_matrix = calibration, matrix
+
+    def _save(self):
+        try:
+            with open(self.path, "w") as f:
+                json.dump(self.calibration, f, indent=2)
+        except OSError as e:
+            print(f"Error saving calibration: {e}")
+
+    def _layout_changed(self, monitors):
+        with self._lock:
+            self._monitors = monitors
+            left = min(m[0] for m in monitors)
+            top = min(m[1] for m in monitors)
+            right = max(m[0] + m[2] for m in monitors)
+            bottom = max(m[1] + m[3] for m in monitors)
+            self._desktop = (left, top, right - left, bottom - top)
+            self._rebuild()
+        if self.on_layout is not None:
+            self.on_layout(self.bounds)
+
+    def _rebuild(self):
+        # Called with self._lock held.
+        left, top, width, height = self._desktop
+        to_desktop = np.array([[width, 0.0, left], [0.0, height, top], [0.0, 0.0, 1.0]])
+        # Plain nested tuples: indexing them is much cheaper than indexing an ndarray.
+        self._matrix = tuple(tuple(row) for row in (to_desktop @ self._calibration_matrix).tolist())
+
+    @property
+    def bounds(self):
+        left, top, width, height = self._desktop
+        return left, top, left + width - 1, top + height - 1
+
+    def refresh(self):
+        """Read the display layout now (at startup, or when told it changed)."""
+        self.displays.check(time.time(), force=True)
+
+    def configure(self, mode=None, curve=None, sensitivity=None, acceleration=None):
+        if mode is not None and mode not in MAPPING_MODES:
+            raise ValueError(f"Unknown cursor mapping: {mode}")
+        self.curve.configure(curve, sensitivity, acceleration)
+        if mode is not None and mode != self.mode:
+            self.mode = mode
+            self.reset()
+
+    def reset(self):
+        self._last_hand = None
+        self._position = None
+
+    def lift(self):
+        """Forget the hand but keep the position, like lifting a finger off a trackpad (e.g. after a pinch)."""
+        self._last_hand = None
+
+    def seed(self, position):
+        """Where trackpad mode starts from after a reset (normally the current cursor position)."""
+        self._seed = position
+
+    def start_calibration(self, duration=5.0):
+        """Record the comfortable hand region for `duration` seconds; absolute mapping keeps working meanwhile."""
+        if not 1.0 <= duration <= 30.0:
+            raise ValueError("duration must be between 1 and 30 seconds")
+        with self._lock:
+            self._recording = {"until": time.time() + duration, "samples": []}
+
+    def calibrate_points(self, pairs):
+        """Fit from [{"hand": [x, y], "screen": [u, v]}, ...] with screen in 0..1 desktop units."""
+        hand = [pair["hand"] for pair in pairs]
+        screen = [pair["screen"] for pair in pairs]
+        matrix = fit_transform(hand, screen)
+        self._apply({"kind": "points", "points": len(pairs), "matrix": matrix.tolist()}, matrix)
+
+    def clear_calibration(self):
+        with self._lock:
+            self._recording = None
+        matrix = region_matrix(*DEFAULT_REGION)
+        self._apply({"kind": "default", "matrix": matrix.tolist()}, matrix)
+
+    def _apply(self, calibration, matrix):
+        with self._lock:
+            self.calibration, self._calibration_matrix = calibration, matrix
+            self._rebuild()
+        self._save()
+
+    def _finish_recording(self, samples):
+        if len(samples) < MIN_REGION_SAMPLES:
+            print(f"Calibration needs at least {MIN_REGION_SAMPLES} hand samples, got {len(samples)}")
+            return
+        points = np.array(samples)
+        low = np.percentile(points, REGION_PERCENTILE, axis=0)
+        high = np.percentile(points, 100 - REGION_PERCENTILE, axis=0)
+        try:
+            matrix = region_matrix(low[0], low[1], high[0], high[1])
+        except ValueError as e:
+            print(f"Calibration failed: {e}")
+            return
+        region = [round(float(v), 4) for v in (low[0], low[1], high[0], high[1])]
+        self._apply({"kind": "region", "region": region, "matrix": matrix.tolist()}, matrix)
+        print(f"Calibrated hand region {region}")
+
+    def _clamp(self, x, y):
+        monitors = self._monitors
+        best, best_distance = None, None
+        for left, top, width, height in monitors:
+            cx = min(max(x, left), left + width - 1)
+            cy = min(max(y, top), top + height - 1)
+            distance = (cx - x) ** 2 + (cy - y) ** 2
+            if distance == 0:
+                return x, y
+            if best_distance is None or distance < best_distance:
+                best, best_distance = (cx, cy), distance
+        return best
+
+    def map(self, x, y, timestamp):
+        """Desktop pixel position for a fingertip at (x, y), or None if the cursor should not move."""
+        self.displays.check(timestamp)
+
+        recording = self._recording
+        if recording is not None:
+            recording["samples"].append((x, y))
+            if timestamp >= recording["until"]:
+                with self._lock:
+                    self._recording = None
+                self._finish_recording(recording["samples"])
+
+        if self.mode == "trackpad":
+            return self._map_relative(x, y, timestamp)
+
+        m = self._matrix
+        if m is None:
+            return None
+        w = m[2][0] * x + m[2][1] * y + m[2][2]
+        if abs(w) < 1e-9:
+            return None
+        return self._clamp((m[0][0] * x + m[0][1] * y + m[0][2]) / w, (m[1][0] * x + m[1][1] * y + m[1][2]) / w)
+
+    def _map_relative(self, x, y, timestamp):
+        last = self._last_hand
+        if self._position is None:
+            if self._seed is None:
+                left, top, width, height = self._desktop
+                self._position = (left + width / 2, top + height / 2)
+            else:
+                self._position = self._seed
+        if last is None:
+            self._last_hand = (x, y, timestamp)
+            return self._position
+
+        dx, dy, dt = x - last[0], y - last[1], timestamp - last[2]
+        distance = math.hypot(dx, dy)
+        if distance < DEAD_ZONE or dt <= 0:
+            # Keep the anchor, so slow movement adds up until it leaves the dead zone.
+            return self._position
+        self._last_hand = (x, y, timestamp)
+        gain = self.curve.gain(distance / dt)
+        # Both axes use the desktop width, so a hand movement has the same on-screen length in any direction.
+        scale = gain * self._desktop[2]
+        self._position = self._clamp(self._position[0] + dx * scale, self._position[1] + dy * scale)
+        return self._position
+
+    def snapshot(self):
+        recording = self._recording
+        return {
+            "mode": self.mode,
+            "curve": {"kind": self.curve.kind, "sensitivity": self.curve.sensitivity, "acceleration": self.curve.acceleration},
+            "calibration": {k: v for k, v in self.calibration.items() if k != "matrix"},
+            "recording": None if recording is None else {
+                "remaining": round(max(recording["until"] - time.time(), 0.0), 1),
+                "samples": len(recording["samples"]),
+            },
+            "desktop": list(self._desktop),
+            "monitors": [list(m) for m in self._monitors],
+            "display_changes": self.displays.changes,
+        }
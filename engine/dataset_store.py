@@ -0,0 +1,271 @@
+import glob
+import json
+import os
+import threading
+import time
+import numpy as np
+
+from landmarks import NUM_LANDMARKS
+
+FEATURES = NUM_LANDMARKS * 3
+ROW_BYTES = FEATURES * 4
+
+
+class DatasetStore:
+    """
+    Append-only training sample store.
+
+    All samples live in one flat float32 file (data/samples.f32, 63 floats per row).
+    A JSON-lines index records one entry per captured chunk (gesture ID, row offset,
+    row count, capture timestamp, session ID) and a tombstone per deleted gesture.
+    A capture session only appends its chunk; training maps the whole file as an
+    (N, 63) array without copying or parsing it.
+
+    Compaction writes a new generation (samples.<gen>.f32) whose index starts with a
+    line naming it, then replaces only the index, so the samples file and the offsets
+    describing it always change together.
+    """
+
+    def __init__(self, root="data"):
+        self.root = root
+        self.samples_path = os.path.join(root, "samples.f32")
+        self.index_path = os.path.join(root, "index.jsonl")
+        self._lock = threading.Lock()
+        self._chunks = []
+        self._load_index()
+        self._migrate_legacy()
+
+    def _load_index(self):
+        self._chunks = []
+        self.samples_path = os.path.join(self.root, "samples.f32")
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-write; the rows it described are ignored.
+                    continue
+                if entry.get("op") == "samples":
+                    self.samples_path = os.path.join(self.root, entry["file"])
+                elif entry.get("op") == "delete":
+                    self._chunks = [c for c in self._chunks if c["gesture_id"] != entry["gesture_id"]]
+                else:
+                    self._chunks.append(entry)
+
+    def _append_index(self, entry):
+        with open(self.index_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _row_count(self):
+        if not os.path.exists(self.samples_path):
+            return 0
+        return os.path.getsize(self.samples_path) // ROW_BYTES
+
+    def _migrate_legacy(self):
+        """Import per-gesture data/{gesture_id}.npy files from older versions, once."""
+        legacy = glob.glob(os.path.join(self.root, "*.npy"))
+        if not legacy:
+            return
+        migrated_dir = os.path.join(self.root, "legacy")
+        os.makedirs(migrated_dir, exist_ok=True)
+        for path in legacy:
+            gesture_id = os.path.basename(path)[:-len(".npy")]
+            try:
+                self.append(gesture_id, np.load(path), session_id="legacy", timestamp=os.path.getmtime(path))
+                os.replace(path, os.path.join(migrated_dir, os.path.basename(path)))
+                print(f"Migrated {path} into the dataset store")
+            except Exception as e:
+                print(f"Error migrating {path}: {e}")
+
+    def append(self, gesture_id, samples, session_id=None, timestamp=None):
+        """Append one capture session's (n, 63) samples for a gesture. Only the new chunk is written."""
+        samples = np.ascontiguousarray(samples, dtype=np.float32).reshape(-1, FEATURES)
+        if not len(samples):
+            return None
+
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            offset = self._row_count()
+            with open(self.samples_path, "ab") as f:
+                # Drop any partial row left by an interrupted write before appending.
+                f.truncate(offset * ROW_BYTES)
+                f.write(samples.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            entry = {
+                "gesture_id": gesture_id,
+                "offset": int(offset),
+                "count": len(samples),
+                "timestamp": timestamp if timestamp is not None else time.time(),
+                "session_id": session_id,
+            }
+            self._append_index(entry)
+            self._chunks.append(entry)
+            return entry
+
+    def delete_gesture(self, gesture_id):
+        """Tombstone every chunk of a gesture; the rows are reclaimed by compact()."""
+        with self._lock:
+            if not any(c["gesture_id"] == gesture_id for c in self._chunks):
+                return False
+            os.makedirs(self.root, exist_ok=True)
+            self._append_index({"op": "delete", "gesture_id": gesture_id, "timestamp": time.time()})
+            self._chunks = [c for c in self._chunks if c["gesture_id"] != gesture_id]
+        self.compact()
+        return True
+
+    def _remove_stale_samples(self):
+        """Delete samples files of older generations (or of a compaction that crashed before its index swap)."""
+        for path in glob.glob(os.path.join(self.root, "samples*.f32")):
+            if os.path.abspath(path) == os.path.abspath(self.samples_path):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                # On Windows a training job may still have it mapped; the next compaction retries.
+                pass
+
+    def _memmap(self, rows):
+        if rows == 0:
+            return np.empty((0, FEATURES), dtype=np.float32)
+        return np.memmap(self.samples_path, dtype=np.float32, mode="r", shape=(rows, FEATURES))
+
+    def matrix(self):
+        """
+        The whole store as (X, y): a read-only memory-mapped (N, 63) float32 array and a
+        label vector. Rows of deleted gestures (until compaction) are labelled "".
+        """
+        with self._lock:
+            chunks = list(self._chunks)
+            rows = max((c["offset"] + c["count"] for c in chunks), default=0)
+        labels = np.full(rows, "", dtype=object)
+        for c in chunks:
+            labels[c["offset"]:c["offset"] + c["count"]] = c["gesture_id"]
+        return self._memmap(rows), labels.astype(str)
+
+    def counts(self):
+        with self._lock:
+            counts = {}
+            for c in self._chunks:
+                counts[c["gesture_id"]] = counts.get(c["gesture_id"], 0) + c["count"]
+            return counts
+
+    def compact(self, max_dead_fraction=0.25):
+        """Rewrite the store without deleted rows once they make up more than max_dead_fraction."""
+        with self._lock:
+            total = self._row_count()
+            live = sum(c["count"] for c in self._chunks)
+            if total == 0 or (total - live) / total <= max_dead_fraction:
+                return False
+
+            X = self._memmap(total)
+            name = os.path.basename(self.samples_path).split(".")
+            generation = int(name[1]) + 1 if len(name) == 3 else 1
+            samples_file = f"samples.{generation}.f32"
+            samples_path = os.path.join(self.root, samples_file)
+            tmp_index = self.index_path + ".tmp"
+            chunks = []
+            offset = 0
+            with open(samples_path, "wb") as f:
+                for c in self._chunks:
+                    f.write(np.ascontiguousarray(X[c["offset"]:c["offset"] + c["count"]]).tobytes())
+                    chunks.append(dict(c, offset=offset))
+                    offset += c["count"]
+                f.flush()
+                os.fsync(f.fileno())
+            del X
+
+            with open(tmp_index, "w") as f:
+                f.write(json.dumps({"op": "samples", "file": samples_file}) + "\n")
+                for c in chunks:
+                    f.write(json.dumps(c) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            # The only switch-over: until this replace the old index still names the old samples file.
+            try:
+                os.replace(tmp_index, self.index_path)
+            except OSError as e:
+                print(f"Dataset compaction skipped: {e}")
+                for path in (samples_path, tmp_index):
+                    if os.path.exists(path):
+                        os.remove(path)
+                return False
+
+            self.samples_path = samples_path
+            self._remove_stale_samples()
+            self._chunks = chunks
+            print(f"Dataset compacted: {total} -> {offset} rows")
+            return True
+
+
+class SequenceStore:
+    """
+    Recorded motion sequences for motion gestures (see sequence_recognizer), one
+    data/sequences/{gesture_id}.npy file of shape (n, length, features) per gesture.
+    They are small (a few KB per gesture) and are rewritten whole on each capture session.
+    """
+
+    def __init__(self, root="data/sequences"):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _path(self, gesture_id):
+        return os.path.join(self.root, f"{gesture_id}.npy")
+
+    def load(self, gesture_id):
+        path = self._path(gesture_id)
+        if not os.path.exists(path):
+            return None
+        return np.load(path)
+
+    def append(self, gesture_id, sequences):
+        """
+        Add a capture session's sequences; returns all of the gesture's sequences.
+        Raises ValueError if their shape differs from the ones already stored.
+        """
+        sequences = np.asarray(sequences, dtype=np.float32)
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            existing = self.load(gesture_id)
+            if existing is not None:
+                if existing.shape[1:] != sequences.shape[1:]:
+                    raise ValueError(
+                        f"Sequences of shape {sequences.shape[1:]} don't match the {existing.shape[1:]} "
+                        f"already stored for {gesture_id}; delete the gesture's sequences first"
+                    )
+                sequences = np.concatenate([existing, sequences])
+            tmp_path = self._path(gesture_id) + ".tmp.npy"
+            np.save(tmp_path, sequences)
+            os.replace(tmp_path, self._path(gesture_id))
+            return sequences
+
+    def delete_gesture(self, gesture_id):
+        with self._lock:
+            path = self._path(gesture_id)
+            if not os.path.exists(path):
+                return False
+            os.remove(path)
+            return True
+
+    def sets(self):
+        """{gesture_id: (n, length, features) sequences}"""
+        if not os.path.isdir(self.root):
+            return {}
+        sets = {}
+        for path in glob.glob(os.path.join(self.root, "*.npy")):
+            if path.endswith(".tmp.npy"):
+                continue
+            gesture_id = os.path.basename(path)[:-len(".npy")]
+            try:
+                sets[gesture_id] = np.load(path)
+            except Exception as e:
+                print(f"Error loading sequences {path}: {e}")
+        return sets
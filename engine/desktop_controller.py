@@ -1,19 +1,38 @@
-import subprocess
 import platform
-import pyautogui
+
+from input_backends import get_backend
+from os_helpers import HelperError, create_os_helper
 
 class DesktopController:
     def __init__(self):
-        pyautogui.FAILSAFE = True
         self._system = platform.system()
+        # Long-lived osascript/PowerShell process; started on first use.
+        self._helper = create_os_helper()
+
+    def load(self):
+        """Create the input backend and start the OS helper now instead of on the first action."""
+        get_backend()
+        if self._helper is not None:
+            self._helper.warm_up()
+
+    @property
+    def _input(self):
+        return get_backend()
 
     def _osascript(self, script):
-        """Run an AppleScript command via subprocess (safer than os.system)."""
+        """Run an AppleScript command in the persistent helper process."""
         try:
-            subprocess.run(["osascript", "-e", script], check=False, timeout=3)
-        except Exception as e:
+            return self._helper.run(script)
+        except HelperError as e:
             print(f"osascript error: {e}")
 
+    def close(self):
+        if self._helper is not None:
+            self._helper.close()
+
+    def helper_status(self):
+        return self._helper.snapshot() if self._helper is not None else None
+
     def _mac_media_key(self, key_type):
         """Send a media key event using the NX system event layer (AppKit + Quartz).
         This is identical to how physical media keys work on macOS — routes to any
@@ -44,100 +63,101 @@ class DesktopController:
     def screenshot(self):
         print("DesktopController: Screenshot")
         if self._system == "Darwin":
-            pyautogui.hotkey("command", "shift", "3")
+            self._input.hotkey("command", "shift", "3")
         else:
-            pyautogui.hotkey("win", "printscreen")
+            self._input.hotkey("win", "printscreen")
 
     def switch_tab(self):
         print("DesktopController: Switch Tab")
         if self._system == "Darwin":
-            pyautogui.hotkey("ctrl", "tab")
+            self._input.hotkey("ctrl", "tab")
         else:
-            pyautogui.hotkey("alt", "tab")
+            self._input.hotkey("alt", "tab")
 
     def volume_up(self):
         print("DesktopController: Volume Up")
-        if self._system == "Darwin":
-            self._osascript("set volume output volume (output volume of (get volume settings) + 8)")
-        else:
-            pyautogui.press("volumeup")
+        self.adjust_volume(1)
 
     def volume_down(self):
         print("DesktopController: Volume Down")
+        self.adjust_volume(-1)
+
+    def adjust_volume(self, steps):
+        """Change the volume by `steps` key presses' worth (negative = down) in one OS call."""
+        if not steps:
+            return
         if self._system == "Darwin":
-            self._osascript("set volume output volume (output volume of (get volume settings) - 8)")
+            try:
+                self._helper.adjust_level("volume", 8 * steps)
+            except (HelperError, ValueError) as e:
+                print(f"DesktopController: volume error: {e}")
         else:
-            pyautogui.press("volumedown")
+            self._input.press("volumeup" if steps > 0 else "volumedown", presses=abs(steps))
 
     def _adjust_windows_brightness(self, delta):
-        """Adjust Windows brightness via WMI through PowerShell.
+        """Adjust Windows brightness via WMI in the persistent PowerShell helper.
         No admin rights needed. Works on laptops and most built-in displays."""
+        if self._helper is None:
+            print(f"DesktopController: brightness control unsupported on {self._system}")
+            return
         try:
-            no_window = getattr(subprocess, "CREATE_NO_WINDOW", 0x08000000)
-            get_cmd = (
-                "(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightness)"
-                ".CurrentBrightness"
-            )
-            result = subprocess.run(
-                ["powershell", "-NonInteractive", "-Command", get_cmd],
-                capture_output=True, text=True, check=False,
-                timeout=3, creationflags=no_window
-            )
-            current = int(result.stdout.strip())
-            new_level = max(0, min(100, current + delta))
-            set_cmd = (
-                f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods)"
-                f".WmiSetBrightness(1, {new_level})"
-            )
-            subprocess.run(
-                ["powershell", "-NonInteractive", "-Command", set_cmd],
-                check=False, timeout=3, creationflags=no_window
-            )
+            current, new_level = self._helper.adjust_level("brightness", delta)
             print(f"DesktopController: Windows brightness {current} -> {new_level}")
-        except Exception as e:
+        except (HelperError, ValueError) as e:
             print(f"DesktopController: Windows brightness error: {e}")
 
     def brightness_up(self):
         print("DesktopController: Brightness Up")
-        if self._system == "Darwin":
-            self._osascript('tell application "System Events" to key code 144 using {option down, shift down}')
-        else:
-            self._adjust_windows_brightness(10)
+        self.adjust_brightness(1)
 
     def brightness_down(self):
         print("DesktopController: Brightness Down")
+        self.adjust_brightness(-1)
+
+    def adjust_brightness(self, steps):
+        """Change the brightness by `steps` steps (negative = down) in one OS call."""
+        if not steps:
+            return
         if self._system == "Darwin":
-            self._osascript('tell application "System Events" to key code 145 using {option down, shift down}')
+            key_code = 144 if steps > 0 else 145
+            self._osascript(
+                f'tell application "System Events"\n'
+                f'repeat {abs(steps)} times\n'
+                f'key code {key_code} using {{option down, shift down}}\n'
+                f'end repeat\n'
+                f'end tell'
+            )
         else:
-            self._adjust_windows_brightness(-10)
+            self._adjust_windows_brightness(10 * steps)
 
     def mute(self):
         print("DesktopController: Mute")
         if self._system == "Darwin":
             self._osascript("set volume output muted not (output muted of (get volume settings))")
+            self._helper.invalidate("volume")
         else:
-            pyautogui.press("volumemute")
+            self._input.press("volumemute")
 
     def play_pause(self):
         print("DesktopController: Play/Pause")
         if self._system == "Darwin":
             self._mac_media_key(16)
         else:
-            pyautogui.press("playpause")
+            self._input.press("playpause")
 
     def next_track(self):
         print("DesktopController: Next Track")
         if self._system == "Darwin":
             self._mac_media_key(17)
         else:
-            pyautogui.press("nexttrack")
+            self._input.press("nexttrack")
 
     def prev_track(self):
         print("DesktopController: Prev Track")
         if self._system == "Darwin":
             self._mac_media_key(18)
         else:
-            pyautogui.press("prevtrack")
+            self._input.press("prevtrack")
 
     def switch_desktop_left(self):
         """Switch to the previous virtual desktop/workspace.
@@ -145,9 +165,9 @@ class DesktopController:
         Windows: Win+Ctrl+Left."""
         print("DesktopController: Switch Desktop Left")
         if self._system == "Darwin":
-            pyautogui.hotkey("ctrl", "left")
+            self._input.hotkey("ctrl", "left")
         else:
-            pyautogui.hotkey("win", "ctrl", "left")
+            self._input.hotkey("win", "ctrl", "left")
 
     def switch_desktop_right(self):
         """Switch to the next virtual desktop/workspace.
@@ -155,16 +175,28 @@ class DesktopController:
         Windows: Win+Ctrl+Right."""
         print("DesktopController: Switch Desktop Right")
         if self._system == "Darwin":
-            pyautogui.hotkey("ctrl", "right")
+            self._input.hotkey("ctrl", "right")
         else:
-            pyautogui.hotkey("win", "ctrl", "right")
+            self._input.hotkey("win", "ctrl", "right")
+
+    def minimize_window(self):
+        print("DesktopController: Minimize Window")
+        if self._system == "Darwin":
+            self._input.hotkey("command", "m")
+        else:
+            self._input.hotkey("win", "down")
 
     def scroll_up(self):
         print("DesktopController: Scroll Up")
-        pyautogui.scroll(5)
+        self.scroll(1)
 
     def scroll_down(self):
         print("DesktopController: Scroll Down")
-        pyautogui.scroll(-5)
+        self.scroll(-1)
+
+    def scroll(self, steps):
+        """Scroll by `steps` gesture steps (positive = up)."""
+        if steps:
+            self._input.scroll(5 * steps)
 
 desktop_controller = DesktopController()
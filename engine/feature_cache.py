@@ -0,0 +1,88 @@
+import json
+import os
+import numpy as np
+
+FEATURE_CACHE_DIR = "models/features"
+
+
+class FeatureCache:
+    """
+    On-disk cache of normalized, augmented feature matrices, one per gesture.
+
+    Each entry remembers how many source samples it was built from and with which
+    augmentation settings. Appended samples are augmented on their own and added
+    to the cached matrix; any other change rebuilds just that gesture.
+    """
+
+    def __init__(self, cache_dir=FEATURE_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._index_path = os.path.join(cache_dir, "index.json")
+        self._index = self._load_index()
+
+    def _load_index(self):
+        if os.path.exists(self._index_path):
+            try:
+                with open(self._index_path, "r") as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Feature cache index unreadable, rebuilding: {e}")
+        return {}
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(tmp_path, self._index_path)
+
+    def _path(self, gesture_id):
+        return os.path.join(self.cache_dir, f"{gesture_id}.npy")
+
+    def features(self, gesture_id, X, rows, augment, key):
+        """
+        Return (matrix, updated): the (M, 63) float32 feature matrix for one gesture and
+        whether it differs from what was cached before this call.
+        X: (N, 63) raw landmarks (usually memory-mapped); rows: the gesture's row indices in
+        capture order. Only rows that are not cached yet are read from X.
+        augment: callable mapping raw samples to features.
+        key: anything JSON-serializable identifying the augmentation settings.
+        """
+        self._index = self._load_index()
+        entry = self._index.get(gesture_id)
+        path = self._path(gesture_id)
+        n = len(rows)
+
+        if entry and entry["key"] == key and os.path.exists(path):
+            if entry["source_rows"] == n:
+                return np.load(path), False
+            if entry["source_rows"] < n:
+                cached = np.load(path)
+                added = augment(X[rows[entry["source_rows"]:]])
+                return self._store(gesture_id, np.concatenate([cached, added]), n, key), True
+
+        return self._store(gesture_id, augment(X[rows]), n, key), True
+
+    def _store(self, gesture_id, matrix, source_rows, key):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        tmp_path = self._path(gesture_id) + ".tmp.npy"
+        np.save(tmp_path, matrix)
+        os.replace(tmp_path, self._path(gesture_id))
+        self._index[gesture_id] = {"source_rows": int(source_rows), "rows": len(matrix), "key": key}
+        self._save_index()
+        return matrix
+
+    def drop(self, gesture_id):
+        # The index may have been updated by a training worker process since we last read it.
+        self._index = self._load_index()
+        if self._index.pop(gesture_id, None) is not None:
+            self._save_index()
+        try:
+            os.remove(self._path(gesture_id))
+        except FileNotFoundError:
+            pass
+
+    def prune(self, keep_ids):
+        self._index = self._load_index()
+        for gesture_id in [g for g in self._index if g not in keep_ids]:
+            self.drop(gesture_id)
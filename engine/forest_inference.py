@@ -0,0 +1,97 @@
+import numpy as np
+
+
+class CompiledForest:
+    """
+    A fitted RandomForestClassifier flattened into contiguous numpy node arrays.
+
+    All trees are walked in lockstep: each step gathers the current node of every
+    tree and moves it to its left or right child. Leaves point to themselves, so
+    after `max_depth` steps every tree sits on its leaf. Class probabilities are the
+    mean of the per-leaf class distributions, exactly like sklearn's predict_proba,
+    but without its per-call input validation and thread dispatch.
+    """
+
+    def __init__(self, classes, roots, feature, threshold, left, right, leaf_proba, max_depth):
+        self.classes_ = classes
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_proba = leaf_proba
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        features, thresholds, lefts, rights, probas, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            left = tree.children_left.astype(np.int32)
+            right = tree.children_right.astype(np.int32)
+            is_leaf = left == -1
+            own = np.arange(n, dtype=np.int32)
+
+            left = np.where(is_leaf, own, left) + offset
+            right = np.where(is_leaf, own, right) + offset
+            feature = np.where(is_leaf, 0, tree.feature).astype(np.int32)
+            threshold = np.where(is_leaf, np.inf, tree.threshold)
+
+            value = tree.value[:, 0, :].astype(np.float64)
+            totals = value.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+
+            features.append(feature)
+            thresholds.append(threshold)
+            lefts.append(left)
+            rights.append(right)
+            probas.append(value / totals)
+            roots.append(offset)
+
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            classes=np.asarray(forest.classes_),
+            roots=np.asarray(roots, dtype=np.int32),
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            leaf_proba=np.ascontiguousarray(np.concatenate(probas)),
+            max_depth=max_depth,
+        )
+
+    def leaves(self, x):
+        """Leaf node index of every tree for one (n_features,) float32 sample."""
+        nodes = self.roots
+        feature, threshold, left, right = self.feature, self.threshold, self.left, self.right
+        for _ in range(self.max_depth):
+            go_left = x[feature[nodes]] <= threshold[nodes]
+            nodes = np.where(go_left, left[nodes], right[nodes])
+        return nodes
+
+    def predict_proba_one(self, x):
+        """Class probabilities for one (n_features,) sample."""
+        x = np.asarray(x, dtype=np.float32)
+        return self.leaf_proba[self.leaves(x)].mean(axis=0)
+
+    def predict_proba(self, X):
+        """Class probabilities for an (n_samples, n_features) batch."""
+        X = np.asarray(X, dtype=np.float32)
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.roots.shape[0]))
+        rows = np.arange(X.shape[0])[:, None]
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.leaf_proba[nodes].mean(axis=1)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (
+            self.roots, self.feature, self.threshold, self.left, self.right, self.leaf_proba
+        ))
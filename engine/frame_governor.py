@@ -0,0 +1,101 @@
+import threading
+import time
+
+ACTIVE = "active"
+IDLE = "idle"
+THROTTLED = "throttled"
+
+
+class FrameGovernor:
+    """
+    Picks the camera frame rate and resolution from hand presence and CPU load.
+
+    - active: a hand was seen in the last `idle_after` seconds; full rate, camera default resolution.
+    - idle: no hand for `idle_after` seconds; `idle_fps` at `idle_size`. A detected hand
+      switches straight back to active.
+    - throttled: a hand is present, but inference at the full rate would use more than
+      `cpu_budget` of one core. The rate is lowered until it fits.
+
+    The camera stage reports every frame through observe(). The capture stage applies
+    `resolution` and the camera stage paces itself to `target_fps`.
+    """
+
+    def __init__(self, enabled=True, active_fps=30.0, idle_fps=5.0, idle_after=5.0, idle_size=(320, 240), cpu_budget=0.6):
+        self.enabled = enabled
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.idle_after = idle_after
+        self.idle_size = idle_size
+        self.cpu_budget = cpu_budget
+
+        self.mode = ACTIVE
+        self.target_fps = active_fps
+        self.busy_ms = 0.0
+        self._last_hand = time.time()
+        self._lock = threading.Lock()
+
+    def configure(self, enabled=None, idle_fps=None, idle_after=None, cpu_budget=None):
+        with self._lock:
+            if enabled is not None:
+                self.enabled = bool(enabled)
+            if idle_fps is not None:
+                self.idle_fps = max(1.0, min(float(idle_fps), self.active_fps))
+            if idle_after is not None:
+                self.idle_after = max(0.5, float(idle_after))
+            if cpu_budget is not None:
+                self.cpu_budget = max(0.05, min(float(cpu_budget), 1.0))
+            self._last_hand = time.time()
+            self._update(self._last_hand)
+
+    def observe(self, hand_present, busy_seconds, now=None):
+        """Record one processed frame; returns the mode to use for the next one."""
+        now = time.time() if now is None else now
+        with self._lock:
+            # Exponential average over roughly the last 20 frames.
+            self.busy_ms += (busy_seconds * 1000.0 - self.busy_ms) * 0.1
+            if hand_present:
+                self._last_hand = now
+            self._update(now)
+            return self.mode
+
+    def _update(self, now):
+        if not self.enabled:
+            self.mode, self.target_fps = ACTIVE, self.active_fps
+            return
+
+        if now - self._last_hand > self.idle_after:
+            self.mode, self.target_fps = IDLE, self.idle_fps
+            return
+
+        affordable = self.cpu_budget * 1000.0 / self.busy_ms if self.busy_ms > 0 else self.active_fps
+        if affordable < self.active_fps:
+            self.mode, self.target_fps = THROTTLED, max(self.idle_fps, affordable)
+        else:
+            self.mode, self.target_fps = ACTIVE, self.active_fps
+
+    @property
+    def frame_interval(self):
+        return 1.0 / self.target_fps
+
+    @property
+    def resolution(self):
+        """(width, height) the camera should deliver, or None for its default."""
+        return self.idle_size if self.mode == IDLE else None
+
+    @property
+    def load(self):
+        """Measured share of one core spent on inference at the current rate."""
+        return self.busy_ms * self.target_fps / 1000.0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "mode": self.mode,
+                "target_fps": round(self.target_fps, 1),
+                "busy_ms": round(self.busy_ms, 2),
+                "load": round(self.load, 3),
+                "cpu_budget": self.cpu_budget,
+                "idle_after": self.idle_after,
+                "resolution": list(self.resolution) if self.resolution else None,
+            }
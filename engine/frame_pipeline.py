@@ -0,0 +1,195 @@
+from collections import deque
+import threading
+import time
+import numpy as np
+
+
+class StageStats:
+    """Rolling FPS and drop counter for one pipeline stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.fps = 0.0
+        self.frames = 0
+        self.dropped = 0
+        self.busy_ms = 0.0
+        self._window_start = time.time()
+        self._window_frames = 0
+        self._window_busy = 0.0
+        self._lock = threading.Lock()
+
+    def tick(self, busy_seconds=0.0, dropped=0):
+        with self._lock:
+            self.frames += 1
+            self.dropped += dropped
+            self._window_frames += 1
+            self._window_busy += busy_seconds
+
+            now = time.time()
+            elapsed = now - self._window_start
+            if elapsed >= 1.0:
+                self.fps = self._window_frames / elapsed
+                self.busy_ms = self._window_busy / self._window_frames * 1000
+                self._window_frames = 0
+                self._window_busy = 0.0
+                self._window_start = now
+
+    def add_dropped(self, count=1):
+        with self._lock:
+            self.dropped += count
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "fps": round(self.fps, 1),
+                "frames": self.frames,
+                "dropped": self.dropped,
+                "busy_ms": round(self.busy_ms, 2),
+            }
+
+
+class FrameRing:
+    """
+    Fixed ring of preallocated frame buffers shared by the pipeline stages.
+
+    The capture stage writes into a free slot and publishes it as the newest
+    frame. Readers always pick up the newest published frame and pin its slot
+    while they work on it, so the writer never overwrites a frame in use.
+    Frames published while a reader was busy are simply skipped by it.
+    """
+
+    def __init__(self, slots=4):
+        self.slots = slots
+        self._buffers = []
+        self._timestamps = [0.0] * slots
+        self._pins = [0] * slots
+        self._latest = -1
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def _ensure_buffers(self, shape, dtype):
+        if self._buffers and self._buffers[0].shape == shape and self._buffers[0].dtype == dtype:
+            return
+        self._buffers = [np.empty(shape, dtype=dtype) for _ in range(self.slots)]
+        self._latest = -1
+
+    def acquire_write(self, shape, dtype=np.uint8):
+        """Return (slot, buffer) for the writer; the slot is neither pinned nor the newest frame."""
+        with self._cond:
+            self._ensure_buffers(shape, dtype)
+            start = (self._latest + 1) % self.slots
+            for offset in range(self.slots):
+                slot = (start + offset) % self.slots
+                if slot != self._latest and self._pins[slot] == 0:
+                    return slot, self._buffers[slot]
+            return None, None
+
+    def publish(self, slot, timestamp):
+        with self._cond:
+            self._timestamps[slot] = timestamp
+            self._latest = slot
+            self._seq += 1
+            self._cond.notify_all()
+
+    def acquire_latest(self, last_seq, timeout=0.5):
+        """
+        Block until a frame newer than last_seq is published.
+        Returns (seq, slot, frame, timestamp) with the slot pinned, or None on timeout/close.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._closed or (self._latest >= 0 and self._seq > last_seq), timeout):
+                return None
+            if self._closed:
+                return None
+            slot = self._latest
+            self._pins[slot] += 1
+            return self._seq, slot, self._buffers[slot], self._timestamps[slot]
+
+    def release(self, slot):
+        with self._cond:
+            self._pins[slot] -= 1
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self._closed = False
+            self._latest = -1
+
+
+class LatestChannel:
+    """
+    Bounded single-slot channel with monotonically increasing item IDs.
+
+    The producer overwrites the slot on every publish; the consumer wakes once
+    per new item and never sees the same ID twice. Items overwritten before the
+    consumer got to them are counted as skipped.
+
+    With a `release` callback the channel also tracks ownership: an item is
+    released when it is overwritten unseen, and a taken item when the consumer
+    comes back for the next one, i.e. once it has finished with it.
+    """
+
+    def __init__(self, release=None):
+        self._cond = threading.Condition()
+        self._item = None
+        self._id = 0
+        self._taken_id = 0
+        self._held = None
+        self._release = release
+        self.published = 0
+        self.skipped = 0
+
+    def publish(self, item):
+        with self._cond:
+            if self._id > self._taken_id:
+                self.skipped += 1
+                if self._release is not None:
+                    self._release(self._item)
+            self._id += 1
+            self._item = item
+            self.published += 1
+            self._cond.notify()
+
+    def take(self, timeout=0.5):
+        """
+        Return (item_id, item) for the newest unseen item, or None on timeout.
+        The item returned by the previous call is released first.
+        """
+        with self._cond:
+            if self._held is not None:
+                self._release(self._held)
+                self._held = None
+            if not self._cond.wait_for(lambda: self._id > self._taken_id, timeout):
+                return None
+            self._taken_id = self._id
+            if self._release is not None:
+                self._held = self._item
+            return self._id, self._item
+
+
+class LatencyStats:
+    """Rolling window of latency samples in seconds, reported in milliseconds."""
+
+    def __init__(self, window=240):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            if not self._samples:
+                return {"avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+            samples = np.fromiter(self._samples, dtype=np.float64, count=len(self._samples))
+        return {
+            "avg_ms": round(float(samples.mean()) * 1000, 2),
+            "p95_ms": round(float(np.percentile(samples, 95)) * 1000, 2),
+            "max_ms": round(float(samples.max()) * 1000, 2),
+        }
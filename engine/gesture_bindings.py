@@ -0,0 +1,106 @@
+import time
+
+# Base cooldown (seconds) between repeats of an action while its gesture is held;
+# divided by the speed factor at runtime.
+ACTION_COOLDOWNS = {
+    "volume_up": 0.15,
+    "volume_down": 0.15,
+    "brightness_up": 0.15,
+    "brightness_down": 0.15,
+    "scroll_up": 0.15,
+    "scroll_down": 0.15,
+    "play_pause": 2.5,
+    "next_track": 2.0,
+    "prev_track": 2.0,
+    "screenshot": 4.0,
+    "switch_tab": 1.0,
+    "mute": 2.0,
+    "toggle_cursor": 0.5,
+    "None": 0.0,
+}
+DEFAULT_COOLDOWN = 0.5
+
+# Actions that fire once per gesture, not repeatedly while it is held.
+ONE_SHOT_ACTIONS = frozenset({
+    "screenshot",
+    "play_pause", "next_track", "prev_track", "mute",
+})
+
+
+class Binding:
+    """One gesture's resolved action settings."""
+
+    __slots__ = ("gesture_id", "name", "action", "dispatch", "toggles_cursor",
+                 "cooldown", "one_shot", "hand", "modifier")
+
+    def __init__(self, gesture, registry):
+        self.gesture_id = gesture["id"]
+        self.name = gesture["name"]
+        action = registry.resolve(gesture.get("action"))
+        self.action = action or gesture.get("action")
+        self.toggles_cursor = action == "toggle_cursor"
+        # Only known desktop/plugin actions go to the executor; "None" and unknown names do not.
+        entry = registry.get(action) if action else None
+        self.dispatch = entry is not None
+        self.cooldown = ACTION_COOLDOWNS.get(self.action, DEFAULT_COOLDOWN)
+        # Plugin actions (macros, webhooks, shell commands) fire once per gesture.
+        self.one_shot = self.action in ONE_SHOT_ACTIONS or (entry is not None and entry.kind != "builtin")
+        hand = gesture.get("hand")
+        self.hand = None if hand == "any" else hand
+        self.modifier = gesture.get("modifier") or None
+
+
+class BindingTable:
+    """
+    Immutable lookup from a recognized label (gesture ID) to its Binding, compiled from
+    the gesture list whenever it changes. The detection thread reads the current table
+    once per frame; a rebuilt table replaces it with a single assignment, so a frame
+    never sees a half-updated configuration.
+    """
+
+    __slots__ = ("_bindings",)
+
+    def __init__(self, gestures, registry):
+        bindings = {}
+        for gesture in gestures:
+            if "id" in gesture and "name" in gesture:
+                bindings[gesture["id"]] = Binding(gesture, registry)
+        self._bindings = bindings
+
+    def get(self, label):
+        return self._bindings.get(label)
+
+    def __len__(self):
+        return len(self._bindings)
+
+
+def benchmark_lookup(gestures, table, rounds=20000):
+    """
+    Per-frame cost (µs) of resolving a label the old way (scanning the gesture list and
+    rebuilding the cooldown/one-shot tables each frame) against one table lookup.
+    """
+    labels = [g["id"] for g in gestures] or ["missing"]
+
+    def scan(label):
+        gesture = next((g for g in gestures if g["id"] == label), None)
+        cooldowns = dict(ACTION_COOLDOWNS)
+        one_shot = set(ONE_SHOT_ACTIONS)
+        if gesture is not None:
+            return cooldowns.get(gesture["action"], DEFAULT_COOLDOWN), gesture["action"] in one_shot
+        return None
+
+    def lookup(label):
+        binding = table.get(label)
+        if binding is not None:
+            return binding.cooldown, binding.one_shot
+        return None
+
+    results = {}
+    for name, resolve in (("scan", scan), ("table", lookup)):
+        started = time.perf_counter()
+        for i in range(rounds):
+            resolve(labels[i % len(labels)])
+        results[f"{name}_us"] = round((time.perf_counter() - started) / rounds * 1e6, 3)
+    results["gestures"] = len(gestures)
+    results["speedup"] = round(results["scan_us"] / max(results["table_us"], 1e-9), 1)
+    return results
@@ -1,104 +1,313 @@
+import json
 import os
-import joblib
+import time
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
 
+from classifier_backends import (
+    BACKENDS, DEFAULT_BACKEND, ClassifierBackend, RandomForestBackend,
+    benchmark_backends, create_backend,
+)
+from feature_cache import FeatureCache
+from landmarks import NUM_LANDMARKS, as_points
+from model_format import FORMAT_VERSION, load_model_file, save_model_file
+
+MODEL_DIR = "models"
+MODEL_POINTER_PATH = "models/gesture_model.json"
 MODEL_PATH = "models/gesture_model.pkl"
 LABEL_ENCODER_PATH = "models/label_encoder.pkl"
 
+AUGMENTATIONS = ("noise", "rotate_x", "rotate_y", "rotate_z", "scale", "mirror")
+DEFAULT_AUGMENTATIONS = ("noise", "rotate_z")
+
+NOISE_STD = 0.005
+ROTATION_ANGLES = (-10, 10)
+SCALE_JITTER = 0.1
+
+def validate_augmentations(kinds):
+    kinds = tuple(kinds)
+    unknown = [k for k in kinds if k not in AUGMENTATIONS]
+    if unknown:
+        raise ValueError(f"Unknown augmentations: {', '.join(unknown)}")
+    return kinds
+
+def normalize_batch(points):
+    """
+    Normalize an (N, 21, 3) or (N, 63) array of hands: relative to the wrist (translation
+    invariance), then scaled by the max distance (scale invariance).
+    Returns a new (N, 21, 3) float32 array.
+    """
+    points = np.asarray(points, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    relative = points - points[:, :1, :]
+    max_dist = np.sqrt(np.max(np.einsum("nij,nij->ni", relative, relative), axis=1))
+    scale = np.where(max_dist > 1e-6, max_dist, 1.0).astype(np.float32)
+    relative /= scale[:, None, None]
+    return relative
+
+def rotation_matrices(axis, angles):
+    """Stack of 3x3 rotation matrices about one axis, for angles in degrees."""
+    theta = np.radians(np.asarray(angles, dtype=np.float64))
+    c, s = np.cos(theta), np.sin(theta)
+    one, zero = np.ones_like(c), np.zeros_like(c)
+    if axis == "x":
+        rows = ((one, zero, zero), (zero, c, -s), (zero, s, c))
+    elif axis == "y":
+        rows = ((c, zero, s), (zero, one, zero), (-s, zero, c))
+    else:
+        rows = ((c, -s, zero), (s, c, zero), (zero, zero, one))
+    return np.stack([np.stack(row, axis=-1) for row in rows], axis=-2).astype(np.float32)
+
+_ROTATIONS = {
+    f"rotate_{axis}": rotation_matrices(axis, ROTATION_ANGLES) for axis in ("x", "y", "z")
+}
+
+def augment_batch(data, labels, kinds=DEFAULT_AUGMENTATIONS, rng=None):
+    """
+    Normalize a whole (N, 63) batch and append augmented copies of every valid sample:
+    noise: Gaussian jitter. rotate_x/y/z: +-10 degree rotations about that axis.
+    scale: independent x/y scale jitter. mirror: left/right flip.
+    Returns a contiguous (M, 63) float32 matrix and the matching label vector.
+    """
+    rng = rng or np.random.default_rng()
+    labels = np.asarray(labels)
+    norm = normalize_batch(data)
+    n = len(norm)
+
+    valid = ~np.isnan(norm).any(axis=(1, 2))
+    base, base_labels = norm[valid], labels[valid]
+    m = len(base)
+
+    copies = 0
+    for kind in kinds:
+        copies += len(_ROTATIONS[kind]) if kind in _ROTATIONS else 1
+
+    X = np.empty((n + copies * m, NUM_LANDMARKS, 3), dtype=np.float32)
+    X[:n] = norm
+    pos = n
+
+    for kind in kinds:
+        if kind in _ROTATIONS:
+            R = _ROTATIONS[kind]
+            block = X[pos:pos + len(R) * m].reshape(len(R), m, NUM_LANDMARKS, 3)
+            np.einsum("nij,akj->anik", base, R, out=block)
+            pos += len(R) * m
+            continue
+
+        block = X[pos:pos + m]
+        if kind == "noise":
+            np.add(base, rng.normal(0, NOISE_STD, base.shape).astype(np.float32), out=block)
+        elif kind == "scale":
+            factors = np.ones((m, 1, 3), dtype=np.float32)
+            factors[:, 0, :2] = rng.uniform(1 - SCALE_JITTER, 1 + SCALE_JITTER, (m, 2))
+            np.multiply(base, factors, out=block)
+        elif kind == "mirror":
+            np.copyto(block, base)
+            block[:, :, 0] *= -1
+        pos += m
+
+    y = np.concatenate([labels, np.tile(base_labels, copies)])
+    return X.reshape(len(X), -1), y
+
+def gesture_rows(y):
+    """{gesture_id: row indices in ascending order} for a label vector; "" (deleted rows) is skipped."""
+    ids, inverse, counts = np.unique(y, return_inverse=True, return_counts=True)
+    order = np.argsort(inverse, kind="stable")
+    return {
+        gesture_id: rows
+        for gesture_id, rows in zip(ids.tolist(), np.split(order, np.cumsum(counts)[:-1]))
+        if gesture_id != ""
+    }
+
 class GestureClassifier:
-    def __init__(self):
+    def __init__(self, backend=DEFAULT_BACKEND, augmentations=DEFAULT_AUGMENTATIONS, load=True):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown classifier backend '{backend}'")
+        self.backend_name = backend
+        self.augmentations = validate_augmentations(augmentations)
+        self.feature_cache = FeatureCache()
         self.model = None
         self.labels = []
-        self.load_model()
+        if load:
+            self.load_model()
 
-    def train(self, data, labels):
+    def augment(self, data, labels):
+        """Normalize samples and add augmented copies. Returns (X float32 matrix, y array)."""
+        return augment_batch(data, labels, self.augmentations)
+
+    def train_matrix(self, X, y, progress=None):
         """
-        Train the model with new data.
-        data: List of landmark lists (each 63 floats).
-        labels: List of string labels.
+        Train from the dataset store's (X, y): an (N, 63) sample matrix, normally memory-mapped,
+        and its label vector ("" marks deleted rows). Augmented features are cached per gesture,
+        and only rows the cache has not seen are read from X, so unchanged gestures cost nothing.
+        If the backend can update in place, only changed gestures are refitted and deleted ones
+        are dropped; otherwise the model is refitted from the cached features.
+        Returns "incremental" or "full".
+        progress: optional callable(stage, percent) for reporting.
         """
-        if not data or not labels:
-            print("No data to train on.")
-            return
+        progress = progress or (lambda stage, percent: None)
+        key = {"augmentations": list(self.augmentations)}
+        augment = lambda samples: self.augment(samples, np.zeros(len(samples)))[0]
 
-        augmented_data = []
-        augmented_labels = []
+        rows = gesture_rows(y)
+        self.feature_cache.prune(set(rows))
+        features = {}
+        changed = []
+        for i, (gesture_id, indices) in enumerate(rows.items()):
+            progress("augment", round(100 * i / len(rows)))
+            features[gesture_id], updated = self.feature_cache.features(gesture_id, X, indices, augment, key)
+            if updated:
+                changed.append(gesture_id)
+        progress("augment", 100)
+        progress("fit", 0)
 
-        print("Augmenting data...")
-        for i, landmarks in enumerate(data):
+        model = self.model
+        if model is not None and model.supports_incremental and model.name == self.backend_name:
+            for gesture_id in set(model.classes_.tolist()) - set(features):
+                model = model.refit_without(gesture_id)
+            for gesture_id in changed:
+                model = model.with_class(gesture_id, features[gesture_id])
+            self.model = model
+            self.save_model()
+            progress("fit", 100)
+            print(f"Model updated incrementally ({len(changed)} gesture(s) refitted).")
+            return "incremental"
 
-            norm_lm = self.normalize_landmarks(landmarks)
-            augmented_data.append(norm_lm)
-            augmented_labels.append(labels[i])
+        features_X = np.concatenate(list(features.values()))
+        features_y = np.concatenate([np.full(len(f), gesture_id) for gesture_id, f in features.items()])
 
-            lm_np = np.array(norm_lm).reshape(-1, 3)
-
-            if np.isnan(lm_np).any(): continue
+        print(f"Training {self.backend_name} on {len(features_X)} samples ({len(changed)} gesture(s) re-augmented)")
+        model = create_backend(self.backend_name)
+        model.fit(features_X, features_y)
+        self.model = model
+        self.save_model()
+        progress("fit", 100)
+        print("Model trained and saved.")
+        return "full"
 
-            noise = np.random.normal(0, 0.005, lm_np.shape)
-            augmented_data.append((lm_np + noise).flatten().tolist())
-            augmented_labels.append(labels[i])
+    def validate(self, X, y, holdout=0.2, seed=0):
+        """
+        Held-out accuracy of the current backend on the store's (X, y): each gesture's rows are
+        split, a model is fitted on the augmented training part and scored on the untouched rest.
+        Returns accuracy in [0, 1], or None if there is too little data to hold any out.
+        """
+        rng = np.random.default_rng(seed)
+        train_idx, test_idx = [], []
+        for indices in gesture_rows(y).values():
+            n_test = int(len(indices) * holdout)
+            if n_test == 0 or n_test == len(indices):
+                continue
+            order = rng.permutation(indices)
+            test_idx.append(order[:n_test])
+            train_idx.append(order[n_test:])
 
-            for angle in [-10, 10]:
-                theta = np.radians(angle)
-                c, s = np.cos(theta), np.sin(theta)
-                R = np.array(((c, -s, 0), (s, c, 0), (0, 0, 1)))
+        if len(train_idx) < 2:
+            return None
 
-                rotated = np.dot(lm_np, R.T)
-                augmented_data.append(rotated.flatten().tolist())
-                augmented_labels.append(labels[i])
+        train_idx, test_idx = np.sort(np.concatenate(train_idx)), np.sort(np.concatenate(test_idx))
+        X_train, y_train = self.augment(X[train_idx], y[train_idx])
+        model = create_backend(self.backend_name)
+        model.fit(X_train, y_train)
 
-        print(f"Training on {len(augmented_data)} samples (Original: {len(data)})")
+        X_test = normalize_batch(X[test_idx]).reshape(-1, NUM_LANDMARKS * 3)
+        predicted = model.classes_[np.argmax(model.predict_proba(X_test), axis=1)]
+        return float(np.mean(predicted == y[test_idx]))
 
-        self.model = RandomForestClassifier(n_estimators=100)
-        self.model.fit(augmented_data, augmented_labels)
-        self.save_model()
-        print("Model trained and saved.")
+    def remove_gesture(self, gesture_id):
+        """
+        Forget a gesture without retraining: drop its cached rows and zero its model output,
+        so the pose reads as no gesture until the next retrain.
+        """
+        self.feature_cache.drop(gesture_id)
+        model = self.model
+        if model is not None and model.predicts(gesture_id):
+            self.model = model.without_class(gesture_id)
+            self.save_model()
+            print(f"Removed {gesture_id} from the model.")
 
-    def normalize_landmarks(self, landmarks):
+    def benchmark(self, data, labels, backends=None, test_fraction=0.25, seed=0):
         """
-        Normalize landmarks:
-        1. Relative to wrist (Translation Invariant)
-        2. Scaled by max distance (Scale Invariance)
+        Compare classifier backends on the given samples. The split is made on the
+        original samples so augmented copies never leak into the test set.
         """
-        lm_np = np.array(landmarks).reshape(-1, 3)
-        wrist = lm_np[0]
-        relative_lm = lm_np - wrist
+        data = np.asarray(data, dtype=np.float32)
+        labels = np.asarray(labels)
+        order = np.random.default_rng(seed).permutation(len(data))
+        n_test = max(1, int(len(data) * test_fraction))
+        test_idx, train_idx = order[:n_test], order[n_test:]
+
+        X_train, y_train = self.augment(data[train_idx], labels[train_idx])
+        X_test = normalize_batch(data[test_idx]).reshape(len(test_idx), -1)
 
-        max_dist = np.max(np.linalg.norm(relative_lm, axis=1))
+        return benchmark_backends(X_train, y_train, X_test, labels[test_idx], names=backends)
 
-        if max_dist > 1e-6:
-            relative_lm /= max_dist
+    def predict_proba_batch(self, hands):
+        """
+        Class probabilities for several hands in one model call.
+        Returns (classes, (n, n_classes) probabilities), or (None, None) when no model is loaded.
+        `classes` is the model's own array, so an identity check tells whether the model was swapped.
+        """
+        model = self.model
+        if model is None:
+            return None, None
 
-        return relative_lm.flatten().tolist()
+        points = np.stack([as_points(hand) for hand in hands])
+        return model.classes_, model.predict_proba(normalize_batch(points).reshape(len(hands), -1))
 
-    def predict(self, landmarks):
+    def save_model(self):
         """
-        Predict gesture from landmarks.
-        landmarks: Single list of 63 floats.
-        Returns: strict label or None
+        Save the model as a new versioned .glm file, then point models/gesture_model.json at it.
+        The pointer is replaced atomically and the file currently mapped by a running engine
+        is never overwritten, so a concurrent load always sees a complete model.
         """
-        if not self.model:
-            return None, 0.0
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        filename = f"gesture_model-{time.time_ns()}.glm"
+        params, arrays = self.model.to_arrays()
+        save_model_file(os.path.join(MODEL_DIR, filename), self.model.name, params, arrays)
 
-        norm_landmarks = self.normalize_landmarks(landmarks)
+        previous = self._current_model_file()
+        tmp_path = MODEL_POINTER_PATH + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"file": filename, "format_version": FORMAT_VERSION}, f)
+        os.replace(tmp_path, MODEL_POINTER_PATH)
 
-        prediction = self.model.predict([norm_landmarks])[0]
-        probabilities = self.model.predict_proba([norm_landmarks])[0]
-        confidence = max(probabilities)
+        self._remove_stale_models(keep={filename, previous})
 
-        return prediction, confidence
+    def _current_model_file(self):
+        try:
+            with open(MODEL_POINTER_PATH, "r") as f:
+                return json.load(f)["file"]
+        except (OSError, ValueError, KeyError):
+            return None
 
-    def save_model(self):
-        if not os.path.exists("models"):
-            os.makedirs("models")
-        joblib.dump(self.model, MODEL_PATH)
+    def _remove_stale_models(self, keep):
+        for name in os.listdir(MODEL_DIR):
+            if name.endswith(".glm") and name not in keep:
+                try:
+                    os.remove(os.path.join(MODEL_DIR, name))
+                except OSError:
+                    # Still mapped by another process (Windows); removed on a later save.
+                    pass
 
     def load_model(self):
-        if os.path.exists(MODEL_PATH):
-            self.model = joblib.load(MODEL_PATH)
-            print("Model loaded.")
+        filename = self._current_model_file()
+        if filename and os.path.exists(os.path.join(MODEL_DIR, filename)):
+            backend_name, params, arrays = load_model_file(os.path.join(MODEL_DIR, filename))
+            model = BACKENDS[backend_name].from_arrays(params, arrays)
+        elif os.path.exists(MODEL_PATH):
+            import joblib
+            model = joblib.load(MODEL_PATH)
+            if not isinstance(model, ClassifierBackend):
+                # Models saved before backends existed are bare sklearn forests.
+                model = RandomForestBackend.from_model(model)
+            elif isinstance(model, RandomForestBackend) and model.engine is None:
+                model = RandomForestBackend.from_model(model.model)
+            self.model = model
+            self.save_model()
+            print(f"Converted {MODEL_PATH} to the compact model format.")
         else:
             print("No model found. Please train first.")
             self.model = None
+            return
+
+        self.model = model
+        self.backend_name = model.name
+        print(f"Model loaded ({model.name}).")
@@ -1,59 +1,180 @@
-import cv2
-import mediapipe as mp
+import threading
+import time
 import numpy as np
 
-class GestureDetector:
-    def __init__(self, static_image_mode=False, max_num_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.5):
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=static_image_mode,
-            max_num_hands=max_num_hands,
-            min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence
-        )
-        self.mp_draw = mp.solutions.drawing_utils
-
-    def process_frame(self, frame):
+from landmarks import LandmarkPool, as_points, fill_landmarks
+from startup_profile import process_memory_bytes
+
+DEFAULT_TRACKER_CONFIG = {
+    "model_complexity": 1,
+    "max_num_hands": 1,
+    "min_detection_confidence": 0.7,
+    "min_tracking_confidence": 0.5,
+}
+
+
+def validate_tracker_config(config):
+    """Check and normalize a partial tracker config; raises ValueError on bad values."""
+    clean = {}
+    for key, value in config.items():
+        if key not in DEFAULT_TRACKER_CONFIG:
+            raise ValueError(f"Unknown tracker setting: {key}")
+        if key == "model_complexity":
+            value = int(value)
+            if value not in (0, 1):
+                raise ValueError("model_complexity must be 0 (lite) or 1 (full)")
+        elif key == "max_num_hands":
+            value = int(value)
+            if not 1 <= value <= 4:
+                raise ValueError("max_num_hands must be between 1 and 4")
+        else:
+            value = float(value)
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{key} must be between 0 and 1")
+        clean[key] = value
+    return clean
+
+
+class HandTracker:
+    """
+    The one MediaPipe Hands instance in the engine, shared by every consumer.
+
+    The camera stage calls process() once per frame and gets HandLandmarks (image
+    and world coordinates, handedness) for each hand plus the raw MediaPipe landmark
+    lists for drawing the preview. MediaPipe is imported and the model built on
+    load() or the first process() call. configure() may be called from any thread;
+    the model is rebuilt with the new settings before the next frame.
+    """
+
+    def __init__(self, **config):
+        self.config = dict(DEFAULT_TRACKER_CONFIG, **validate_tracker_config(config))
+        self._hands = None
+        self._mp_hands = None
+        self._mp_draw = None
+        self._pending_config = None
+        self._lock = threading.Lock()
+        self.pool = LandmarkPool(size=8)
+        self.builds = 0
+        self.init_ms = None
+        self.memory_bytes = None
+
+    @property
+    def loaded(self):
+        return self._hands is not None
+
+    def load(self):
+        with self._lock:
+            if self._hands is None:
+                self._build()
+
+    def _build(self):
+        # Called with self._lock held.
+        started = time.perf_counter()
+        import mediapipe as mp
+
+        if self._hands is not None:
+            self._hands.close()
+            self._hands = None
+        memory_before = process_memory_bytes()
+        self._mp_hands = mp.solutions.hands
+        self._mp_draw = mp.solutions.drawing_utils
+        self._hands = self._mp_hands.Hands(static_image_mode=False, **self.config)
+        memory_after = process_memory_bytes()
+
+        self.builds += 1
+        self.init_ms = round((time.perf_counter() - started) * 1000, 1)
+        if memory_before is not None and memory_after is not None:
+            self.memory_bytes = max(0, memory_after - memory_before)
+
+    def configure(self, **changes):
+        """Apply new settings (see DEFAULT_TRACKER_CONFIG); raises ValueError for bad values."""
+        changes = validate_tracker_config(changes)
+        with self._lock:
+            config = dict(self.config, **changes)
+            if config == self.config:
+                return
+            self.config = config
+            if self._hands is not None:
+                self._pending_config = config
+
+    def process(self, rgb_frame, timestamp=None, region=None):
         """
-        Process a single frame to detect hands.
+        Track hands in an RGB frame.
+        region: (offset_x, offset_y, scale_x, scale_y) when rgb_frame is a crop (see
+        RoiTracker.transform); landmarks are mapped back to full-frame coordinates.
         Returns:
-            processed_frame: The frame with landmarks drawn (if any).
-            landmarks_list: A list of normalized landmarks (x, y, z) for the detected hand.
-            world_landmarks_list: List of world landmarks.
+            hands: list of HandLandmarks, one per detected hand, acquired from self.pool;
+                the caller owns them until it releases them back to the pool.
+            drawings: MediaPipe landmark lists for draw(), or None when no hand was found.
         """
+        with self._lock:
+            if self._hands is None or self._pending_config is not None:
+                self._pending_config = None
+                self._build()
+            hands_model = self._hands
+
+        results = hands_model.process(rgb_frame)
+        if not results.multi_hand_landmarks:
+            return [], None
+
+        if timestamp is None:
+            timestamp = time.time()
+        world = results.multi_hand_world_landmarks or []
+        handedness = results.multi_handedness or []
+
+        hands = []
+        for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
+            label = handedness[i].classification[0].label if i < len(handedness) else None
+            world_landmarks = world[i] if i < len(world) else None
+            hand = fill_landmarks(self.pool.acquire(), hand_landmarks, timestamp, label, world_landmarks)
+            if region is not None:
+                self._map_from_crop(hand, hand_landmarks, region)
+            hands.append(hand)
+        return hands, results.multi_hand_landmarks
 
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        results = self.hands.process(rgb_frame)
-
-        landmarks_data = []
-
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-
-                self.mp_draw.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
-
-                landmarks = []
-                for lm in hand_landmarks.landmark:
-                    landmarks.extend([lm.x, lm.y, lm.z])
-
-                landmarks_data.append(landmarks)
-
-        return frame, landmarks_data, results
+    @staticmethod
+    def _map_from_crop(hand, mp_landmarks, region):
+        offset_x, offset_y, scale_x, scale_y = region
+        points = hand.points
+        points[:, 0] *= scale_x
+        points[:, 0] += offset_x
+        points[:, 1] *= scale_y
+        points[:, 1] += offset_y
+        # MediaPipe's z uses roughly the same scale as x.
+        points[:, 2] *= scale_x
+        # Keep the preview overlay in sync with the mapped landmarks.
+        for lm, (x, y, z) in zip(mp_landmarks.landmark, points.tolist()):
+            lm.x, lm.y, lm.z = x, y, z
+
+    def draw(self, frame, drawings):
+        """Draw the landmark lists returned by process() onto a BGR frame in place."""
+        if not drawings or self._mp_draw is None:
+            return frame
+        for hand_landmarks in drawings:
+            self._mp_draw.draw_landmarks(frame, hand_landmarks, self._mp_hands.HAND_CONNECTIONS)
+        return frame
+
+    def snapshot(self):
+        return {
+            "loaded": self.loaded,
+            "instances": 1 if self.loaded else 0,
+            "config": dict(self.config),
+            "builds": self.builds,
+            "init_ms": self.init_ms,
+            "memory_mb": round(self.memory_bytes / 1e6, 1) if self.memory_bytes is not None else None,
+        }
 
     @staticmethod
     def count_fingers(landmarks):
         """
         Estimates the number of extended fingers based on landmarks.
-        landmarks: Normalized landmark list [x1, y1, z1, x2, y2, z2, ...]
+        landmarks: HandLandmarks, (21, 3) array or flat list [x1, y1, z1, x2, y2, z2, ...]
         """
-        points = []
-        for i in range(0, len(landmarks), 3):
-            points.append({'x': landmarks[i], 'y': landmarks[i+1]})
-
-        if not points:
+        if landmarks is None or (isinstance(landmarks, list) and not landmarks):
             return 0
 
+        points = [{'x': float(x), 'y': float(y)} for x, y, _ in as_points(landmarks)]
+
         fingers = []
         
         is_upright = points[0]['y'] > points[9]['y']
@@ -77,4 +198,10 @@ class GestureDetector:
         return sum(fingers)
 
     def close(self):
-        self.hands.close()
+        with self._lock:
+            if self._hands is not None:
+                self._hands.close()
+                self._hands = None
+
+
+hand_tracker = HandTracker()
@@ -0,0 +1,221 @@
+import threading
+import numpy as np
+
+from frame_pipeline import LatencyStats
+
+MAX_WINDOW = 30
+SMOOTHING_KEYS = ("window", "enter", "exit", "dwell")
+DEFAULT_SMOOTHING = {"window": 5, "enter": 0.80, "exit": 0.60, "dwell": 0.10}
+
+# Activations shorter than this are counted as probable false fires.
+SHORT_ACTIVATION = 0.3
+
+
+def validate_smoothing(smoothing):
+    """Check a gesture's "smoothing" block from gestures.json; raises ValueError on bad values."""
+    if smoothing is None:
+        return None
+    if not isinstance(smoothing, dict):
+        raise ValueError("smoothing must be an object")
+    unknown = set(smoothing) - set(SMOOTHING_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown smoothing settings: {', '.join(sorted(unknown))}")
+
+    clean = {}
+    if "window" in smoothing:
+        clean["window"] = int(smoothing["window"])
+        if not 1 <= clean["window"] <= MAX_WINDOW:
+            raise ValueError(f"smoothing.window must be between 1 and {MAX_WINDOW}")
+    for key in ("enter", "exit"):
+        if key in smoothing:
+            clean[key] = float(smoothing[key])
+            if not 0.0 <= clean[key] <= 1.0:
+                raise ValueError(f"smoothing.{key} must be between 0 and 1")
+    if "dwell" in smoothing:
+        clean["dwell"] = float(smoothing["dwell"])
+        if not 0.0 <= clean["dwell"] <= 5.0:
+            raise ValueError("smoothing.dwell must be between 0 and 5 seconds")
+    if clean.get("exit", 0.0) > clean.get("enter", 1.0):
+        raise ValueError("smoothing.exit must not be above smoothing.enter")
+    return clean
+
+
+class _Track:
+    """Smoothing state for one hand."""
+
+    def __init__(self, n):
+        self.ring = np.zeros((MAX_WINDOW, n), dtype=np.float32)
+        self.filled = 0
+        self.pos = 0
+        self.mean = np.zeros(n, dtype=np.float32)
+        self.active = None
+        self.active_since = 0.0
+        self.candidate = None
+        self.candidate_since = 0.0
+        self.raw_label = None
+        self.raw_since = 0.0
+        self.raw_fired = False
+
+
+class GestureSmoother:
+    """
+    Temporal decision layer between the classifier and the action logic.
+
+    Keeps, per hand track, a ring of the last MAX_WINDOW probability vectors and
+    averages each class over its own window. A gesture becomes active once its average
+    stays at or above its `enter` threshold for `dwell` seconds. It stays active until
+    the average drops below `exit`. Per-gesture settings come from the optional
+    "smoothing" block in gestures.json; anything missing falls back to the defaults.
+
+    Metrics (over all tracks):
+    - added_latency: time from the first frame a single-frame threshold would have
+      fired to the frame the smoothed decision enters.
+    - false_fire_rate: share of activations shorter than SHORT_ACTIVATION.
+    - suppressed: single-frame threshold crossings that never became an activation.
+    """
+
+    def __init__(self, defaults=None):
+        self.defaults = dict(DEFAULT_SMOOTHING, **(defaults or {}))
+        self._gesture_settings = {}
+        self._lock = threading.Lock()
+        self.added_latency = LatencyStats()
+        self.activations = 0
+        self.short_activations = 0
+        self.suppressed = 0
+        self._ages = np.arange(MAX_WINDOW)
+        self._reset(())
+
+    def _reset(self, classes):
+        self._classes_ref = classes
+        self._classes = tuple(classes)
+        self._tracks = {}
+
+        settings = [dict(self.defaults, **self._gesture_settings.get(c, {})) for c in self._classes]
+        self._windows = np.array([s["window"] for s in settings], dtype=np.int64)
+        self._enter = np.array([s["enter"] for s in settings], dtype=np.float32)
+        self._exit = np.array([s["exit"] for s in settings], dtype=np.float32)
+        self._dwell = np.array([s["dwell"] for s in settings], dtype=np.float64)
+
+    def configure(self, gestures, defaults=None):
+        """Load per-gesture settings from the gesture list; invalid blocks are ignored with a message."""
+        settings = {}
+        for gesture in gestures:
+            try:
+                smoothing = validate_smoothing(gesture.get("smoothing"))
+            except ValueError as e:
+                print(f"Ignoring smoothing settings for {gesture.get('name')}: {e}")
+                continue
+            if smoothing:
+                settings[gesture["id"]] = smoothing
+        with self._lock:
+            if defaults:
+                self.defaults.update(defaults)
+            self._gesture_settings = settings
+            self._reset(self._classes_ref)
+
+    def clear(self, now, track=None):
+        """Forget one hand's history (or every hand's), e.g. when it leaves the frame."""
+        with self._lock:
+            keys = list(self._tracks) if track is None else [track]
+            for key in keys:
+                state = self._tracks.pop(key, None)
+                if state is not None:
+                    self._track_raw(state, None, now)
+                    self._end_activation(state, now)
+
+    def retain(self, tracks, now):
+        """Drop the state of every track not in `tracks` (hands that left the frame)."""
+        with self._lock:
+            for key in [k for k in self._tracks if k not in tracks]:
+                state = self._tracks.pop(key)
+                self._track_raw(state, None, now)
+                self._end_activation(state, now)
+
+    def update(self, classes, probabilities, now, track=0):
+        """
+        Add one frame's class probabilities for one hand track.
+        Returns (label, smoothed confidence, entered): the active gesture (or None), its averaged
+        probability and whether it became active on this frame.
+        """
+        with self._lock:
+            if classes is not self._classes_ref and tuple(classes) != self._classes:
+                # The model was retrained or swapped; old probability columns no longer line up.
+                for state in self._tracks.values():
+                    self._end_activation(state, now)
+                self._reset(classes)
+
+            state = self._tracks.get(track)
+            if state is None:
+                state = self._tracks[track] = _Track(len(self._classes))
+
+            state.ring[state.pos] = probabilities
+            state.pos = (state.pos + 1) % MAX_WINDOW
+            state.filled = min(state.filled + 1, MAX_WINDOW)
+
+            # Age 0 is the newest row; each class averages over its own window of rows.
+            ages = (state.pos - 1 - self._ages) % MAX_WINDOW
+            mask = (ages[:, None] < self._windows[None, :]) & (ages[:, None] < state.filled)
+            counts = mask.sum(axis=0)
+            np.divide((state.ring * mask).sum(axis=0), np.maximum(counts, 1), out=state.mean)
+
+            self._track_raw(state, probabilities, now)
+
+            if state.active is not None and state.mean[state.active] < self._exit[state.active]:
+                self._end_activation(state, now)
+
+            entered = False
+            if state.active is None:
+                best = int(np.argmax(state.mean))
+                if state.mean[best] >= self._enter[best]:
+                    if state.candidate != best:
+                        state.candidate, state.candidate_since = best, now
+                    if now - state.candidate_since >= self._dwell[best]:
+                        self._start_activation(state, best, now)
+                        entered = True
+                else:
+                    state.candidate = None
+
+            if state.active is None:
+                return None, float(state.mean.max()) if len(state.mean) else 0.0, False
+            return self._classes[state.active], float(state.mean[state.active]), entered
+
+    def _track_raw(self, state, probabilities, now):
+        best = None
+        if probabilities is not None and len(probabilities):
+            best = int(np.argmax(probabilities))
+            if probabilities[best] < self._enter[best]:
+                best = None
+        if best != state.raw_label:
+            if state.raw_label is not None and not state.raw_fired:
+                self.suppressed += 1
+            state.raw_label, state.raw_since, state.raw_fired = best, now, False
+
+    def _start_activation(self, state, index, now):
+        state.active = index
+        state.active_since = now
+        state.candidate = None
+        self.activations += 1
+        if state.raw_label == index and not state.raw_fired:
+            state.raw_fired = True
+            self.added_latency.add(now - state.raw_since)
+
+    def _end_activation(self, state, now):
+        if state.active is not None and now - state.active_since < SHORT_ACTIVATION:
+            self.short_activations += 1
+        state.active = None
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "active": {
+                    str(track): self._classes[state.active]
+                    for track, state in self._tracks.items() if state.active is not None
+                },
+                "tracks": len(self._tracks),
+                "activations": self.activations,
+                "short_activations": self.short_activations,
+                "false_fire_rate": round(self.short_activations / self.activations, 3) if self.activations else 0.0,
+                "suppressed": self.suppressed,
+                "added_latency": self.added_latency.snapshot(),
+                "defaults": dict(self.defaults),
+            }
@@ -22,6 +22,8 @@ a = Analysis(
         (os.path.join(mp_dir, 'modules'), 'mediapipe/modules'),
         (os.path.join(mp_dir, 'python', 'solutions'), 'mediapipe/python/solutions'),
     ],
+    # cv2, mediapipe, pyautogui and sklearn are imported lazily at runtime
+    # (lazy_import.py / import inside functions), so they must be listed here.
     hiddenimports=[
         'mediapipe',
         'mediapipe.python',
@@ -34,6 +36,7 @@ a = Analysis(
         'sklearn.ensemble._forest',
         'sklearn.tree',
         'sklearn.tree._classes',
+        'sklearn.linear_model',
         'sklearn.utils._typedefs',
         'sklearn.neighbors._partition_nodes',
         'joblib',
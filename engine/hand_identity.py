@@ -0,0 +1,72 @@
+import itertools
+import numpy as np
+
+from landmarks import as_points
+
+# Palm landmarks (wrist and the four finger bases) used for the hand's position.
+PALM = [0, 5, 9, 13, 17]
+
+# A hand that moved further than this (normalized frame units) between frames is treated as new.
+MAX_JUMP = 0.25
+# Changing handedness label costs as much as moving this far; MediaPipe's label can flicker.
+HANDEDNESS_PENALTY = 0.15
+
+
+class HandIdentifier:
+    """
+    Gives each tracked hand an ID that stays the same across frames.
+
+    Hands in a new frame are matched to the hands of the last few frames by palm
+    position, with a penalty for a changed handedness label. With at most a few hands
+    all assignments are tried, so the match is optimal. A hand that is not seen for
+    `forget_after` seconds loses its ID.
+    """
+
+    def __init__(self, forget_after=0.3):
+        self.forget_after = forget_after
+        self._known = {}
+        self._next_id = 1
+
+    def assign(self, hands, now):
+        """Set hand_id on each HandLandmarks in `hands`; returns them sorted by ID (oldest hand first)."""
+        self._known = {
+            hand_id: known for hand_id, known in self._known.items()
+            if now - known[2] <= self.forget_after
+        }
+        if not hands:
+            return hands
+
+        centers = [as_points(hand)[PALM, :2].mean(axis=0) for hand in hands]
+        known_ids = list(self._known)
+
+        best_cost, best_pairs = None, ()
+        for count in range(min(len(hands), len(known_ids)), -1, -1):
+            for hand_idx in itertools.combinations(range(len(hands)), count):
+                for ids in itertools.permutations(known_ids, count):
+                    cost, valid = 0.0, True
+                    for i, hand_id in zip(hand_idx, ids):
+                        center, handedness, _ = self._known[hand_id]
+                        distance = float(np.linalg.norm(centers[i] - center))
+                        if distance > MAX_JUMP:
+                            valid = False
+                            break
+                        cost += distance + (HANDEDNESS_PENALTY if handedness != hands[i].handedness else 0.0)
+                    if valid and (best_cost is None or cost < best_cost):
+                        best_cost, best_pairs = cost, tuple(zip(hand_idx, ids))
+            if best_cost is not None:
+                # Prefer matching as many hands as possible.
+                break
+
+        matched = dict(best_pairs)
+        for i, hand in enumerate(hands):
+            hand_id = matched.get(i)
+            if hand_id is None:
+                hand_id = self._next_id
+                self._next_id += 1
+            hand.hand_id = hand_id
+            self._known[hand_id] = (centers[i], hand.handedness, now)
+
+        return sorted(hands, key=lambda hand: hand.hand_id)
+
+    def reset(self):
+        self._known = {}
@@ -0,0 +1,714 @@
+import ctypes
+import ctypes.util
+import os
+import platform
+import threading
+import time
+
+from lazy_import import lazy_module
+
+pyautogui = lazy_module("pyautogui")
+
+BUTTONS = ("left", "right", "middle")
+
+
+class InputBackend:
+    """
+    Mouse and keyboard output. Subclasses implement the underscore methods; the public
+    ones count calls for the status message. `scroll` is in wheel notches (positive = up).
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.calls = {}
+
+    def _count(self, op):
+        self.calls[op] = self.calls.get(op, 0) + 1
+
+    def screen_size(self):
+        return self._screen_size()
+
+    def monitors(self):
+        """Monitor rectangles (left, top, width, height) in desktop coordinates."""
+        width, height = self._screen_size()
+        return [(0, 0, width, height)]
+
+    def move_to(self, x, y):
+        self._count("move")
+        self._move_to(int(round(x)), int(round(y)))
+
+    def move_rel(self, dx, dy):
+        self._count("move_rel")
+        self._move_rel(int(round(dx)), int(round(dy)))
+
+    def click(self, button="left", count=1):
+        if button not in BUTTONS:
+            raise ValueError(f"Unknown mouse button: {button}")
+        self._count("click")
+        self._click(button, count)
+
+    def scroll(self, notches):
+        if notches:
+            self._count("scroll")
+            self._scroll(int(notches))
+
+    def press(self, key, presses=1):
+        self._count("press")
+        for _ in range(presses):
+            self._hotkey([key.lower()])
+
+    def hotkey(self, *keys):
+        self._count("hotkey")
+        self._hotkey([key.lower() for key in keys])
+
+    def write(self, text):
+        self._count("write")
+        self._write(text)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def snapshot(self):
+        return {"name": self.name, "calls": dict(self.calls)}
+
+    def _screen_size(self):
+        raise NotImplementedError
+
+    def _move_to(self, x, y):
+        raise NotImplementedError
+
+    def _move_rel(self, dx, dy):
+        raise NotImplementedError
+
+    def _click(self, button, count):
+        raise NotImplementedError
+
+    def _scroll(self, notches):
+        raise NotImplementedError
+
+    def _hotkey(self, keys):
+        raise NotImplementedError
+
+    def _write(self, text):
+        raise NotImplementedError
+
+
+class PyAutoGuiBackend(InputBackend):
+    """pyautogui, with its per-call pause and fail-safe check switched off once."""
+
+    name = "pyautogui"
+
+    def __init__(self):
+        super().__init__()
+        pyautogui.PAUSE = 0
+        pyautogui.MINIMUM_DURATION = 0
+        pyautogui.FAILSAFE = False
+
+    def _screen_size(self):
+        width, height = pyautogui.size()
+        return int(width), int(height)
+
+    def _move_to(self, x, y):
+        pyautogui.moveTo(x, y, _pause=False)
+
+    def _move_rel(self, dx, dy):
+        pyautogui.moveRel(dx, dy, _pause=False)
+
+    def _click(self, button, count):
+        pyautogui.click(button=button, clicks=count, interval=0.0, _pause=False)
+
+    def _scroll(self, notches):
+        pyautogui.scroll(notches, _pause=False)
+
+    def _hotkey(self, keys):
+        pyautogui.hotkey(*keys, _pause=False)
+
+    def _write(self, text):
+        pyautogui.write(text, _pause=False)
+
+
+class _FallbackMixin:
+    """Keyboard output through pyautogui for native backends that only do the pointer."""
+
+    _fallback_backend = None
+
+    @property
+    def _fallback(self):
+        if self._fallback_backend is None:
+            self._fallback_backend = PyAutoGuiBackend()
+        return self._fallback_backend
+
+    def _hotkey(self, keys):
+        self._fallback._hotkey(keys)
+
+    def _write(self, text):
+        self._fallback._write(text)
+
+
+# --- Windows: SendInput / SetCursorPos ------------------------------------------------
+
+_ULONG_PTR = ctypes.c_size_t
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", ctypes.c_long), ("dy", ctypes.c_long), ("mouseData", ctypes.c_ulong),
+                ("dwFlags", ctypes.c_ulong), ("time", ctypes.c_ulong), ("dwExtraInfo", _ULONG_PTR)]
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", ctypes.c_ushort), ("wScan", ctypes.c_ushort), ("dwFlags", ctypes.c_ulong),
+                ("time", ctypes.c_ulong), ("dwExtraInfo", _ULONG_PTR)]
+
+
+class _HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [("uMsg", ctypes.c_ulong), ("wParamL", ctypes.c_ushort), ("wParamH", ctypes.c_ushort)]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT), ("hi", _HARDWAREINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("union", _INPUTUNION)]
+
+
+_INPUT_MOUSE, _INPUT_KEYBOARD = 0, 1
+_KEYEVENTF_EXTENDEDKEY, _KEYEVENTF_KEYUP, _KEYEVENTF_UNICODE = 0x1, 0x2, 0x4
+_MOUSEEVENTF_MOVE, _MOUSEEVENTF_WHEEL = 0x1, 0x800
+_MOUSE_BUTTON_FLAGS = {"left": (0x2, 0x4), "right": (0x8, 0x10), "middle": (0x20, 0x40)}
+_WHEEL_DELTA = 120
+
+_VK_CODES = {
+    "backspace": 0x08, "tab": 0x09, "enter": 0x0D, "return": 0x0D, "shift": 0x10, "ctrl": 0x11,
+    "alt": 0x12, "option": 0x12, "pause": 0x13, "capslock": 0x14, "esc": 0x1B, "escape": 0x1B,
+    "space": 0x20, "pageup": 0x21, "pgup": 0x21, "pagedown": 0x22, "pgdn": 0x22,
+    "end": 0x23, "home": 0x24, "left": 0x25, "up": 0x26, "right": 0x27, "down": 0x28,
+    "printscreen": 0x2C, "prtsc": 0x2C, "insert": 0x2D, "delete": 0x2E, "del": 0x2E,
+    "win": 0x5B, "winleft": 0x5B, "command": 0x5B, "winright": 0x5C, "apps": 0x5D,
+    "multiply": 0x6A, "add": 0x6B, "subtract": 0x6D, "decimal": 0x6E, "divide": 0x6F,
+    "numlock": 0x90, "scrolllock": 0x91, "shiftleft": 0xA0, "shiftright": 0xA1,
+    "ctrlleft": 0xA2, "ctrlright": 0xA3, "altleft": 0xA4, "altright": 0xA5,
+    "volumemute": 0xAD, "volumedown": 0xAE, "volumeup": 0xAF,
+    "nexttrack": 0xB0, "prevtrack": 0xB1, "playpause": 0xB3,
+}
+_VK_CODES.update({f"f{i}": 0x6F + i for i in range(1, 25)})
+_VK_CODES.update({f"num{i}": 0x60 + i for i in range(10)})
+_EXTENDED_KEYS = {0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28, 0x2C, 0x2D, 0x2E, 0x5B, 0x5C, 0x5D, 0x6F, 0x90, 0xA3, 0xA5}
+
+
+class WindowsBackend(InputBackend):
+    """SendInput through ctypes; the cursor is placed with SetCursorPos."""
+
+    name = "sendinput"
+
+    def __init__(self):
+        super().__init__()
+        self._user32 = ctypes.WinDLL("user32", use_last_error=True)
+        self._user32.SendInput.argtypes = (ctypes.c_uint, ctypes.POINTER(_INPUT), ctypes.c_int)
+        self._user32.VkKeyScanW.restype = ctypes.c_short
+        self._user32.VkKeyScanW.argtypes = (ctypes.c_wchar,)
+
+    def _send(self, inputs):
+        array = (_INPUT * len(inputs))(*inputs)
+        self._user32.SendInput(len(inputs), array, ctypes.sizeof(_INPUT))
+
+    @staticmethod
+    def _mouse(flags, data=0, dx=0, dy=0):
+        return _INPUT(_INPUT_MOUSE, _INPUTUNION(mi=_MOUSEINPUT(dx, dy, data & 0xFFFFFFFF, flags, 0, 0)))
+
+    @staticmethod
+    def _key(vk, up=False, scan=0, unicode=False):
+        flags = _KEYEVENTF_KEYUP if up else 0
+        if unicode:
+            flags |= _KEYEVENTF_UNICODE
+        elif vk in _EXTENDED_KEYS:
+            flags |= _KEYEVENTF_EXTENDEDKEY
+        return _INPUT(_INPUT_KEYBOARD, _INPUTUNION(ki=_KEYBDINPUT(vk, scan, flags, 0, 0)))
+
+    def _screen_size(self):
+        return self._user32.GetSystemMetrics(0), self._user32.GetSystemMetrics(1)
+
+    def monitors(self):
+        rects = []
+
+        class RECT(ctypes.Structure):
+            _fields_ = [("left", ctypes.c_long), ("top", ctypes.c_long), ("right", ctypes.c_long), ("bottom", ctypes.c_long)]
+
+        callback_type = ctypes.WINFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(RECT), ctypes.c_void_p)
+
+        def collect(monitor, dc, rect, data):
+            r = rect.contents
+            rects.append((r.left, r.top, r.right - r.left, r.bottom - r.top))
+            return 1
+
+        self._user32.EnumDisplayMonitors(None, None, callback_type(collect), None)
+        return rects or super().monitors()
+
+    def _move_to(self, x, y):
+        self._user32.SetCursorPos(x, y)
+
+    def _move_rel(self, dx, dy):
+        self._send([self._mouse(_MOUSEEVENTF_MOVE, dx=dx, dy=dy)])
+
+    def _click(self, button, count):
+        down, up = _MOUSE_BUTTON_FLAGS[button]
+        self._send([self._mouse(flag) for _ in range(count) for flag in (down, up)])
+
+    def _scroll(self, notches):
+        self._send([self._mouse(_MOUSEEVENTF_WHEEL, data=notches * _WHEEL_DELTA)])
+
+    def _vk(self, key):
+        if key in _VK_CODES:
+            return _VK_CODES[key]
+        if len(key) == 1:
+            # Virtual key of the character in the current layout ("=", ",", letters, digits...).
+            scan = self._user32.VkKeyScanW(key)
+            if scan != -1:
+                return scan & 0xFF
+        raise ValueError(f"Unknown key: {key}")
+
+    def _hotkey(self, keys):
+        codes = [self._vk(key) for key in keys]
+        self._send([self._key(vk) for vk in codes] + [self._key(vk, up=True) for vk in reversed(codes)])
+
+    def _write(self, text):
+        self._send([self._key(0, up, scan=ord(ch), unicode=True) for ch in text for up in (False, True)])
+
+
+# --- macOS: Quartz event taps -----------------------------------------------------------
+
+class MacBackend(_FallbackMixin, InputBackend):
+    """Quartz mouse events (pyobjc, which pyautogui needs on macOS anyway); keys via pyautogui."""
+
+    name = "quartz"
+
+    def __init__(self):
+        super().__init__()
+        import Quartz
+        self._quartz = Quartz
+        self._buttons = {
+            "left": (Quartz.kCGEventLeftMouseDown, Quartz.kCGEventLeftMouseUp, Quartz.kCGMouseButtonLeft),
+            "right": (Quartz.kCGEventRightMouseDown, Quartz.kCGEventRightMouseUp, Quartz.kCGMouseButtonRight),
+            "middle": (Quartz.kCGEventOtherMouseDown, Quartz.kCGEventOtherMouseUp, Quartz.kCGMouseButtonCenter),
+        }
+
+    def _position(self):
+        Quartz = self._quartz
+        point = Quartz.CGEventGetLocation(Quartz.CGEventCreate(None))
+        return point.x, point.y
+
+    def _post(self, event):
+        self._quartz.CGEventPost(self._quartz.kCGHIDEventTap, event)
+
+    def _screen_size(self):
+        display = self._quartz.CGMainDisplayID()
+        return int(self._quartz.CGDisplayPixelsWide(display)), int(self._quartz.CGDisplayPixelsHigh(display))
+
+    def monitors(self):
+        Quartz = self._quartz
+        error, displays, count = Quartz.CGGetActiveDisplayList(16, None, None)
+        if error or not count:
+            return super().monitors()
+        rects = []
+        for display in displays[:count]:
+            bounds = Quartz.CGDisplayBounds(display)
+            rects.append((int(bounds.origin.x), int(bounds.origin.y), int(bounds.size.width), int(bounds.size.height)))
+        return rects
+
+    def _move_to(self, x, y):
+        Quartz = self._quartz
+        self._post(Quartz.CGEventCreateMouseEvent(None, Quartz.kCGEventMouseMoved, (x, y), Quartz.kCGMouseButtonLeft))
+
+    def _move_rel(self, dx, dy):
+        x, y = self._position()
+        self._move_to(x + dx, y + dy)
+
+    def _click(self, button, count):
+        Quartz = self._quartz
+        down, up, number = self._buttons[button]
+        position = self._position()
+        for click in range(1, count + 1):
+            for kind in (down, up):
+                event = Quartz.CGEventCreateMouseEvent(None, kind, position, number)
+                Quartz.CGEventSetIntegerValueField(event, Quartz.kCGMouseEventClickState, click)
+                self._post(event)
+
+    def _scroll(self, notches):
+        Quartz = self._quartz
+        self._post(Quartz.CGEventCreateScrollWheelEvent(None, Quartz.kCGScrollEventUnitLine, 1, notches))
+
+
+# --- Linux: XTest -----------------------------------------------------------------------
+
+_X_KEYSYMS = {
+    "ctrl": "Control_L", "ctrlleft": "Control_L", "ctrlright": "Control_R",
+    "alt": "Alt_L", "option": "Alt_L", "altleft": "Alt_L", "altright": "Alt_R",
+    "shift": "Shift_L", "shiftleft": "Shift_L", "shiftright": "Shift_R",
+    "win": "Super_L", "winleft": "Super_L", "command": "Super_L", "winright": "Super_R", "apps": "Menu",
+    "tab": "Tab", "enter": "Return", "return": "Return", "esc": "Escape", "escape": "Escape",
+    "space": "space", "backspace": "BackSpace", "delete": "Delete", "del": "Delete", "insert": "Insert",
+    "home": "Home", "end": "End", "pageup": "Prior", "pgup": "Prior", "pagedown": "Next", "pgdn": "Next",
+    "left": "Left", "right": "Right", "up": "Up", "down": "Down", "printscreen": "Print", "prtsc": "Print",
+    "pause": "Pause", "capslock": "Caps_Lock", "numlock": "Num_Lock", "scrolllock": "Scroll_Lock",
+    "multiply": "KP_Multiply", "add": "KP_Add", "subtract": "KP_Subtract", "decimal": "KP_Decimal", "divide": "KP_Divide",
+    "volumemute": "XF86AudioMute", "volumedown": "XF86AudioLowerVolume", "volumeup": "XF86AudioRaiseVolume",
+    "playpause": "XF86AudioPlay", "nexttrack": "XF86AudioNext", "prevtrack": "XF86AudioPrev",
+}
+_X_KEYSYMS.update({f"f{i}": f"F{i}" for i in range(1, 25)})
+_X_KEYSYMS.update({f"num{i}": f"KP_{i}" for i in range(10)})
+# Control characters that can appear in typed text.
+_X_CHAR_KEYSYMS = {"\n": 0xFF0D, "\r": 0xFF0D, "\t": 0xFF09, "\b": 0xFF08}
+
+
+def _char_keysym(ch):
+    """Keysym of a character: Latin-1 keysyms equal the code point, other Unicode ones are 0x01000000 + it."""
+    if ch in _X_CHAR_KEYSYMS:
+        return _X_CHAR_KEYSYMS[ch]
+    code = ord(ch)
+    return code if 0x20 <= code <= 0x7E or 0xA0 <= code <= 0xFF else 0x01000000 | code
+_X_BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+
+class XTestBackend(_FallbackMixin, InputBackend):
+    """
+    XTest fake events through libXtst with ctypes; one display connection, flushed per call.
+    Text with characters the keyboard layout has no key for is typed through pyautogui.
+    """
+
+    name = "xtest"
+
+    def __init__(self):
+        super().__init__()
+        x11_path, xtst_path = ctypes.util.find_library("X11"), ctypes.util.find_library("Xtst")
+        if not x11_path or not xtst_path:
+            raise OSError("libX11/libXtst not found")
+        self._x11 = ctypes.CDLL(x11_path)
+        self._xtst = ctypes.CDLL(xtst_path)
+        self._x11.XOpenDisplay.restype = ctypes.c_void_p
+        self._x11.XOpenDisplay.argtypes = (ctypes.c_char_p,)
+        self._x11.XStringToKeysym.restype = ctypes.c_ulong
+        self._x11.XStringToKeysym.argtypes = (ctypes.c_char_p,)
+        self._x11.XKeysymToKeycode.restype = ctypes.c_ubyte
+        self._x11.XKeysymToKeycode.argtypes = (ctypes.c_void_p, ctypes.c_ulong)
+        self._x11.XkbKeycodeToKeysym.restype = ctypes.c_ulong
+        self._x11.XkbKeycodeToKeysym.argtypes = (ctypes.c_void_p, ctypes.c_ubyte, ctypes.c_int, ctypes.c_int)
+        for name in ("XFlush", "XDefaultScreen", "XCloseDisplay"):
+            getattr(self._x11, name).argtypes = (ctypes.c_void_p,)
+        for name in ("XDisplayWidth", "XDisplayHeight"):
+            getattr(self._x11, name).argtypes = (ctypes.c_void_p, ctypes.c_int)
+        self._xtst.XTestFakeMotionEvent.argtypes = (ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulong)
+        self._xtst.XTestFakeRelativeMotionEvent.argtypes = (ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_ulong)
+        self._xtst.XTestFakeButtonEvent.argtypes = (ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong)
+        self._xtst.XTestFakeKeyEvent.argtypes = (ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong)
+
+        self._display = self._x11.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("cannot open X display")
+        # Xlib calls on one connection must not interleave (cursor and action threads).
+        self._lock = threading.Lock()
+
+    def _keycode(self, key):
+        if key in _X_KEYSYMS:
+            keysym = self._x11.XStringToKeysym(_X_KEYSYMS[key].encode())
+        elif len(key) == 1:
+            keysym = _char_keysym(key)
+        else:
+            keysym = self._x11.XStringToKeysym(key.encode())
+        keycode = self._x11.XKeysymToKeycode(self._display, keysym) if keysym else 0
+        if not keycode:
+            raise ValueError(f"Unknown key: {key}")
+        return keycode
+
+    def _screen_size(self):
+        with self._lock:
+            screen = self._x11.XDefaultScreen(self._display)
+            return self._x11.XDisplayWidth(self._display, screen), self._x11.XDisplayHeight(self._display, screen)
+
+    def _move_to(self, x, y):
+        with self._lock:
+            self._xtst.XTestFakeMotionEvent(self._display, -1, x, y, 0)
+            self._x11.XFlush(self._display)
+
+    def _move_rel(self, dx, dy):
+        with self._lock:
+            self._xtst.XTestFakeRelativeMotionEvent(self._display, dx, dy, 0)
+            self._x11.XFlush(self._display)
+
+    def _buttons(self, button, presses):
+        with self._lock:
+            for _ in range(presses):
+                self._xtst.XTestFakeButtonEvent(self._display, button, 1, 0)
+                self._xtst.XTestFakeButtonEvent(self._display, button, 0, 0)
+            self._x11.XFlush(self._display)
+
+    def _click(self, button, count):
+        self._buttons(_X_BUTTONS[button], count)
+
+    def _scroll(self, notches):
+        self._buttons(4 if notches > 0 else 5, abs(notches))
+
+    def _hotkey(self, keys):
+        codes = [self._keycode(key) for key in keys]
+        with self._lock:
+            for code in codes:
+                self._xtst.XTestFakeKeyEvent(self._display, code, 1, 0)
+            for code in reversed(codes):
+                self._xtst.XTestFakeKeyEvent(self._display, code, 0, 0)
+            self._x11.XFlush(self._display)
+
+    def _typing_keys(self, text):
+        """(keycode, shifted) per character, or None if the layout has no key for one of them."""
+        keys = []
+        for ch in text:
+            keysym = _char_keysym(ch)
+            code = self._x11.XKeysymToKeycode(self._display, keysym)
+            if not code:
+                return None
+            if self._x11.XkbKeycodeToKeysym(self._display, code, 0, 0) == keysym:
+                keys.append((code, False))
+            elif self._x11.XkbKeycodeToKeysym(self._display, code, 0, 1) == keysym:
+                keys.append((code, True))
+            else:
+                return None
+        return keys
+
+    def _write(self, text):
+        shift = self._keycode("shift")
+        with self._lock:
+            keys = self._typing_keys(text)
+            if keys is not None:
+                for code, shifted in keys:
+                    if shifted:
+                        self._xtst.XTestFakeKeyEvent(self._display, shift, 1, 0)
+                    self._xtst.XTestFakeKeyEvent(self._display, code, 1, 0)
+                    self._xtst.XTestFakeKeyEvent(self._display, code, 0, 0)
+                    if shifted:
+                        self._xtst.XTestFakeKeyEvent(self._display, shift, 0, 0)
+                self._x11.XFlush(self._display)
+                return
+        self._fallback._write(text)
+
+    def close(self):
+        with self._lock:
+            if self._display:
+                self._x11.XCloseDisplay(self._display)
+                self._display = None
+
+
+# --- Batching and recording -------------------------------------------------------------
+
+class BatchedBackend(InputBackend):
+    """
+    Wraps another backend and holds pointer moves until `flush()` (or any other
+    output): relative moves are summed, and an absolute move replaces whatever was
+    pending, so each flush sends at most one move event.
+    """
+
+    def __init__(self, inner):
+        super().__init__()
+        self.inner = inner
+        self.name = f"batched({inner.name})"
+        self._absolute = None
+        self._relative = [0, 0]
+        self._pending = 0
+        self.merged = 0
+        self._lock = threading.Lock()
+
+    def _screen_size(self):
+        return self.inner.screen_size()
+
+    def monitors(self):
+        return self.inner.monitors()
+
+    def _move_to(self, x, y):
+        with self._lock:
+            self.merged += 1 if self._pending else 0
+            self._pending += 1
+            self._absolute, self._relative = (x, y), [0, 0]
+
+    def _move_rel(self, dx, dy):
+        with self._lock:
+            self.merged += 1 if self._pending else 0
+            self._pending += 1
+            self._relative[0] += dx
+            self._relative[1] += dy
+
+    def flush(self):
+        with self._lock:
+            absolute, relative, self._absolute, self._relative, self._pending = (
+                self._absolute, self._relative, None, [0, 0], 0)
+        if absolute is not None:
+            self.inner.move_to(absolute[0] + relative[0], absolute[1] + relative[1])
+        elif relative != [0, 0]:
+            self.inner.move_rel(*relative)
+        self.inner.flush()
+
+    def _click(self, button, count):
+        self.flush()
+        self.inner.click(button, count)
+
+    def _scroll(self, notches):
+        self.flush()
+        self.inner.scroll(notches)
+
+    def _hotkey(self, keys):
+        self.flush()
+        self.inner.hotkey(*keys)
+
+    def _write(self, text):
+        self.flush()
+        self.inner.write(text)
+
+    def close(self):
+        self.flush()
+        self.inner.close()
+
+    def snapshot(self):
+        return dict(super().snapshot(), merged=self.merged, inner=self.inner.snapshot())
+
+
+class RecordingBackend(InputBackend):
+    """
+    Keeps every event in memory instead of sending it, with a simulated cursor
+    position, so cursor and action behaviour can be tested and benchmarked headless.
+    """
+
+    name = "recording"
+
+    def __init__(self, size=(1920, 1080), limit=10000, monitors=None):
+        super().__init__()
+        self.size = tuple(size)
+        self.monitor_rects = list(monitors or [(0, 0) + self.size])
+        self.limit = limit
+        self.position = (0, 0)
+        self.events = []
+        self._lock = threading.Lock()
+
+    def _record(self, *event):
+        with self._lock:
+            self.events.append((time.time(),) + event)
+            if len(self.events) > self.limit:
+                del self.events[: len(self.events) - self.limit]
+
+    def _clamp(self, x, y):
+        # Like the OS: a point off every monitor lands on the nearest edge of the closest one.
+        best, best_distance = None, None
+        for left, top, width, height in self.monitor_rects:
+            cx = min(max(x, left), left + width - 1)
+            cy = min(max(y, top), top + height - 1)
+            distance = (cx - x) ** 2 + (cy - y) ** 2
+            if best_distance is None or distance < best_distance:
+                best, best_distance = (cx, cy), distance
+        return best
+
+    def _screen_size(self):
+        return self.size
+
+    def monitors(self):
+        return list(self.monitor_rects)
+
+    def _move_to(self, x, y):
+        self.position = self._clamp(x, y)
+        self._record("move", self.position)
+
+    def _move_rel(self, dx, dy):
+        self.position = self._clamp(self.position[0] + dx, self.position[1] + dy)
+        self._record("move", self.position)
+
+    def _click(self, button, count):
+        self._record("click", button, count, self.position)
+
+    def _scroll(self, notches):
+        self._record("scroll", notches)
+
+    def _hotkey(self, keys):
+        self._record("hotkey", tuple(keys))
+
+    def _write(self, text):
+        self._record("write", text)
+
+    def take(self):
+        """Return and clear the recorded events."""
+        with self._lock:
+            events, self.events = self.events, []
+        return events
+
+    def snapshot(self):
+        return dict(super().snapshot(), position=self.position, recorded=len(self.events))
+
+
+# Named keys every backend understands (both native tables; pyautogui knows them all too).
+KEY_NAMES = frozenset(_VK_CODES) & frozenset(_X_KEYSYMS)
+
+
+def check_key(key):
+    """Raises ValueError unless `key` is one of KEY_NAMES or a single character."""
+    if len(key) != 1 and key.lower() not in KEY_NAMES:
+        raise ValueError(f"Unknown key: {key}")
+
+
+def create_native_backend():
+    system = platform.system()
+    if system == "Windows":
+        return WindowsBackend()
+    if system == "Darwin":
+        return MacBackend()
+    return XTestBackend()
+
+
+BACKENDS = {
+    "native": create_native_backend,
+    "pyautogui": PyAutoGuiBackend,
+    "recording": RecordingBackend,
+}
+
+
+def create_backend(name=None, batched=None):
+    """
+    The backend named by GLIDE_INPUT_BACKEND (native, pyautogui or recording; default
+    native, falling back to pyautogui if the native one cannot start).
+    GLIDE_INPUT_BATCH=1 wraps it in a BatchedBackend.
+    """
+    name = name or os.environ.get("GLIDE_INPUT_BACKEND", "native")
+    if batched is None:
+        batched = os.environ.get("GLIDE_INPUT_BATCH") == "1"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown input backend: {name}")
+    try:
+        backend = BACKENDS[name]()
+    except Exception as e:
+        if name != "native":
+            raise
+        print(f"Native input backend unavailable ({e}); using pyautogui")
+        backend = PyAutoGuiBackend()
+    return BatchedBackend(backend) if batched else backend
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """The shared input backend, created on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
+
+
+def set_backend(backend):
+    """Replace the shared backend (e.g. with a RecordingBackend in a benchmark); returns the old one."""
+    global _backend
+    with _backend_lock:
+        old, _backend = _backend, backend
+    return old
+
+
+def backend_status():
+    return _backend.snapshot() if _backend is not None else None
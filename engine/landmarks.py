@@ -0,0 +1,92 @@
+import threading
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+
+class HandLandmarks:
+    """
+    One hand's 21 landmarks as a reusable (21, 3) float32 buffer plus metadata.
+    `world` holds the same points in metres relative to the hand centre, when
+    the tracker provides them. `hand_id` is the stable per-hand ID assigned by
+    HandIdentifier.
+
+    Instances are acquired from a LandmarkPool and released back once their
+    frame has been consumed, so consumers read them in place; anything kept
+    beyond the current frame (e.g. training samples) must be copied.
+    """
+
+    __slots__ = ("points", "world", "timestamp", "handedness", "hand_id")
+
+    def __init__(self):
+        self.points = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self.world = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self.timestamp = 0.0
+        self.handedness = None
+        self.hand_id = None
+
+    @property
+    def flat(self):
+        """Zero-copy (63,) view in the legacy [x1, y1, z1, x2, ...] layout."""
+        return self.points.reshape(-1)
+
+    def copy(self):
+        other = HandLandmarks()
+        np.copyto(other.points, self.points)
+        np.copyto(other.world, self.world)
+        other.timestamp = self.timestamp
+        other.handedness = self.handedness
+        other.hand_id = self.hand_id
+        return other
+
+
+class LandmarkPool:
+    """
+    Free list of preallocated HandLandmarks, so the hot path never allocates.
+
+    A buffer belongs to whoever acquired it until it is released; acquire()
+    only hands out released buffers and allocates a new one when none is free,
+    so a slow consumer costs memory, never a buffer overwritten under it.
+    """
+
+    def __init__(self, size=8):
+        self._free = [HandLandmarks() for _ in range(size)]
+        self._lock = threading.Lock()
+        self.allocated = size
+
+    def acquire(self):
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+            self.allocated += 1
+        return HandLandmarks()
+
+    def release(self, items):
+        with self._lock:
+            self._free.extend(items)
+
+
+def fill_landmarks(out, mp_landmarks, timestamp, handedness=None, mp_world_landmarks=None):
+    """Copy a MediaPipe NormalizedLandmarkList (and optional world LandmarkList) into a HandLandmarks buffer in place."""
+    points = out.points
+    for i, lm in enumerate(mp_landmarks.landmark):
+        points[i] = (lm.x, lm.y, lm.z)
+    world = out.world
+    if mp_world_landmarks is not None:
+        for i, lm in enumerate(mp_world_landmarks.landmark):
+            world[i] = (lm.x, lm.y, lm.z)
+    else:
+        world.fill(0.0)
+    out.timestamp = timestamp
+    out.handedness = handedness
+    return out
+
+
+def as_points(landmarks):
+    """
+    Return landmarks as a (21, 3) float32 array.
+    HandLandmarks and float32 arrays are returned as views; lists are converted.
+    """
+    if isinstance(landmarks, HandLandmarks):
+        return landmarks.points
+    return np.asarray(landmarks, dtype=np.float32).reshape(NUM_LANDMARKS, 3)
@@ -0,0 +1,47 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """
+    Stand-in for a heavy module that is only imported on first attribute access.
+
+    Attribute assignments made before the import (e.g. pyautogui.FAILSAFE = False)
+    are remembered and applied once the module is loaded.
+    """
+
+    def __init__(self, name):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+        object.__setattr__(self, "_pending", {})
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def load(self):
+        module = self._module
+        if module is not None:
+            return module
+        with self._lock:
+            if self._module is None:
+                module = importlib.import_module(self._name)
+                for attr, value in self._pending.items():
+                    setattr(module, attr, value)
+                object.__setattr__(self, "_module", module)
+            return self._module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __setattr__(self, attr, value):
+        with self._lock:
+            if self._module is None:
+                self._pending[attr] = value
+                return
+        setattr(self._module, attr, value)
+
+
+def lazy_module(name):
+    return LazyModule(name)
@@ -1,11 +1,19 @@
-import cv2
-import threading
+import multiprocessing
+
+if __name__ == "__main__":
+    # Must run before anything else so frozen (PyInstaller) training workers start cleanly.
+    multiprocessing.freeze_support()
+
 import time
+from startup_profile import process_memory_bytes, startup_profile
+
+import threading
 import asyncio
 import uuid
 import queue
 import queue
 import numpy as np
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, BackgroundTasks
@@ -14,14 +22,34 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 
-from gesture_detector import GestureDetector
-from gesture_classifier import GestureClassifier
+from lazy_import import lazy_module
+from gesture_detector import hand_tracker
+from gesture_classifier import GestureClassifier, validate_augmentations
+from dataset_store import DatasetStore, SequenceStore
+from training_worker import TrainingRunner
+from classifier_backends import BACKENDS
 from mouse_controller import MouseController
-
+from frame_pipeline import FrameRing, LatencyStats, LatestChannel, StageStats
+from preview_stream import PreviewBroadcaster
+from roi_tracking import RoiTracker
+from frame_governor import FrameGovernor
+from gesture_smoother import DEFAULT_SMOOTHING, GestureSmoother, validate_smoothing
+from sequence_recognizer import MotionTracker, SequenceCapture, SequenceRecognizer
+from hand_identity import HandIdentifier
+from gesture_bindings import BindingTable, benchmark_lookup
+
+import input_backends
 from desktop_controller import desktop_controller
-from action_mapper import ACTION_MAP, execute_action
+from action_mapper import ACTION_MAP, action_registry
+from action_executor import action_executor
 from websocket_manager import manager
 
+# OpenCV and MediaPipe are only needed once the camera starts; importing them here
+# would delay the HTTP server by the better part of a second.
+cv2 = lazy_module("cv2")
+
+startup_profile.mark("imports")
+
 app = FastAPI()
 
 app.add_middleware(
@@ -32,7 +60,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-message_queue = queue.Queue()
+# Engine threads put status/detection/training messages here; the connection manager
+# hands them to the event loop and on to every client.
+message_queue = manager
 
 class SystemState:
     def __init__(self):
@@ -50,21 +80,23 @@ class SystemState:
 
         self.training_mode = False
         self.training_gesture_id = None
+        self.training_capture_mode = "pose"
         self.training_data_buffer = []
+        self.training_session_id = None
         self.training_sample_target = 0
         self.last_capture_time = 0
 
         self.confidence_threshold = 0.80
         self.speed_factor = 1.0
-        self.latest_frame = None
         self.action_lock = threading.Lock()
+        self.training_lock = threading.Lock()
 
         self.gestures = self.load_gestures()
         self.last_known_landmarks = None
         self.latest_frame_raw = None
-        self.latest_landmarks = None
+        self.latest_hand_drawings = None
         self.draw_lock = threading.Lock()
-        self.last_confirmed_action = None
+        self.last_confirmed_actions = {}
 
     def load_gestures(self):
         import json
@@ -77,7 +109,7 @@ class SystemState:
                 print(f"Error loading gestures: {e}")
 
         return [
-             {"id": "1", "name": "Swipe Left", "emoji": "👈", "action": "previous_track", "sampleCount": 0},
+             {"id": "1", "name": "Swipe Left", "emoji": "👈", "action": "prev_track", "sampleCount": 0},
              {"id": "2", "name": "Swipe Right", "emoji": "👉", "action": "next_track", "sampleCount": 0},
              {"id": "3", "name": "Thumbs Up", "emoji": "👍", "action": "play_pause", "sampleCount": 0},
         ]
@@ -90,126 +122,437 @@ class SystemState:
             print("Gestures saved to gestures.json")
         except Exception as e:
             print(f"Error saving gestures: {e}")
-        self.confidence_threshold = 0.80
-        self.latest_frame = None
 
 state = SystemState()
-detector = GestureDetector()
-classifier = GestureClassifier()
+classifier = GestureClassifier(load=False)
+dataset_store = DatasetStore()
+sequence_store = SequenceStore()
+training_runner = TrainingRunner()
 mouse_controller = MouseController()
 
-import mediapipe as mp
-_draw_hands = mp.solutions.hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,
-    min_detection_confidence=0.7,
-    min_tracking_confidence=0.5
-)
-_draw_mp_draw = mp.solutions.drawing_utils
-_draw_mp_hands = mp.solutions.hands
+def load_actions():
+    """Builds plugin actions from actions.json and checks every gesture's action against the registry."""
+    for error in action_registry.load_plugins():
+        print(f"Action plugins: {error}")
+    for gesture_name, action in action_registry.validate_gestures(state.gestures):
+        print(f"Gesture {gesture_name} is mapped to unknown action {action}; it will not run")
 
-def camera_loop():
+load_actions()
+
+subsystems = {"model": "loading", "tracker": "loading", "input": "loading"}
+
+def load_hand_tracking():
+    """Imports MediaPipe and builds the shared hand tracker on first use (camera or warmup thread)."""
+    if hand_tracker.loaded:
+        return
+    started = time.perf_counter()
+    hand_tracker.load()
+    subsystems["tracker"] = "ready"
+    startup_profile.mark("hand_tracking", started)
+
+def warmup_subsystems():
+    """Loads the heavy subsystems in the background once the server is accepting connections."""
+    started = time.perf_counter()
+    try:
+        classifier.load_model()
+        subsystems["model"] = "ready" if classifier.model is not None else "untrained"
+    except Exception as e:
+        subsystems["model"] = "error"
+        print(f"Model load error: {e}")
+    for gesture_id, sequences in sequence_store.sets().items():
+        try:
+            sequence_recognizer.set_sequences(gesture_id, sequences)
+        except Exception as e:
+            print(f"Error loading motion templates for {gesture_id}: {e}")
+    startup_profile.mark("model_load", started)
+
+    started = time.perf_counter()
+    try:
+        cv2.load()
+        startup_profile.mark("import_cv2", started)
+        load_hand_tracking()
+    except Exception as e:
+        subsystems["tracker"] = "error"
+        print(f"Hand tracking init error: {e}")
+
+    started = time.perf_counter()
+    try:
+        desktop_controller.load()
+        mouse_controller.load()
+        subsystems["input"] = "ready"
+    except Exception as e:
+        subsystems["input"] = "error"
+        print(f"Input init error: {e}")
+    startup_profile.mark("input", started)
+
+    message_queue.put({"type": "status", "data": current_status()})
+
+def current_status(fps=0):
+    """Keyword arguments for ConnectionManager.send_status describing the engine right now."""
+    return {
+        "fps": fps,
+        "camera_status": "on" if state.camera_running else "off",
+        "detection_active": state.detection_active,
+        "model_status": "ready" if classifier.model is not None else "loading",
+        "total_detections": state.total_detections,
+        "actions_executed": state.actions_executed,
+        "avg_confidence": round(state.confidence_sum / state.confidence_count * 100, 1) if state.confidence_count > 0 else 0,
+        "confidence_threshold": state.confidence_threshold,
+        "speed_factor": state.speed_factor,
+        "cursor_mode": state.cursor_mode,
+        "pipeline": pipeline_stats(),
+        "governor": frame_governor.snapshot(),
+        "subsystems": dict(subsystems),
+        "tracker": hand_tracker.snapshot(),
+        "memory": memory_stats()
+    }
+
+def memory_stats():
+    """Resident memory of the engine and of its largest components, in MB."""
+    process_bytes = process_memory_bytes()
+    model = classifier.model
+    return {
+        "process_mb": round(process_bytes / 1e6, 1) if process_bytes is not None else None,
+        "tracker_mb": hand_tracker.snapshot()["memory_mb"],
+        "model_mb": round(model.nbytes / 1e6, 2) if model is not None else None,
+    }
+
+frame_ring = FrameRing(slots=4)
+capture_stats = StageStats("capture")
+inference_stats = StageStats("inference")
+preview_stats = StageStats("preview")
+preview_broadcaster = PreviewBroadcaster()
+roi_tracker = RoiTracker()
+hand_identifier = HandIdentifier()
+frame_governor = FrameGovernor()
+gesture_smoother = GestureSmoother()
+gesture_bindings = None
+
+def apply_gesture_config():
+    """
+    Rebuilds everything derived from the gesture list and the confidence threshold; call
+    after every change to either. The global threshold is the enter threshold for gestures
+    without their own.
+    """
+    global gesture_bindings
+    gesture_smoother.configure(state.gestures, defaults={
+        "enter": state.confidence_threshold,
+        "exit": min(DEFAULT_SMOOTHING["exit"], state.confidence_threshold),
+    })
+    gesture_bindings = BindingTable(state.gestures, action_registry)
+
+apply_gesture_config()
+motion_tracker = MotionTracker()
+sequence_capture = SequenceCapture()
+sequence_recognizer = SequenceRecognizer()
+landmark_channel = LatestChannel(release=hand_tracker.pool.release)
+decision_latency = LatencyStats()
+detection_counts = {"classified": 0, "empty": 0}
+
+def detection_stats():
+    return {
+        "classified": detection_counts["classified"],
+        "empty": detection_counts["empty"],
+        "skipped": landmark_channel.skipped,
+        "published": landmark_channel.published,
+        "capture_to_decision": decision_latency.snapshot(),
+    }
+
+def pipeline_stats():
+    return {
+        "capture": capture_stats.snapshot(),
+        "inference": inference_stats.snapshot(),
+        "preview": preview_stats.snapshot(),
+        "preview_stream": preview_broadcaster.snapshot(),
+        "roi": roi_tracker.snapshot(),
+        "detection": detection_stats(),
+        "smoothing": gesture_smoother.snapshot(),
+        "motion": sequence_recognizer.snapshot(),
+        "actions": action_executor.snapshot(),
+        "os_helper": desktop_controller.helper_status(),
+        "cursor": mouse_controller.cursor.snapshot(),
+        "cursor_mapping": mouse_controller.mapper.snapshot(),
+        "websocket": manager.snapshot(),
+        "input": input_backends.backend_status(),
+    }
+
+def capture_loop():
+    """Capture stage: only grabs frames into the shared ring, never waits on inference or encoding."""
     cap = cv2.VideoCapture(0)
     if not cap.isOpened():
         print("Error: Could not open webcam.")
+        state.camera_running = False
+        frame_ring.close()
         return
 
     cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
     cap.set(cv2.CAP_PROP_FPS, 30)
+    default_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    applied_size = default_size
 
-    state.camera_running = True
     print("Camera started.")
 
-    fps_start_time = time.time()
-    frame_count = 0
-    fps = 0
-
+    raw = None
+    first_frame = True
     while state.camera_running:
-        ret, frame = cap.read()
+        size = frame_governor.resolution or default_size
+        if size != applied_size:
+            # Only on governor mode changes: some drivers briefly stall when reconfigured.
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+            cap.set(cv2.CAP_PROP_FPS, max(5, round(frame_governor.target_fps)))
+            applied_size = size
+            raw = None
+
+        ret, raw = cap.read(raw)
         if not ret:
+            raw = None
             time.sleep(0.1)
             continue
 
-        frame = cv2.flip(frame, 1)
+        if first_frame:
+            first_frame = False
+            startup_profile.mark("first_frame")
 
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        rgb.flags.writeable = False
-        draw_results = _draw_hands.process(rgb)
-        rgb.flags.writeable = True
-
-        if draw_results.multi_hand_landmarks:
-            for hand_lm in draw_results.multi_hand_landmarks:
-                _draw_mp_draw.draw_landmarks(
-                    frame, hand_lm, _draw_mp_hands.HAND_CONNECTIONS
-                )
-
-            first_hand = draw_results.multi_hand_landmarks[0]
-            landmarks = []
-            for lm in first_hand.landmark:
-                landmarks.extend([lm.x, lm.y, lm.z])
-            with state.draw_lock:
-                state.latest_landmarks = landmarks
-        else:
-            with state.draw_lock:
-                state.latest_landmarks = None
+        captured_at = time.time()
+        slot, buf = frame_ring.acquire_write(raw.shape, raw.dtype)
+        if slot is None:
+            capture_stats.add_dropped()
+            continue
+
+        cv2.flip(raw, 1, dst=buf)
+        frame_ring.publish(slot, captured_at)
+        capture_stats.tick(time.time() - captured_at)
+
+    frame_ring.close()
+    cap.release()
+    print("Camera stopped.")
+
+def camera_loop():
+    """Inference stage: runs MediaPipe on the newest captured frame, skipping stale ones."""
+    load_hand_tracking()
+    last_seq = 0
+    last_status_time = time.time()
+    next_due = 0.0
+
+    while state.camera_running:
+        delay = next_due - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+        item = frame_ring.acquire_latest(last_seq)
+        if item is None:
+            continue
 
+        seq, slot, frame, captured_at = item
+        started = time.time()
+        shape = frame.shape
+        region = roi_tracker.region(shape)
         try:
-             encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 92]
-             ret, buffer = cv2.imencode('.jpg', frame, encode_param)
-             if ret:
-                 state.latest_frame = buffer.tobytes()
-        except Exception as e:
-             print(f"Frame encoding error: {e}")
+            rgb = roi_tracker.prepare(frame, region)
+        finally:
+            frame_ring.release(slot)
+
+        dropped = seq - last_seq - 1 if last_seq else 0
+        last_seq = seq
+
+        rgb.flags.writeable = False
+        hands, drawings = hand_tracker.process(rgb, captured_at, roi_tracker.transform(region, shape))
+        roi_tracker.update(hands, shape)
+
+        with state.draw_lock:
+            state.latest_hand_drawings = drawings
+
+        hands = hand_identifier.assign(hands, captured_at)
+        landmark_channel.publish(hands)
+
+        busy = time.time() - started
+        inference_stats.tick(busy, dropped)
+        frame_governor.observe(bool(hands), busy)
+        next_due = started + frame_governor.frame_interval
 
-        frame_count += 1
         curr_time = time.time()
-        if curr_time - fps_start_time > 1.0:
-            fps = frame_count / (curr_time - fps_start_time)
-            frame_count = 0
-            fps_start_time = curr_time
+        if curr_time - last_status_time > 1.0:
+            last_status_time = curr_time
 
             message_queue.put({
                 "type": "status",
-                "data": {
-                    "fps": round(fps),
-                    "camera_status": "on",
-                    "detection_active": state.detection_active,
-                    "model_status": "ready" if classifier.model is not None else "loading",
-                    "total_detections": state.total_detections,
-                    "actions_executed": state.actions_executed,
-                    "avg_confidence": round(state.confidence_sum / state.confidence_count * 100, 1) if state.confidence_count > 0 else 0,
-                    "confidence_threshold": state.confidence_threshold,
-                    "speed_factor": state.speed_factor,
-                    "cursor_mode": state.cursor_mode
-                }
+                "data": current_status(fps=round(inference_stats.fps))
             })
-            
-        time.sleep(0.01)
 
-    cap.release()
-    print("Camera stopped.")
+def preview_loop():
+    """
+    Preview stage: while someone is watching /video_feed, draws the latest landmarks onto
+    a downscaled copy of the newest frame, JPEG-encodes it and hands it to the broadcaster.
+    Runs at most at the configured preview FPS and idles when there are no viewers.
+    """
+    last_seq = 0
+    canvas = None
+    next_due = 0.0
+
+    while state.camera_running:
+        if not preview_broadcaster.wait_for_viewers(0.5):
+            continue
+
+        delay = next_due - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+        item = frame_ring.acquire_latest(last_seq)
+        if item is None:
+            continue
+
+        seq, slot, frame, _ = item
+        started = time.time()
+        next_due = started + 1.0 / preview_broadcaster.fps
+        try:
+            h, w = frame.shape[:2]
+            scale = min(1.0, preview_broadcaster.max_width / w)
+            size = (int(w * scale), int(h * scale))
+            if canvas is None or canvas.shape[1::-1] != size:
+                canvas = np.empty((size[1], size[0]) + frame.shape[2:], dtype=frame.dtype)
+            if scale < 1.0:
+                cv2.resize(frame, size, dst=canvas, interpolation=cv2.INTER_AREA)
+            else:
+                np.copyto(canvas, frame)
+        finally:
+            frame_ring.release(slot)
+
+        dropped = seq - last_seq - 1 if last_seq else 0
+        last_seq = seq
+
+        with state.draw_lock:
+            hand_drawings = state.latest_hand_drawings
+
+        if hand_drawings:
+            hand_tracker.draw(canvas, hand_drawings)
+
+        try:
+             encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), preview_broadcaster.quality]
+             ret, buffer = cv2.imencode('.jpg', canvas, encode_param)
+             if ret:
+                 preview_broadcaster.publish(buffer.tobytes())
+        except Exception as e:
+             print(f"Frame encoding error: {e}")
+
+        preview_stats.tick(time.time() - started, dropped)
+
+def start_pipeline_threads():
+    """Starts any pipeline stage thread that is not already running."""
+    stages = (
+        ("CaptureThread", capture_loop),
+        ("CameraThread", camera_loop),
+        ("PreviewThread", preview_loop),
+        ("DetectionThread", detection_loop),
+    )
+    running = {t.name for t in threading.enumerate()}
+    if "CaptureThread" not in running:
+        frame_ring.reopen()
+    for name, target in stages:
+        if name not in running:
+            threading.Thread(target=target, name=name, daemon=True).start()
+
+HAND_CHOICES = ("Left", "Right", "any")
+
+def validate_binding(gesture):
+    """Check a gesture's optional hand/modifier binding; raises ValueError on bad values."""
+    hand = gesture.get("hand")
+    if hand is not None and hand not in HAND_CHOICES:
+        raise ValueError(f"hand must be one of {', '.join(HAND_CHOICES)}")
+    modifier = gesture.get("modifier")
+    if modifier is not None and not isinstance(modifier, str):
+        raise ValueError("modifier must be a gesture ID")
+
+def gesture_applies(binding, hand, labels):
+    """
+    Whether a recognized gesture's action may run for this hand: its optional "hand"
+    must match the hand's handedness, and its optional "modifier" gesture must be
+    active on another hand at the same time (e.g. left fist + right palm).
+    """
+    if binding.hand is not None and binding.hand != hand.handedness:
+        return False
+    modifier = binding.modifier
+    if modifier and not any(label == modifier for other_id, label in labels.items() if other_id != hand.hand_id):
+        return False
+    return True
+
+def classify_hands(hands):
+    """
+    One batched classifier call for all hands, then per-hand temporal smoothing.
+    Returns {hand_id: (label or None, confidence)}.
+    """
+    classes, probabilities = classifier.predict_proba_batch(hands)
+    if classes is None:
+        return {hand.hand_id: (None, 0.0) for hand in hands}
+    decisions = {}
+    for hand, hand_probabilities in zip(hands, probabilities):
+        # Only a gesture the smoother has confirmed (held above its enter
+        # threshold for its dwell time) comes back with a label.
+        label, confidence, _ = gesture_smoother.update(classes, hand_probabilities, hand.timestamp, track=hand.hand_id)
+        decisions[hand.hand_id] = (label, confidence)
+    return decisions
 
 def detection_loop():
     """Independent loop for AI processing and Action Execution.
-    Uses shared landmarks from camera_loop — no duplicate MediaPipe call."""
+    Wakes once per landmark set published by camera_loop — no polling, no duplicate frames."""
     print("Detection thread started.")
+    motion_hand_id = None
 
     while state.camera_running:
-        with state.draw_lock:
-            hand_landmarks = list(state.latest_landmarks) if state.latest_landmarks else None
+        item = landmark_channel.take(timeout=0.5)
+        if item is None:
+            continue
 
-        if hand_landmarks is None:
-            time.sleep(0.01)
+        _, hands = item
+        if not hands:
+            detection_counts["empty"] += 1
+            gesture_smoother.clear(time.time())
+            state.last_confirmed_actions.clear()
+            mouse_controller.release()
+            motion_tracker.reset()
+            sequence_capture.reset()
+            sequence_recognizer.reset()
             continue
 
+        # Training capture, motion gestures and the cursor follow the longest-tracked hand.
+        hand_landmarks = hands[0]
+        if hand_landmarks.hand_id != motion_hand_id:
+            motion_hand_id = hand_landmarks.hand_id
+            mouse_controller.release()
+            motion_tracker.reset()
+            sequence_recognizer.reset()
+
         try:
-            if hand_landmarks:
-                 
-                 if state.training_mode and state.training_gesture_id:
+            if hand_landmarks is not None:
+                 motion_feature = motion_tracker.update(hand_landmarks, hand_landmarks.timestamp)
+
+                 if state.training_mode and state.training_gesture_id and state.training_capture_mode == "sequence":
+                      sequence = sequence_capture.add(motion_feature, motion_tracker.speed, hand_landmarks.timestamp)
+                      if sequence is not None:
+                          state.training_data_buffer.append(sequence)
+                          sample_count = len(state.training_data_buffer)
+
+                          message_queue.put({
+                              "type": "training",
+                              "data": {
+                                  "gestureId": state.training_gesture_id,
+                                  "sampleCount": sample_count,
+                                  "target": state.training_sample_target,
+                                  "mode": "sequence"
+                              }
+                          })
+
+                          if sample_count >= state.training_sample_target:
+                              state.training_mode = False
+                              print(f"Sequence capture complete for {state.training_gesture_id}")
+                              if save_sequence_data(state.training_gesture_id, state.training_data_buffer):
+                                  message_queue.put({"type": "training_complete", "data": {"gestureId": state.training_gesture_id, "mode": "sequence"}})
+
+                 elif state.training_mode and state.training_gesture_id:
                       current_time = time.time()
                       if current_time - state.last_capture_time >= 0.1:
                           state.last_capture_time = current_time
-                          state.training_data_buffer.append(hand_landmarks)
+                          state.training_data_buffer.append(hand_landmarks.flat.copy())
                           sample_count = len(state.training_data_buffer)
 
                           message_queue.put({
@@ -229,156 +572,199 @@ def detection_loop():
                  
                  elif state.detection_active:
                       current_time = time.time()
-                      prediction_label, confidence_score = classifier.predict(hand_landmarks)
-
-                      mapped_gesture = next((g for g in state.gestures if g["id"] == prediction_label), None)
-                      gesture_name = mapped_gesture["name"] if mapped_gesture else None
-                      action_name = mapped_gesture["action"] if mapped_gesture else None
-                      
-                      gesture_map = {g["name"]: g["action"] for g in state.gestures}
-                      
-                      ACTION_COOLDOWNS = {
-                         "volume_up": 0.15,
-                         "volume_down": 0.15,
-                         "brightness_up": 0.15,
-                         "brightness_down": 0.15,
-                         "scroll_up": 0.15,
-                         "scroll_down": 0.15,
-                         "play_pause": 2.5,
-                         "next_track": 2.0,
-                         "prev_track": 2.0,
-                         "screenshot": 4.0,
-                         "switch_tab": 1.0,
-                         "mute": 2.0,
-                         "toggle_cursor": 0.5,
-                         "None": 0.0
-                      }
-
-                      ONE_SHOT_ACTIONS = {
-                          "screenshot",
-                          "play_pause", "next_track", "prev_track", "mute",
-                      }
-
-                      def execute_gesture_action_logic(act_name):
-                          if act_name == "toggle_cursor":
-                             last_tog = state.last_action_time.get("toggle_cursor", 0)
-                             if current_time - last_tog > 1.0:
-                                  state.cursor_mode = not state.cursor_mode
-                                  print(f"Cursor Mode: {'ON' if state.cursor_mode else 'OFF'}")
-                                  state.last_action_time["toggle_cursor"] = current_time
-                                  message_queue.put({
-                                        "type": "status",
-                                        "data": {
-                                            "detection_active": state.detection_active,
-                                            "cursor_mode": state.cursor_mode,
-                                            "camera_status": "on" if state.camera_running else "off",
-                                            "model_status": "ready" if classifier.model is not None else "loading",
-                                            "fps": 0,
-                                            "confidence_threshold": state.confidence_threshold,
-                                            "speed_factor": state.speed_factor
-                                        }
-                                  })
-                             return
-
-                          if act_name in ONE_SHOT_ACTIONS:
-                              if act_name != state.last_confirmed_action:
-                                  print(f"Executing: {act_name} for {gesture_name}")
-                                  execute_action(act_name)
-                                  state.actions_executed += 1
-                                  state.last_action_time[act_name] = current_time
-                              return
-
-                          last_time = state.last_action_time.get(act_name, 0)
-                          base_cooldown = ACTION_COOLDOWNS.get(act_name, 0.5)
-                          cooldown = base_cooldown / max(state.speed_factor, 0.1)
-
-                          if current_time - last_time > cooldown:
-                              print(f"Executing: {act_name} for {gesture_name}")
-                              execute_action(act_name)
-                              state.actions_executed += 1
-                              state.last_action_time[act_name] = current_time
-
-                      if action_name == "toggle_cursor" and confidence_score > 0.8:
-                           execute_gesture_action_logic(action_name)
-
-                      elif state.cursor_mode:
-                          mouse_controller.update(hand_landmarks)
-                          
-                      else:
-                          if gesture_name and confidence_score > state.confidence_threshold:
-                              if action_name and action_name != "toggle_cursor":
-                                  execute_gesture_action_logic(action_name)
-                      
-                      if gesture_name and confidence_score > state.confidence_threshold and action_name:
-                          state.last_confirmed_action = action_name
-                      else:
-                          state.last_confirmed_action = None
-
-                      should_notify = False
-                      if confidence_score > state.confidence_threshold:
-                          notification_debounce = 0.5 / max(state.speed_factor, 0.1)
-                          if current_time - state.last_notification_time > notification_debounce:
-                              if state.cursor_mode:
-                                  if action_name == "toggle_cursor" and confidence_score > 0.8:
-                                      should_notify = True
-                              elif action_name:
-                                  should_notify = True
-
-                          if should_notify:
-                              state.last_notification_time = current_time
-                              state.total_detections += 1
-                              state.confidence_sum += float(confidence_score)
-                              state.confidence_count += 1
-                              message_queue.put({
-                                  "type": "detection",
-                                  "data": {
-                                      "gesture_id": "detect_" + str(uuid.uuid4())[:8],
-                                      "gesture_name": gesture_name,
-                                      "confidence": float(confidence_score),
-                                      "action": action_name or "None",
-                                      "executed": True 
-                                  }
-                              })
+                      # One read per frame; a configuration change swaps in a whole new table.
+                      bindings = gesture_bindings
+                      motion = sequence_recognizer.update(motion_feature, hand_landmarks.timestamp)
+                      decisions = classify_hands(hands)
+                      gesture_smoother.retain(decisions, current_time)
+                      if motion is not None:
+                          # A completed motion gesture takes precedence over the static pose.
+                          decisions[hand_landmarks.hand_id] = motion
+
+                      labels = {hand_id: label for hand_id, (label, _) in decisions.items() if label is not None}
+                      for hand in hands:
+                          prediction_label, confidence_score = decisions[hand.hand_id]
+                          handle_hand_decision(hand, prediction_label, confidence_score, labels, current_time, hand is hand_landmarks, bindings)
+
+                      for hand_id in [h for h in state.last_confirmed_actions if h not in decisions]:
+                          del state.last_confirmed_actions[hand_id]
+
+                      detection_counts["classified"] += len(hands)
+                      decision_latency.add(time.time() - hand_landmarks.timestamp)
 
         except Exception as e:
             print(f"Detection Error: {e}")
-            
-        time.sleep(0.01)
 
-def save_training_data(gesture_id, data):
+def execute_binding_action(binding, hand, current_time):
+    """Fires a bound action, subject to its cooldown (repeating actions) or once per gesture (one-shots)."""
+    act_name = binding.action
+    if binding.toggles_cursor:
+       last_tog = state.last_action_time.get("toggle_cursor", 0)
+       if current_time - last_tog > 1.0:
+            state.cursor_mode = not state.cursor_mode
+            print(f"Cursor Mode: {'ON' if state.cursor_mode else 'OFF'}")
+            mouse_controller.release()
+            state.last_action_time["toggle_cursor"] = current_time
+            message_queue.put({
+                  "type": "status",
+                  "data": {
+                      "detection_active": state.detection_active,
+                      "cursor_mode": state.cursor_mode,
+                      "camera_status": "on" if state.camera_running else "off",
+                      "model_status": "ready" if classifier.model is not None else "loading",
+                      "fps": 0,
+                      "confidence_threshold": state.confidence_threshold,
+                      "speed_factor": state.speed_factor
+                  }
+            })
+       return
 
-    import os
-    if not os.path.exists("data"):
-        os.makedirs("data")
+    if not binding.dispatch:
+        return
 
-    filename = f"data/{gesture_id}.npy"
-    if os.path.exists(filename):
-        existing = np.load(filename)
-        data = np.concatenate((existing, data))
+    if binding.one_shot:
+        if act_name != state.last_confirmed_actions.get(hand.hand_id):
+            print(f"Executing: {act_name} for {binding.name}")
+            action_executor.submit(act_name)
+            state.actions_executed += 1
+            state.last_action_time[act_name] = current_time
+        return
 
-    np.save(filename, data)
-    print(f"Saved {len(data)} samples for {gesture_id}")
+    last_time = state.last_action_time.get(act_name, 0)
+    cooldown = binding.cooldown / max(state.speed_factor, 0.1)
+
+    if current_time - last_time > cooldown:
+        print(f"Executing: {act_name} for {binding.name}")
+        action_executor.submit(act_name)
+        state.actions_executed += 1
+        state.last_action_time[act_name] = current_time
+
+def handle_hand_decision(hand, prediction_label, confidence_score, labels, current_time, primary, bindings):
+    """Runs the action logic for one hand's (smoothed) gesture decision."""
+    binding = bindings.get(prediction_label) if prediction_label is not None else None
+    if binding is not None and not gesture_applies(binding, hand, labels):
+        binding = None
+    gesture_name = binding.name if binding else None
+    action_name = binding.action if binding else None
+
+    if binding is not None and binding.toggles_cursor:
+         execute_binding_action(binding, hand, current_time)
+
+    elif state.cursor_mode:
+        if primary:
+            mouse_controller.update(hand)
+
+    elif binding is not None and action_name:
+        execute_binding_action(binding, hand, current_time)
+
+    if gesture_name and action_name:
+        state.last_confirmed_actions[hand.hand_id] = action_name
+    else:
+        state.last_confirmed_actions.pop(hand.hand_id, None)
+
+    should_notify = False
+    if gesture_name:
+        notification_debounce = 0.5 / max(state.speed_factor, 0.1)
+        if current_time - state.last_notification_time > notification_debounce:
+            if state.cursor_mode:
+                if action_name == "toggle_cursor":
+                    should_notify = True
+            elif action_name:
+                should_notify = True
+
+        if should_notify:
+            state.last_notification_time = current_time
+            state.total_detections += 1
+            state.confidence_sum += float(confidence_score)
+            state.confidence_count += 1
+            message_queue.put({
+                "type": "detection",
+                "data": {
+                    "gesture_id": "detect_" + str(uuid.uuid4())[:8],
+                    "gesture_name": gesture_name,
+                    "confidence": float(confidence_score),
+                    "action": action_name or "None",
+                    "executed": True,
+                    "hand": hand.handedness
+                }
+            })
+
+def save_training_data(gesture_id, data):
+
+    entry = dataset_store.append(gesture_id, np.asarray(data, dtype=np.float32), session_id=state.training_session_id)
+    total = dataset_store.counts().get(gesture_id, 0)
+    print(f"Saved {entry['count'] if entry else 0} new samples for {gesture_id} ({total} total)")
 
-def retrain_model_logic():
+def save_sequence_data(gesture_id, sequences):
+    """
+    Store captured motion sequences (no retraining needed). Their templates are selected in
+    the training worker and swapped into the recognizer when ready, off the detection thread.
+    """
+    try:
+        all_sequences = sequence_store.append(gesture_id, np.stack(sequences))
+    except ValueError as e:
+        print(f"Could not save motion sequences for {gesture_id}: {e}")
+        message_queue.put({"type": "training_error", "data": {"message": str(e)}})
+        return False
+    future = training_runner.submit_templates(all_sequences)
+    future.add_done_callback(lambda f: install_motion_templates(gesture_id, f))
+    print(f"Saved {len(sequences)} new motion sequences for {gesture_id} ({len(all_sequences)} total)")
+    return True
+
+def install_motion_templates(gesture_id, future):
+    try:
+        templates, threshold = future.result()
+    except Exception as e:
+        print(f"Error selecting motion templates for {gesture_id}: {e}")
+        if isinstance(e, BrokenProcessPool):
+            training_runner.reset()
+        return
+    if sequence_store.load(gesture_id) is None:
+        # The gesture was deleted while its templates were being selected.
+        return
+    sequence_recognizer.install(gesture_id, templates, threshold)
 
-    import os
-    import glob
+def retrain_model_logic(validate=False):
+    """
+    Runs a training job in the worker process, forwarding its progress to the UI.
+    When it finishes, the new model is loaded here and swapped in with a single
+    reference assignment, so detection never sees a partially built model.
+    """
+    if not state.training_lock.acquire(blocking=False):
+        print("Retraining already in progress.")
+        return False
 
-    X = []
-    y = []
+    try:
+        future = training_runner.submit(classifier.backend_name, classifier.augmentations, validate)
 
-    files = glob.glob("data/*.npy")
-    for f in files:
-        gesture_id = os.path.basename(f).replace(".npy", "")
-        data = np.load(f)
-        for sample in data:
-            X.append(sample)
-            y.append(gesture_id)
+        while True:
+            try:
+                event = training_runner.progress_queue.get(timeout=0.1)
+                message_queue.put({"type": "training_progress", "data": event})
+            except queue.Empty:
+                if future.done():
+                    break
 
-    if X:
-        print(f"Retraining on {len(X)} samples...")
-        classifier.train(X, y)
-        print("Retraining done.")
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Training worker failed: {e}")
+            training_runner.reset()
+            message_queue.put({"type": "training_error", "data": {"message": str(e)}})
+            return False
+
+        if result["status"] != "success":
+            return False
+
+        classifier.load_model()
+        # Gestures deleted while the job was running come back with the new model; drop them again.
+        if classifier.model is not None:
+            live = set(dataset_store.counts())
+            for gesture_id in set(classifier.model.classes_.tolist()) - live:
+                classifier.remove_gesture(gesture_id)
+
+        accuracy = result["accuracy"]
+        print(f"Retraining done ({result['mode']}, held-out accuracy: {accuracy if accuracy is not None else 'n/a'}).")
         message_queue.put({
             "type": "status",
             "data": {
@@ -391,51 +777,35 @@ def retrain_model_logic():
         message_queue.put({
             "type": "training_complete",
             "data": {
-                "accuracy": 100
+                "accuracy": round(accuracy * 100, 1) if accuracy is not None else None,
+                "mode": result["mode"],
+                "samples": result["samples"]
             }
         })
         return True
-    return False
-
-async def message_consumer():
-    """Reads from the queue and broadcasts to WebSockets."""
-    while True:
-        try:
-
-            while not message_queue.empty():
-                msg = message_queue.get_nowait()
-                if msg["type"] == "status":
-                    await manager.send_status(**msg["data"])
-                elif msg["type"] == "detection":
-                    await manager.send_detection(**msg["data"])
-                elif msg["type"] == "training":
-
-                    await manager.broadcast(msg)
-                elif msg["type"] == "training_complete":
-                     await manager.broadcast(msg)
-
-            await asyncio.sleep(0.05)
-        except Exception as e:
-            print(f"Consumer Error: {e}")
-            await asyncio.sleep(1)
+    finally:
+        state.training_lock.release()
 
 @app.on_event("startup")
 async def startup_event():
+    startup_profile.mark("server_ready")
     state.camera_running = True
-    
-    camera_thread = threading.Thread(target=camera_loop, name="CameraThread", daemon=True)
-    camera_thread.start()
-
-    detection_thread = threading.Thread(target=detection_loop, name="DetectionThread", daemon=True)
-    detection_thread.start()
-
-    asyncio.create_task(message_consumer())
+    preview_broadcaster.attach_loop(asyncio.get_running_loop())
+    manager.attach_loop(asyncio.get_running_loop())
+    threading.Thread(target=warmup_subsystems, name="WarmupThread", daemon=True).start()
+    action_executor.start()
+    start_pipeline_threads()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     print("Shutting down... Stopping camera.")
     state.camera_running = False
+    training_runner.shutdown()
+    action_executor.stop()
+    desktop_controller.close()
+    mouse_controller.close()
     time.sleep(0.5)
+    hand_tracker.close()
 
 class Gesture(BaseModel):
     id: str
@@ -443,99 +813,229 @@ class Gesture(BaseModel):
     emoji: str
     action: str
     sampleCount: int = 0
+    smoothing: Optional[Dict[str, Any]] = None
+    # Optional: only fire for this hand ("Left"/"Right"), or only while another hand shows `modifier`.
+    hand: Optional[str] = None
+    modifier: Optional[str] = None
 
 class CaptureRequest(BaseModel):
     gestureId: str
     numSamples: int = 50
+    # "pose" records single frames; "sequence" records one motion (e.g. a swipe) per sample.
+    mode: str = "pose"
+
+class CalibrationRequest(BaseModel):
+    # Seconds to record the comfortable hand region for (cursor mode must be on).
+    duration: float = 5.0
+
+class CalibrationPoints(BaseModel):
+    # [{"hand": [x, y], "screen": [u, v]}, ...]; hand in frame units, screen in 0..1 desktop units.
+    points: List[Dict[str, List[float]]]
 
 @app.get("/")
 def read_root():
     return {"status": "ok", "message": "Glide Backend Running"}
 
-def gen_frames():
-    while True:
-        if state.latest_frame:
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + state.latest_frame + b'\r\n')
-        time.sleep(0.016)
-
 @app.get("/video_feed")
 def video_feed():
-    return StreamingResponse(gen_frames(), media_type="multipart/x-mixed-replace; boundary=frame")
+    return StreamingResponse(preview_broadcaster.frames(), media_type="multipart/x-mixed-replace; boundary=frame")
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
     try:
-        await manager.send_status()
+        await manager.send_status(**current_status())
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
+@app.get("/system/startup")
+def startup_route():
+    """Startup phase timings, for tracking load-time regressions (also in the bundled build)."""
+    return {"subsystems": dict(subsystems), "tracker": hand_tracker.snapshot(), **startup_profile.snapshot()}
+
 @app.get("/gestures")
 def get_gestures():
     return state.gestures
 
+@app.get("/gestures/benchmark")
+def gestures_benchmark_route(rounds: int = 20000):
+    """Per-frame cost of resolving a recognized label to its action: list scan vs. the compiled table."""
+    return benchmark_lookup(state.gestures, gesture_bindings, rounds=max(100, min(rounds, 1_000_000)))
+
 @app.post("/gestures")
 def add_gesture(gesture: Gesture):
-    state.gestures.append(gesture.model_dump())
+    try:
+        validate_smoothing(gesture.smoothing)
+        validate_binding(gesture.model_dump())
+        action_registry.check(gesture.action)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    gesture.action = action_registry.resolve(gesture.action)
+    state.gestures.append(gesture.model_dump(exclude_none=True))
     state.save_gestures()
+    apply_gesture_config()
     return {"status": "success", "gesture": gesture}
 
 @app.delete("/gestures/{gesture_id}")
 def delete_gesture(gesture_id: str):
     state.gestures = [g for g in state.gestures if g["id"] != gesture_id]
     state.save_gestures()
+    apply_gesture_config()
 
-    import os
     try:
-        data_path = f"data/{gesture_id}.npy"
-        if os.path.exists(data_path):
-            os.remove(data_path)
+        if dataset_store.delete_gesture(gesture_id):
             print(f"Deleted training data for {gesture_id}")
+        if sequence_store.delete_gesture(gesture_id):
+            print(f"Deleted motion sequences for {gesture_id}")
     except Exception as e:
-        print(f"Error deleting data file: {e}")
+        print(f"Error deleting training data: {e}")
+
+    classifier.remove_gesture(gesture_id)
+    sequence_recognizer.remove(gesture_id)
 
     return {"status": "success"}
 
 @app.put("/gestures/{gesture_id}")
 def update_gesture(gesture_id: str, gesture_update: Dict[str, Any]):
+    try:
+        validate_smoothing(gesture_update.get("smoothing"))
+        validate_binding(gesture_update)
+        if "action" in gesture_update:
+            action_registry.check(gesture_update["action"])
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+
     found = False
     for g in state.gestures:
         if g["id"] == gesture_id:
             if "name" in gesture_update:
                 g["name"] = gesture_update["name"]
             if "action" in gesture_update:
-                g["action"] = gesture_update["action"]
+                g["action"] = action_registry.resolve(gesture_update["action"])
             if "emoji" in gesture_update:
                 g["emoji"] = gesture_update["emoji"]
+            for key in ("hand", "modifier"):
+                if key in gesture_update:
+                    if gesture_update[key]:
+                        g[key] = gesture_update[key]
+                    else:
+                        g.pop(key, None)
+            if "smoothing" in gesture_update:
+                if gesture_update["smoothing"]:
+                    g["smoothing"] = gesture_update["smoothing"]
+                else:
+                    g.pop("smoothing", None)
             found = True
             break
             
     if found:
         state.save_gestures()
+        apply_gesture_config()
         return {"status": "success"}
     return {"status": "error", "message": "Gesture not found"}
 
+@app.get("/actions")
+def get_actions():
+    return action_registry.describe()
+
+@app.post("/actions/reload")
+def reload_actions():
+    """Re-read plugin actions from actions.json."""
+    errors = action_registry.load_plugins()
+    unknown = action_registry.validate_gestures(state.gestures)
+    apply_gesture_config()
+    return {
+        "status": "error" if errors else "success",
+        "errors": errors,
+        "unmapped": [{"gesture": name, "action": action} for name, action in unknown],
+    }
+
+@app.get("/actions/metrics")
+def action_metrics_route():
+    """Per-action call counts, failures and latency histograms, plus the executor queue."""
+    return {"actions": action_registry.snapshot(), "executor": action_executor.snapshot()}
+
+@app.get("/cursor")
+def cursor_route():
+    return {"mapping": mouse_controller.mapper.snapshot(), "engine": mouse_controller.cursor.snapshot()}
+
+@app.post("/cursor/calibration")
+def start_calibration_route(req: CalibrationRequest):
+    try:
+        mouse_controller.mapper.start_calibration(req.duration)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    return {"status": "started", "duration": req.duration, "cursorMode": state.cursor_mode}
+
+@app.post("/cursor/calibration/points")
+def calibrate_points_route(req: CalibrationPoints):
+    try:
+        mouse_controller.mapper.calibrate_points(req.points)
+    except (KeyError, ValueError) as e:
+        return {"status": "error", "message": str(e)}
+    return {"status": "success", "calibration": mouse_controller.mapper.snapshot()["calibration"]}
+
+@app.delete("/cursor/calibration")
+def clear_calibration_route():
+    mouse_controller.mapper.clear_calibration()
+    return {"status": "success"}
+
 @app.post("/train/capture")
 def start_capture_route(req: CaptureRequest):
     if state.training_mode:
         return {"status": "error", "message": "Already training"}
 
+    if req.mode not in ("pose", "sequence"):
+        return {"status": "error", "message": f"Unknown capture mode: {req.mode}"}
+
     state.training_gesture_id = req.gestureId
+    state.training_capture_mode = req.mode
     state.training_sample_target = req.numSamples
     state.training_data_buffer = []
+    state.training_session_id = uuid.uuid4().hex
     state.training_mode = True
 
-    return {"status": "started", "gestureId": req.gestureId}
+    sequence_capture.reset()
+    return {"status": "started", "gestureId": req.gestureId, "mode": req.mode}
 
 @app.post("/train/model")
-def train_model_route(background_tasks: BackgroundTasks):
-
-    background_tasks.add_task(retrain_model_logic)
+def train_model_route(background_tasks: BackgroundTasks, validate: bool = False):
+    """Retrain in the background; ?validate=true also reports held-out accuracy (fits a second model)."""
+    background_tasks.add_task(retrain_model_logic, validate)
     return {"status": "training_started"}
 
+@app.get("/train/benchmark")
+def benchmark_route(backends: Optional[str] = None):
+    """
+    Compare classifier backends on the captured samples in the dataset store. The fits run
+    in the training worker, like retraining, so they don't compete with detection for the GIL.
+    """
+    counts = dataset_store.counts()
+    if sum(1 for count in counts.values() if count) < 2:
+        return {"status": "error", "message": "Need samples for at least two gestures"}
+
+    names = backends.split(",") if backends else None
+    unknown = [n for n in names or [] if n not in BACKENDS]
+    if unknown:
+        return {"status": "error", "message": f"Unknown backends: {', '.join(unknown)}"}
+
+    try:
+        results = training_runner.submit_benchmark(names, classifier.augmentations).result()
+    except Exception as e:
+        print(f"Benchmark failed: {e}")
+        if isinstance(e, BrokenProcessPool):
+            training_runner.reset()
+        return {"status": "error", "message": str(e)}
+
+    return {
+        "status": "success",
+        "samples": sum(counts.values()),
+        "current": classifier.backend_name,
+        "results": results,
+    }
+
 @app.post("/system/status")
 def update_system_status(status_update: dict):
     """
@@ -545,14 +1045,7 @@ def update_system_status(status_update: dict):
         if status_update["camera"] == "on":
             if not state.camera_running:
                 state.camera_running = True
-
-                if not any(t.name == "CameraThread" for t in threading.enumerate()):
-                     camera_thread = threading.Thread(target=camera_loop, name="CameraThread", daemon=True)
-                     camera_thread.start()
-
-                if not any(t.name == "DetectionThread" for t in threading.enumerate()):
-                     detection_thread = threading.Thread(target=detection_loop, name="DetectionThread", daemon=True)
-                     detection_thread.start()
+                start_pipeline_threads()
         elif status_update["camera"] == "off":
             state.camera_running = False
 
@@ -562,15 +1055,89 @@ def update_system_status(status_update: dict):
     if "confidenceThreshold" in status_update:
 
         state.confidence_threshold = float(status_update["confidenceThreshold"]) / 100.0
+        apply_gesture_config()
 
     if "speedFactor" in status_update:
         state.speed_factor = float(status_update["speedFactor"])
 
+    if "classifierBackend" in status_update:
+        if status_update["classifierBackend"] not in BACKENDS:
+            return {"status": "error", "message": f"Unknown classifier backend: {status_update['classifierBackend']}"}
+        # Takes effect on the next retrain.
+        classifier.backend_name = status_update["classifierBackend"]
+
+    if "augmentations" in status_update:
+        try:
+            classifier.augmentations = validate_augmentations(status_update["augmentations"])
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+
+    tracker_settings = {
+        key: status_update[field]
+        for field, key in (
+            ("trackerModelComplexity", "model_complexity"),
+            ("trackerMaxHands", "max_num_hands"),
+            ("trackerDetectionConfidence", "min_detection_confidence"),
+            ("trackerTrackingConfidence", "min_tracking_confidence"),
+        )
+        if field in status_update
+    }
+    for key in ("min_detection_confidence", "min_tracking_confidence"):
+        if key in tracker_settings:
+            # Percentages, like confidenceThreshold.
+            tracker_settings[key] = float(tracker_settings[key]) / 100.0
+    if any(k in status_update for k in ("governor", "idleFps", "idleAfter", "cpuBudget")):
+        frame_governor.configure(
+            enabled=status_update.get("governor"),
+            idle_fps=status_update.get("idleFps"),
+            idle_after=status_update.get("idleAfter"),
+            # Percent of one core, like the other percentage settings.
+            cpu_budget=float(status_update["cpuBudget"]) / 100.0 if "cpuBudget" in status_update else None,
+        )
+
+    if any(k in status_update for k in ("cursorRate", "cursorPrediction", "cursorMinCutoff", "cursorBeta")):
+        mouse_controller.cursor.configure(
+            rate=status_update.get("cursorRate"),
+            # Milliseconds ahead of the capture time.
+            prediction=float(status_update["cursorPrediction"]) / 1000.0 if "cursorPrediction" in status_update else None,
+            min_cutoff=status_update.get("cursorMinCutoff"),
+            beta=status_update.get("cursorBeta"),
+        )
+
+    if any(k in status_update for k in ("cursorMapping", "trackpadCurve", "trackpadSensitivity", "trackpadAcceleration")):
+        try:
+            mouse_controller.mapper.configure(
+                mode=status_update.get("cursorMapping"),
+                curve=status_update.get("trackpadCurve"),
+                sensitivity=status_update.get("trackpadSensitivity"),
+                acceleration=status_update.get("trackpadAcceleration"),
+            )
+        except (TypeError, ValueError) as e:
+            return {"status": "error", "message": str(e)}
+
+    if "trackerRoi" in status_update:
+        roi_tracker.configure(enabled=status_update["trackerRoi"])
+
+    if tracker_settings:
+        try:
+            hand_tracker.configure(**tracker_settings)
+        except (TypeError, ValueError) as e:
+            return {"status": "error", "message": str(e)}
+
+    preview_broadcaster.configure(
+        fps=status_update.get("previewFps"),
+        max_width=status_update.get("previewWidth"),
+        quality=status_update.get("previewQuality"),
+    )
+
     return {"status": "success", "systemStatus": {
         "camera": "on" if state.camera_running else "off",
         "detectionActive": state.detection_active,
         "model": "ready",
-        "cursorMode": state.cursor_mode
+        "cursorMode": state.cursor_mode,
+        "classifierBackend": classifier.backend_name,
+        "augmentations": list(classifier.augmentations),
+        "tracker": hand_tracker.snapshot()
     }}
 
 if __name__ == "__main__":
@@ -0,0 +1,63 @@
+import json
+import os
+import struct
+import numpy as np
+
+MAGIC = b"GLIDEMDL"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+_PREFIX = struct.Struct("<8sII")
+
+
+def save_model_file(path, backend_name, params, arrays):
+    """
+    Write a model as one flat file: magic, format version, a JSON header describing
+    each array (dtype, shape, byte offset), then the raw arrays at 64-byte aligned
+    offsets so they can be memory-mapped directly on load.
+    """
+    entries = []
+    offset = 0
+    contiguous = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        contiguous[name] = array
+        entries.append({"name": name, "dtype": array.dtype.str, "shape": list(array.shape), "offset": offset})
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    header = json.dumps({"backend": backend_name, "params": params, "arrays": entries}).encode()
+    data_start = -(-(_PREFIX.size + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    with open(path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for entry in entries:
+            f.seek(data_start + entry["offset"])
+            f.write(contiguous[entry["name"]].tobytes())
+        f.truncate(data_start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_model_file(path):
+    """Returns (backend_name, params, arrays) with every array a read-only view into one memory map."""
+    with open(path, "rb") as f:
+        magic, version, header_len = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Glide model file")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"{path} uses model format v{version}; this build reads up to v{FORMAT_VERSION}")
+        header = json.loads(f.read(header_len))
+
+    data_start = -(-(_PREFIX.size + header_len) // ALIGNMENT) * ALIGNMENT
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+
+    arrays = {}
+    for entry in header["arrays"]:
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        start = data_start + entry["offset"]
+        arrays[entry["name"]] = (
+            mapped[start:start + count * dtype.itemsize].view(dtype).reshape(entry["shape"])
+        )
+    return header["backend"], header["params"], arrays
@@ -1,7 +1,9 @@
-import pyautogui
-import numpy as np
 import time
-import math
+
+from cursor_engine import CursorEngine
+from cursor_mapping import CursorMapper
+from input_backends import get_backend
+from landmarks import as_points
 
 class MouseController:
     def __init__(self):
@@ -9,81 +11,91 @@ class MouseController:
         self.pinch_off_threshold = 0.07
         self.click_hold_time = 1.0
         self.double_click_time = 0.5
-        self.smoothing = 0.4
 
-        self.prev_x, self.prev_y = 0, 0
-        self.screen_w, self.screen_h = pyautogui.size()
+        self.loaded = False
         self.is_pinched = False
         self.pinch_start_time = 0
         self.last_click_time = 0
-        self.initialized = False
-        self.pinch_freeze_y = None
 
-        pyautogui.FAILSAFE = False
+        # Filtering, prediction and the moves themselves happen on the cursor thread.
+        self.cursor = CursorEngine(move=self._move)
+        self.mapper = CursorMapper(query_monitors=lambda: get_backend().monitors(), on_layout=self._bounds_changed)
+
+    def _bounds_changed(self, bounds):
+        self.cursor.bounds = bounds
+
+    def _move(self, x, y):
+        backend = get_backend()
+        backend.move_to(x, y)
+        backend.flush()
+
+    def load(self):
+        """Create the input backend and read the display layout; otherwise done on the first update."""
+        self.mapper.refresh()
+        self.loaded = True
+
+    def release(self):
+        """The hand left or cursor mode was switched off."""
+        self.cursor.release()
+        self.cursor.hold(False)
+        self.mapper.reset()
+        self.mapper.seed(self.cursor.last_output)
+        self.is_pinched = False
+
+    def close(self):
+        self.cursor.stop()
 
     def update(self, landmarks):
         """
         Process hand landmarks to move mouse and detect clicks.
         Uses index fingertip directly for natural, responsive cursor movement.
         """
-        if not landmarks:
+        if landmarks is None:
             return
 
-        pyautogui.PAUSE = 0
-        pyautogui.MINIMUM_DURATION = 0
-
         try:
+            if not self.loaded:
+                self.load()
+
             now = time.time()
+            timestamp = getattr(landmarks, "timestamp", None) or now
 
-            tip_x, tip_y = landmarks[24], landmarks[25]
-            tx, ty = landmarks[12], landmarks[13]
+            points = as_points(landmarks)
+            tip_x, tip_y = float(points[8, 0]), float(points[8, 1])
+            tx, ty = float(points[4, 0]), float(points[4, 1])
             distance = ((tip_x - tx)**2 + (tip_y - ty)**2)**0.5
 
             if not self.is_pinched and distance < self.pinch_on_threshold:
                 self.is_pinched = True
                 self.pinch_start_time = now
-                self.pinch_freeze_y = self.prev_y
+                self.cursor.hold(True)
 
             elif self.is_pinched and distance > self.pinch_off_threshold:
                 self.is_pinched = False
                 duration = now - self.pinch_start_time
-                self.pinch_freeze_y = None
+                self.cursor.hold(False)
+                # The fingertip moved during the pinch; don't apply that as one jump in trackpad mode.
+                self.mapper.lift()
 
                 if duration < self.click_hold_time:
                     if now - self.last_click_time < self.double_click_time:
-                        pyautogui.doubleClick()
+                        get_backend().click(count=2)
                         print("Mouse: Double Click")
                         self.last_click_time = 0
                     else:
-                        pyautogui.click()
+                        get_backend().click()
                         print("Mouse: Left Click")
                         self.last_click_time = now
                 else:
-                    pyautogui.rightClick()
+                    get_backend().click("right")
                     print("Mouse: Right Click")
 
             if self.is_pinched:
                 return
 
-            raw_x = tip_x
-            raw_y = tip_y
-
-            target_x = np.interp(raw_x, [0.05, 0.95], [0, self.screen_w])
-            target_y = np.interp(raw_y, [0.05, 0.85], [0, self.screen_h])
-
-            target_x = max(0, min(target_x, self.screen_w - 1))
-            target_y = max(0, min(target_y, self.screen_h - 1))
-
-            if not self.initialized:
-                self.prev_x, self.prev_y = target_x, target_y
-                self.initialized = True
-                return
-
-            smooth_x = self.prev_x + (1 - self.smoothing) * (target_x - self.prev_x)
-            smooth_y = self.prev_y + (1 - self.smoothing) * (target_y - self.prev_y)
-
-            pyautogui.moveTo(smooth_x, smooth_y)
-            self.prev_x, self.prev_y = smooth_x, smooth_y
+            target = self.mapper.map(tip_x, tip_y, timestamp)
+            if target is not None:
+                self.cursor.push(target[0], target[1], timestamp)
 
         except Exception as e:
             print(f"Mouse control error: {e}")
@@ -0,0 +1,308 @@
+import os
+import platform
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+# Each helper reads one command per line on stdin and answers with exactly one line:
+# "OK <result>" or "ERR <message>". Newlines inside a command are sent as a literal "\n".
+
+POWERSHELL_LOOP = (
+    "$ErrorActionPreference = 'Stop'; "
+    "while (($line = [Console]::In.ReadLine()) -ne $null) { "
+    "try { $result = Invoke-Expression ($line -replace '\\\\n', \"`n\"); "
+    "[Console]::Out.WriteLine('OK ' + (($result | Out-String).Trim() -replace \"`r?`n\", ' ')) } "
+    "catch { [Console]::Out.WriteLine('ERR ' + ($_.ToString() -replace \"`r?`n\", ' ')) }; "
+    "[Console]::Out.Flush() }"
+)
+
+# JavaScript for Automation loop that runs each line as AppleScript through NSAppleScript.
+APPLESCRIPT_LOOP = r"""
+ObjC.import('Foundation');
+var input = $.NSFileHandle.fileHandleWithStandardInput;
+var output = $.NSFileHandle.fileHandleWithStandardOutput;
+function reply(text) {
+    output.writeData($(text.replace(/\n/g, ' ') + '\n').dataUsingEncoding($.NSUTF8StringEncoding));
+}
+var pending = '';
+while (true) {
+    var data = input.availableData;
+    if (data.length == 0) break;
+    pending += $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+    var end;
+    while ((end = pending.indexOf('\n')) >= 0) {
+        var line = pending.slice(0, end).replace(/\\n/g, '\n');
+        pending = pending.slice(end + 1);
+        var error = Ref();
+        var result = $.NSAppleScript.alloc.initWithSource(line).executeAndReturnError(error);
+        if (result.isNil()) {
+            reply('ERR ' + ObjC.deepUnwrap(error[0]).NSAppleScriptErrorMessage);
+        } else {
+            reply('OK ' + (result.stringValue.js || ''));
+        }
+    }
+}
+"""
+
+# Stand-in helper for tests and for platforms without one. It understands
+# "get <name>", "set <name> <value>", "crash" (exits without answering), and echoes
+# anything else.
+FAKE_LOOP = r"""
+import sys
+levels = {"volume": "50", "brightness": "50"}
+for line in sys.stdin:
+    words = line.split()
+    if words == ["crash"]:
+        sys.exit(1)
+    if len(words) == 2 and words[0] == "get":
+        print("OK " + levels.get(words[1], ""), flush=True)
+    elif len(words) == 3 and words[0] == "set":
+        levels[words[1]] = words[2]
+        print("OK", flush=True)
+    else:
+        print("OK " + line.strip(), flush=True)
+"""
+
+
+class HelperError(RuntimeError):
+    pass
+
+
+class HelperProcess:
+    """
+    A long-lived interpreter process (PowerShell, osascript, ...) that runs one command
+    per request over stdin/stdout, instead of spawning a process per command. If the
+    process dies or stops answering it is restarted, and the request retried once.
+    """
+
+    def __init__(self, name, argv, timeout=3.0, creationflags=0):
+        self.name = name
+        self.argv = argv
+        self.timeout = timeout
+        self.creationflags = creationflags
+        self._process = None
+        self._lines = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.restarts = 0
+        self.failures = 0
+
+    @property
+    def alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def _start(self):
+        lines = queue.Queue()
+        process = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            creationflags=self.creationflags,
+        )
+
+        def read_lines():
+            for line in process.stdout:
+                lines.put(line.rstrip("\r\n"))
+            lines.put(None)
+
+        threading.Thread(target=read_lines, name=f"{self.name}-helper-reader", daemon=True).start()
+        self._process, self._lines = process, lines
+
+    def _kill(self):
+        if self._process is not None:
+            try:
+                self._process.kill()
+                self._process.wait(timeout=1)
+            except Exception:
+                pass
+        self._process, self._lines = None, None
+
+    def _send(self, command, timeout):
+        if not self.alive:
+            if self._process is not None:
+                self.restarts += 1
+            self._kill()
+            self._start()
+        self._process.stdin.write(command.replace("\n", "\\n") + "\n")
+        self._process.stdin.flush()
+        try:
+            reply = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"{self.name} helper did not answer within {timeout}s")
+        if reply is None:
+            raise BrokenPipeError(f"{self.name} helper exited")
+        return reply
+
+    def request(self, command, timeout=None):
+        """Run one command and return its output; raises HelperError if the command failed."""
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            self.requests += 1
+            try:
+                reply = self._send(command, timeout)
+            except (OSError, TimeoutError, ValueError):
+                # Dead or hung helper: start a fresh one and try once more.
+                self._kill()
+                self.restarts += 1
+                try:
+                    reply = self._send(command, timeout)
+                except (OSError, TimeoutError, ValueError) as e:
+                    self._kill()
+                    self.failures += 1
+                    raise HelperError(str(e))
+
+        status, _, result = reply.partition(" ")
+        if status != "OK":
+            self.failures += 1
+            raise HelperError(result or reply)
+        return result
+
+    def close(self):
+        with self._lock:
+            if self._process is not None:
+                try:
+                    self._process.stdin.close()
+                except Exception:
+                    pass
+            self._kill()
+
+    def snapshot(self):
+        return {
+            "name": self.name,
+            "alive": self.alive,
+            "requests": self.requests,
+            "restarts": self.restarts,
+            "failures": self.failures,
+        }
+
+
+class OsHelper:
+    """
+    Platform integration over one HelperProcess, with a local cache of the volume and
+    brightness levels so a level change is a single write instead of a read plus a
+    write. Cached levels expire after `cache_ttl` seconds, in case something else
+    changed them.
+    """
+
+    LEVELS = ()
+
+    def __init__(self, process, cache_ttl=30.0):
+        self.process = process
+        self.cache_ttl = cache_ttl
+        self._levels = {}
+        self._lock = threading.Lock()
+
+    def run(self, command):
+        return self.process.request(command)
+
+    def get_level_command(self, kind):
+        raise NotImplementedError
+
+    def set_level_command(self, kind, value):
+        raise NotImplementedError
+
+    def adjust_level(self, kind, delta):
+        """Change a 0-100 level by delta; returns (old, new)."""
+        with self._lock:
+            cached = self._levels.get(kind)
+            if cached is not None and time.time() - cached[1] <= self.cache_ttl:
+                current = cached[0]
+            else:
+                current = int(float(self.run(self.get_level_command(kind))))
+            new_level = max(0, min(100, current + delta))
+            try:
+                self.run(self.set_level_command(kind, new_level))
+            except HelperError:
+                self._levels.pop(kind, None)
+                raise
+            self._levels[kind] = (new_level, time.time())
+            return current, new_level
+
+    def warm_up(self):
+        """Start the helper process and prime the level cache, off the action path."""
+        for kind in self.LEVELS:
+            try:
+                level = int(float(self.run(self.get_level_command(kind))))
+            except (HelperError, ValueError) as e:
+                print(f"{self.process.name} helper: could not read {kind}: {e}")
+                continue
+            with self._lock:
+                self._levels[kind] = (level, time.time())
+
+    def invalidate(self, kind=None):
+        with self._lock:
+            if kind is None:
+                self._levels.clear()
+            else:
+                self._levels.pop(kind, None)
+
+    def close(self):
+        self.process.close()
+
+    def snapshot(self):
+        with self._lock:
+            levels = {kind: level for kind, (level, _) in self._levels.items()}
+        return dict(self.process.snapshot(), levels=levels)
+
+
+class PowerShellHelper(OsHelper):
+    LEVELS = ("brightness",)
+
+    def __init__(self, **kwargs):
+        no_window = getattr(subprocess, "CREATE_NO_WINDOW", 0x08000000)
+        process = HelperProcess(
+            "powershell",
+            ["powershell", "-NoProfile", "-NonInteractive", "-NoLogo", "-Command", POWERSHELL_LOOP],
+            creationflags=no_window,
+        )
+        super().__init__(process, **kwargs)
+
+    def get_level_command(self, kind):
+        return "(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightness).CurrentBrightness"
+
+    def set_level_command(self, kind, value):
+        return f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, {int(value)}) | Out-Null"
+
+
+class AppleScriptHelper(OsHelper):
+    LEVELS = ("volume",)
+
+    def __init__(self, **kwargs):
+        process = HelperProcess("osascript", ["osascript", "-l", "JavaScript", "-e", APPLESCRIPT_LOOP])
+        super().__init__(process, **kwargs)
+
+    def get_level_command(self, kind):
+        return "output volume of (get volume settings)"
+
+    def set_level_command(self, kind, value):
+        return f"set volume output volume {int(value)}"
+
+
+class FakeHelper(OsHelper):
+    LEVELS = ("volume", "brightness")
+
+    def __init__(self, **kwargs):
+        super().__init__(HelperProcess("fake", [sys.executable, "-c", FAKE_LOOP]), **kwargs)
+
+    def get_level_command(self, kind):
+        return f"get {kind}"
+
+    def set_level_command(self, kind, value):
+        return f"set {kind} {int(value)}"
+
+
+def create_os_helper():
+    """The helper for this platform; GLIDE_OS_HELPER=fake selects the stand-in (e.g. for tests on Linux)."""
+    if os.environ.get("GLIDE_OS_HELPER") == "fake":
+        return FakeHelper()
+    system = platform.system()
+    if system == "Windows":
+        return PowerShellHelper()
+    if system == "Darwin":
+        return AppleScriptHelper()
+    return None
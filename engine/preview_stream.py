@@ -0,0 +1,105 @@
+import asyncio
+import threading
+
+
+class PreviewBroadcaster:
+    """
+    Fans encoded preview frames out to every connected /video_feed viewer.
+
+    The preview encoder thread publishes each JPEG once; delivery happens on the
+    asyncio loop, waking all viewers waiting for a frame newer than the one they
+    last sent. The encoder only runs while at least one viewer is connected.
+    """
+
+    def __init__(self, fps=15, max_width=640, quality=80):
+        self.fps = fps
+        self.max_width = max_width
+        self.quality = quality
+
+        self._loop = None
+        self._waiters = set()
+        self._seq = 0
+        self._frame = None
+        self._viewers = 0
+        self._viewers_lock = threading.Lock()
+        self._has_viewers = threading.Event()
+
+    def attach_loop(self, loop):
+        self._loop = loop
+
+    def configure(self, fps=None, max_width=None, quality=None):
+        if fps is not None:
+            self.fps = max(1.0, min(float(fps), 60.0))
+        if max_width is not None:
+            self.max_width = max(160, int(max_width))
+        if quality is not None:
+            self.quality = max(10, min(int(quality), 100))
+
+    @property
+    def viewers(self):
+        return self._viewers
+
+    def wait_for_viewers(self, timeout):
+        return self._has_viewers.wait(timeout)
+
+    def _add_viewer(self):
+        with self._viewers_lock:
+            self._viewers += 1
+            self._has_viewers.set()
+
+    def _remove_viewer(self):
+        with self._viewers_lock:
+            self._viewers -= 1
+            if self._viewers <= 0:
+                self._viewers = 0
+                self._has_viewers.clear()
+                self._frame = None
+
+    def publish(self, jpeg_bytes):
+        """Called from the encoder thread with one encoded frame."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._deliver, jpeg_bytes)
+
+    def _deliver(self, jpeg_bytes):
+        self._seq += 1
+        self._frame = jpeg_bytes
+        waiters = self._waiters
+        self._waiters = set()
+        for fut in waiters:
+            if not fut.done():
+                fut.set_result(None)
+
+    async def frames(self):
+        """Async generator of multipart MJPEG chunks for one viewer."""
+        self._add_viewer()
+        last_seq = 0
+        fut = None
+        try:
+            while True:
+                if self._frame is None or self._seq <= last_seq:
+                    fut = asyncio.get_running_loop().create_future()
+                    self._waiters.add(fut)
+                    await fut
+                    fut = None
+                    continue
+
+                last_seq = self._seq
+                frame = self._frame
+                yield (b'--frame\r\n'
+                       b'Content-Type: image/jpeg\r\n'
+                       b'X-Frame-Seq: ' + str(last_seq).encode() + b'\r\n\r\n' + frame + b'\r\n')
+        finally:
+            if fut is not None:
+                self._waiters.discard(fut)
+            self._remove_viewer()
+
+    def snapshot(self):
+        return {
+            "viewers": self._viewers,
+            "seq": self._seq,
+            "fps_cap": self.fps,
+            "max_width": self.max_width,
+            "quality": self.quality,
+        }
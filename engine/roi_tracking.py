@@ -0,0 +1,132 @@
+import threading
+import numpy as np
+
+from lazy_import import lazy_module
+
+cv2 = lazy_module("cv2")
+
+
+class RoiTracker:
+    """
+    Region-of-interest mode for the hand tracker.
+
+    While hands are tracked, the next frame is cropped to a padded square around the
+    previous landmarks and downscaled to at most `crop_size` pixels before colour
+    conversion and inference. The tracker maps the resulting landmarks back to
+    full-frame normalized coordinates, so consumers see the same values as in a
+    full-frame pass. When tracking is lost, and every `refresh_frames` frames (to pick
+    up hands entering elsewhere), the whole frame is searched again.
+    """
+
+    def __init__(self, enabled=True, padding=0.35, crop_size=256, refresh_frames=30, max_area=0.6):
+        self.enabled = enabled
+        self.padding = padding
+        self.crop_size = crop_size
+        self.refresh_frames = refresh_frames
+        self.max_area = max_area
+        self._box = None
+        self._box_shape = None
+        self._since_refresh = 0
+        self._scratch = None
+        self._lock = threading.Lock()
+
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.lost = 0
+
+    def configure(self, enabled=None, padding=None, crop_size=None, refresh_frames=None):
+        with self._lock:
+            if enabled is not None:
+                self.enabled = bool(enabled)
+                if not self.enabled:
+                    self._box = None
+            if padding is not None:
+                self.padding = max(0.0, min(float(padding), 2.0))
+            if crop_size is not None:
+                self.crop_size = max(128, int(crop_size))
+            if refresh_frames is not None:
+                self.refresh_frames = max(1, int(refresh_frames))
+
+    def region(self, shape):
+        """Pixel box (x0, y0, x1, y1) to run the tracker on for the next frame, or None for the full frame."""
+        with self._lock:
+            box = self._box if self.enabled else None
+            if box is not None and self._box_shape != shape[:2]:
+                # The camera resolution changed (see FrameGovernor); search the new frame.
+                box = None
+            if box is not None and self._since_refresh >= self.refresh_frames:
+                box = None
+            if box is None:
+                self._since_refresh = 0
+                self.full_frames += 1
+            else:
+                self._since_refresh += 1
+                self.roi_frames += 1
+            return box
+
+    def prepare(self, frame, region):
+        """RGB image for the tracker: the whole frame, or the region downscaled into a reused buffer."""
+        if region is None:
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+        x0, y0, x1, y1 = region
+        crop = frame[y0:y1, x0:x1]
+        side = max(x1 - x0, y1 - y0)
+        if side > self.crop_size:
+            scale = self.crop_size / side
+            size = (max(1, int((x1 - x0) * scale)), max(1, int((y1 - y0) * scale)))
+            if self._scratch is None or self._scratch.shape[1::-1] != size:
+                self._scratch = np.empty((size[1], size[0], 3), dtype=frame.dtype)
+            crop = cv2.resize(crop, size, dst=self._scratch, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+
+    @staticmethod
+    def transform(region, shape):
+        """(offset_x, offset_y, scale_x, scale_y) mapping crop-normalized to frame-normalized coordinates."""
+        if region is None:
+            return None
+        h, w = shape[:2]
+        x0, y0, x1, y1 = region
+        return (x0 / w, y0 / h, (x1 - x0) / w, (y1 - y0) / h)
+
+    def update(self, hands, shape):
+        """Derive the next frame's region from this frame's (full-frame normalized) landmarks."""
+        with self._lock:
+            if not self.enabled:
+                return
+            if not hands:
+                if self._box is not None:
+                    self.lost += 1
+                self._box = None
+                return
+
+            h, w = shape[:2]
+            points = np.concatenate([hand.points[:, :2] for hand in hands])
+            x_min, y_min = points.min(axis=0) * (w, h)
+            x_max, y_max = points.max(axis=0) * (w, h)
+
+            side = max(x_max - x_min, y_max - y_min) * (1.0 + 2.0 * self.padding)
+            side = min(side, w, h)
+            if side * side > self.max_area * w * h:
+                # The hand fills most of the frame; a crop would not save anything.
+                self._box = None
+                return
+
+            cx, cy = (x_min + x_max) / 2.0, (y_min + y_max) / 2.0
+            x0 = int(min(max(cx - side / 2.0, 0), w - side))
+            y0 = int(min(max(cy - side / 2.0, 0), h - side))
+            self._box = (x0, y0, x0 + int(side), y0 + int(side))
+            self._box_shape = (h, w)
+
+    def snapshot(self):
+        with self._lock:
+            total = self.roi_frames + self.full_frames
+            return {
+                "enabled": self.enabled,
+                "active": self._box is not None,
+                "roi_frames": self.roi_frames,
+                "full_frames": self.full_frames,
+                "roi_ratio": round(self.roi_frames / total, 3) if total else 0.0,
+                "lost": self.lost,
+                "crop_size": self.crop_size,
+            }
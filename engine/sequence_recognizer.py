@@ -0,0 +1,279 @@
+import threading
+import numpy as np
+
+from landmarks import as_points
+
+TEMPLATE_LENGTH = 16
+MAX_TEMPLATES = 8
+MOTION_FEATURES = 2
+
+# Palm landmarks (wrist and the four finger bases) used for the hand's position.
+PALM = [0, 5, 9, 13, 17]
+
+# Hand speeds are in hand lengths (wrist to middle finger base) per second.
+START_SPEED = 1.5
+STOP_SPEED = 0.6
+STOP_HOLD = 0.15
+MIN_DURATION = 0.15
+MAX_DURATION = 1.5
+MAX_GAP = 0.25
+
+# Template selection only considers a gesture's most recent sequences, bounding its O(n^2) DTW.
+MAX_CANDIDATES = 32
+# A still hand scores about the templates' mean feature norm per point, so a threshold capped
+# at this fraction of it can never be met without moving.
+MAX_THRESHOLD_FRACTION = 0.5
+# Average feature norm over roughly the last TEMPLATE_LENGTH frames needed before a match counts.
+MIN_MOTION_ENERGY = 0.25
+
+
+def resample(features, timestamps, length=TEMPLATE_LENGTH):
+    """Linearly resample an (n, F) feature track to `length` points evenly spaced in time."""
+    features = np.asarray(features, dtype=np.float32)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if len(features) == 1:
+        return np.repeat(features, length, axis=0)
+    grid = np.linspace(timestamps[0], timestamps[-1], length)
+    return np.stack([np.interp(grid, timestamps, features[:, i]) for i in range(features.shape[1])], axis=1).astype(np.float32)
+
+
+def dtw_distance(a, b):
+    """DTW distance between two (n, F) tracks, per point of `b` (the same scale SequenceRecognizer scores on)."""
+    n, m = len(a), len(b)
+    cost = np.linalg.norm(a[:, None, :] - b[None, :, :], axis=2)
+    acc = np.full((n + 1, m + 1), np.inf)
+    acc[0, 0] = 0.0
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            acc[i, j] = cost[i - 1, j - 1] + min(acc[i - 1, j], acc[i, j - 1], acc[i - 1, j - 1])
+    return acc[n, m] / m
+
+
+def build_templates(sequences):
+    """
+    Templates and match threshold for one motion gesture: the MAX_TEMPLATES most typical of
+    its last MAX_CANDIDATES (n, TEMPLATE_LENGTH, 2) sequences (smallest total DTW distance to
+    the others), and 1.5x the median distance between them, within the bounds above.
+    Returns (templates, threshold). Pure DTW in Python, so the server runs it in the
+    training worker rather than on the detection thread.
+    """
+    sequences = np.asarray(sequences, dtype=np.float32).reshape(-1, TEMPLATE_LENGTH, MOTION_FEATURES)[-MAX_CANDIDATES:]
+    n = len(sequences)
+    if n > MAX_TEMPLATES:
+        distances = np.zeros((n, n))
+        for i in range(n):
+            for j in range(i + 1, n):
+                distances[i, j] = distances[j, i] = dtw_distance(sequences[i], sequences[j])
+        sequences = sequences[np.argsort(distances.sum(axis=1))[:MAX_TEMPLATES]]
+
+    limit = MAX_THRESHOLD_FRACTION * float(np.linalg.norm(sequences, axis=2).mean())
+    if len(sequences) > 1:
+        spread = [dtw_distance(a, b) for i, a in enumerate(sequences) for b in sequences[i + 1:]]
+        threshold = min(1.5 * float(np.median(spread)), limit)
+    else:
+        threshold = limit
+    return np.ascontiguousarray(sequences), max(threshold, 0.1)
+
+
+class MotionTracker:
+    """
+    Turns successive hand frames into motion features incrementally. The palm
+    velocity is measured in hand lengths per second, so it does not depend on where
+    the hand is or how far it is from the camera. The feature is that velocity
+    clipped to unit length: above one hand length per second only the direction
+    counts, so fast and slow swipes match the same template. Each update is O(1).
+    """
+
+    def __init__(self, smoothing=0.5):
+        self.smoothing = smoothing
+        self.reset()
+
+    def reset(self):
+        self._last_center = None
+        self._last_time = 0.0
+        self.velocity = np.zeros(MOTION_FEATURES, dtype=np.float32)
+        self.feature = np.zeros(MOTION_FEATURES, dtype=np.float32)
+        self.speed = 0.0
+
+    def update(self, landmarks, timestamp):
+        """Returns this frame's motion feature, or None for the first frame of a track; see `speed` for the raw speed."""
+        points = as_points(landmarks)
+        center = points[PALM, :2].mean(axis=0)
+        scale = float(np.linalg.norm(points[9, :2] - points[0, :2])) or 1e-3
+
+        last_center, last_time = self._last_center, self._last_time
+        self._last_center, self._last_time = center, timestamp
+        dt = timestamp - last_time
+        if last_center is None or dt <= 0 or dt > MAX_GAP:
+            self.velocity[:] = 0.0
+            self.speed = 0.0
+            return None
+
+        raw = (center - last_center) / (dt * scale)
+        self.velocity += (raw - self.velocity) * (1.0 - self.smoothing)
+        self.speed = float(np.hypot(*self.velocity))
+        np.multiply(self.velocity, 1.0 / max(self.speed, 1.0), out=self.feature)
+        return self.feature
+
+
+class SequenceCapture:
+    """
+    Cuts motion sequences out of the feature stream for training: a sequence starts when
+    the hand speeds up past START_SPEED and ends once it has been slower than STOP_SPEED
+    for STOP_HOLD seconds (or after MAX_DURATION). Returns each sequence resampled to
+    TEMPLATE_LENGTH points.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._features = []
+        self._times = []
+        self._slow_since = None
+
+    def add(self, feature, speed, timestamp):
+        if feature is None:
+            self.reset()
+            return None
+
+        if not self._features:
+            if speed < START_SPEED:
+                return None
+        self._features.append(feature.copy())
+        self._times.append(timestamp)
+
+        if speed < STOP_SPEED:
+            if self._slow_since is None:
+                self._slow_since = timestamp
+        else:
+            self._slow_since = None
+
+        duration = timestamp - self._times[0]
+        stopped = self._slow_since is not None and timestamp - self._slow_since >= STOP_HOLD
+        if not stopped and duration < MAX_DURATION:
+            return None
+
+        features, times = self._features, self._times
+        self.reset()
+        if duration < MIN_DURATION or len(features) < 3:
+            return None
+        return resample(features, times)
+
+
+class SequenceRecognizer:
+    """
+    Recognizes motion gestures (swipes etc.) by streaming subsequence DTW against
+    recorded templates.
+
+    For every template the last accumulated-cost column is kept. Each frame updates
+    all columns with one vectorized step per template position, so the per-frame cost
+    is bounded by TEMPLATE_LENGTH x (number of templates, at most MAX_TEMPLATES per
+    gesture), independent of how long the hand has been in view. A gesture fires when
+    a template has been matched end to end with a length-normalized cost below that
+    gesture's threshold, which is derived from how far its own templates are apart,
+    and the hand has actually been moving (MIN_MOTION_ENERGY).
+    """
+
+    def __init__(self, cooldown=0.6):
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._sets = {}
+        self._thresholds = {}
+        self._labels = []
+        self._templates = np.zeros((0, TEMPLATE_LENGTH, MOTION_FEATURES), dtype=np.float32)
+        self._template_thresholds = np.zeros(0)
+        self._blocked_until = 0.0
+        self.detections = 0
+        self.reset()
+
+    @property
+    def gestures(self):
+        return sorted(self._sets)
+
+    def reset(self):
+        k = len(self._templates)
+        self._cost = np.full((k, TEMPLATE_LENGTH), np.inf)
+        self._next = np.empty((k, TEMPLATE_LENGTH))
+        self._energy = 0.0
+
+    def set_sequences(self, gesture_id, sequences):
+        """Build and install a gesture's templates from its sequences, in the calling thread."""
+        sequences = np.asarray(sequences, dtype=np.float32)
+        if not len(sequences):
+            self.remove(gesture_id)
+            return
+        self.install(gesture_id, *build_templates(sequences))
+
+    def install(self, gesture_id, templates, threshold):
+        """Swap in templates and a threshold made by build_templates()."""
+        with self._lock:
+            self._sets[gesture_id] = templates
+            self._thresholds[gesture_id] = threshold
+            self._rebuild()
+
+    def remove(self, gesture_id):
+        with self._lock:
+            if self._sets.pop(gesture_id, None) is not None:
+                self._thresholds.pop(gesture_id, None)
+                self._rebuild()
+
+    def _rebuild(self):
+        # Called with self._lock held.
+        labels, templates, thresholds = [], [], []
+        for gesture_id, sequences in self._sets.items():
+            for sequence in sequences:
+                labels.append(gesture_id)
+                templates.append(sequence)
+                thresholds.append(self._thresholds[gesture_id])
+
+        self._labels = labels
+        self._templates = np.array(templates, dtype=np.float32).reshape(-1, TEMPLATE_LENGTH, MOTION_FEATURES)
+        self._template_thresholds = np.array(thresholds)
+        self.reset()
+
+    def update(self, feature, timestamp):
+        """
+        Feed one frame's motion features (from MotionTracker). Returns (gesture_id, confidence)
+        when a motion gesture has just been completed, else None.
+        """
+        with self._lock:
+            if not len(self._templates):
+                return None
+            if feature is None:
+                self.reset()
+                return None
+
+            # Distance of this frame to every template point: (templates, TEMPLATE_LENGTH).
+            distance = np.linalg.norm(self._templates - feature, axis=2)
+            prev, cost = self._cost, self._next
+
+            # Open begin: a match may start at any frame.
+            cost[:, 0] = distance[:, 0]
+            # Previous frame at the same or previous template point; the current frame at the previous point.
+            step = np.minimum(prev[:, :-1], prev[:, 1:])
+            for j in range(1, TEMPLATE_LENGTH):
+                cost[:, j] = distance[:, j] + np.minimum(step[:, j - 1], cost[:, j - 1])
+            self._cost, self._next = cost, prev
+            self._energy += (float(np.hypot(*feature)) - self._energy) / TEMPLATE_LENGTH
+
+            if timestamp < self._blocked_until or self._energy < MIN_MOTION_ENERGY:
+                return None
+
+            ratio = cost[:, -1] / (TEMPLATE_LENGTH * self._template_thresholds)
+            best = int(np.argmin(ratio))
+            if not ratio[best] < 1.0:
+                return None
+
+            self._blocked_until = timestamp + self.cooldown
+            self.detections += 1
+            self.reset()
+            return self._labels[best], float(1.0 - 0.5 * ratio[best])
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "gestures": {g: {"templates": len(s), "threshold": round(self._thresholds[g], 3)} for g, s in self._sets.items()},
+                "templates": len(self._templates),
+                "detections": self.detections,
+            }
@@ -0,0 +1,72 @@
+import os
+import sys
+import threading
+import time
+
+
+class StartupProfile:
+    """
+    Records how long each startup phase took, measured from the first import of
+    this module (the top of main.py), so regressions in the bundled build show up.
+    """
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._wall_t0 = time.time()
+        self._marks = []
+        self._lock = threading.Lock()
+
+    def mark(self, name, since=None):
+        """Record that `name` finished now; `since` is the perf_counter() it started at."""
+        now = time.perf_counter()
+        with self._lock:
+            self._marks.append({
+                "phase": name,
+                "at_ms": round((now - self._t0) * 1000, 1),
+                "took_ms": round((now - since) * 1000, 1) if since is not None else None,
+                "thread": threading.current_thread().name,
+            })
+
+    def snapshot(self):
+        with self._lock:
+            marks = list(self._marks)
+        return {
+            "started_at": self._wall_t0,
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "phases": marks,
+        }
+
+
+def process_memory_bytes():
+    """Current resident set size of this process, or None where it cannot be read cheaply."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class _Counters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = _Counters()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return int(counters.WorkingSetSize)
+            return None
+        if os.path.exists("/proc/self/statm"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        import resource
+        # macOS reports the peak RSS in bytes; good enough for before/after deltas at startup.
+        return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    except Exception:
+        return None
+
+
+startup_profile = StartupProfile()
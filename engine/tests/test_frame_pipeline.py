@@ -0,0 +1,36 @@
+from frame_pipeline import LatestChannel
+from landmarks import LandmarkPool
+
+
+def test_pool_never_hands_out_a_buffer_in_use():
+    pool = LandmarkPool(size=2)
+    held = [pool.acquire() for _ in range(5)]
+
+    assert len({id(item) for item in held}) == 5
+    assert pool.allocated == 5
+
+    pool.release(held[:2])
+    assert {id(pool.acquire()), id(pool.acquire())} == {id(held[0]), id(held[1])}
+    assert pool.allocated == 5
+
+
+def test_channel_releases_skipped_and_consumed_items():
+    pool = LandmarkPool(size=0)
+    channel = LatestChannel(release=pool.release)
+
+    first = [pool.acquire()]
+    channel.publish(first)
+    second = [pool.acquire(), pool.acquire()]
+    channel.publish(second)
+    # The first set was never taken, so it went straight back to the pool.
+    assert pool.acquire() is first[0]
+    assert channel.skipped == 1
+
+    _, taken = channel.take(timeout=0)
+    assert taken is second
+    # The consumer still owns what it took: a slow consumer never has it recycled under it.
+    channel.publish([pool.acquire()])
+    assert pool.acquire() not in second
+
+    channel.take(timeout=0)
+    assert {id(pool.acquire()), id(pool.acquire())} == {id(item) for item in second}
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from action_registry import ActionRegistry
+from input_backends import BatchedBackend, RecordingBackend, set_backend
+
+
+def events(backend):
+    return [event[1:] for event in backend.take()]
+
+
+@pytest.fixture
+def recording():
+    backend = RecordingBackend()
+    old = set_backend(backend)
+    yield backend
+    set_backend(old)
+
+
+def test_batched_holds_moves_until_flush():
+    inner = RecordingBackend()
+    batched = BatchedBackend(inner)
+
+    batched.move_to(10, 10)
+    batched.move_to(20, 30)
+    batched.move_rel(5, -5)
+    assert inner.events == []
+
+    batched.flush()
+    assert events(inner) == [("move", (25, 25))]
+    assert batched.merged == 2
+
+
+def test_batched_sums_relative_moves():
+    inner = RecordingBackend()
+    inner.move_to(100, 100)
+    inner.take()
+    batched = BatchedBackend(inner)
+
+    batched.move_rel(3, 4)
+    batched.move_rel(1, 1)
+    batched.flush()
+    assert events(inner) == [("move", (104, 105))]
+
+
+def test_batched_flushes_before_other_output():
+    inner = RecordingBackend()
+    batched = BatchedBackend(inner)
+
+    batched.move_to(200, 100)
+    batched.click()
+    batched.hotkey("ctrl", "c")
+    assert events(inner) == [
+        ("move", (200, 100)),
+        ("click", "left", 1, (200, 100)),
+        ("hotkey", ("ctrl", "c")),
+    ]
+
+
+def test_batched_flush_without_moves_sends_nothing():
+    inner = RecordingBackend()
+    batched = BatchedBackend(inner)
+    batched.flush()
+    assert inner.events == []
+
+
+def test_recording_clamps_to_nearest_monitor():
+    # A 1920x1080 primary and a 1280x1024 monitor to its right, 200 px higher.
+    backend = RecordingBackend(monitors=[(0, 0, 1920, 1080), (1920, -200, 1280, 1024)])
+
+    backend.move_to(2500, 300)
+    assert backend.position == (2500, 300)
+    backend.move_to(1000, 2000)
+    assert backend.position == (1000, 1079)
+    backend.move_to(5000, 2000)
+    assert backend.position == (3199, 823)
+    # Below the right monitor: closer to its bottom edge than to the primary's right edge.
+    backend.move_to(3000, 900)
+    assert backend.position == (3000, 823)
+    backend.move_to(-50, -500)
+    assert backend.position == (0, 0)
+    backend.move_to(2000, -500)
+    assert backend.position == (2000, -200)
+    # Off the left edge of the right monitor, above the primary: its top-left corner is nearest.
+    backend.move_rel(-100, 0)
+    assert backend.position == (1920, -200)
+
+
+def test_macro_dispatch(tmp_path, recording):
+    path = tmp_path / "actions.json"
+    path.write_text(json.dumps([
+        {"name": "reopen_tab", "type": "macro", "steps": ["ctrl+shift+t", {"wait": 0}, {"text": "a.b@c"}]},
+    ]))
+    registry = ActionRegistry()
+
+    assert registry.load_plugins(str(path)) == []
+    assert registry.execute("reopen_tab")
+    assert events(recording) == [("hotkey", ("ctrl", "shift", "t")), ("write", "a.b@c")]
+    assert registry.snapshot()["reopen_tab"]["calls"] == 1
+
+
+def test_macro_keys_are_checked_on_load(tmp_path, recording):
+    path = tmp_path / "actions.json"
+    path.write_text(json.dumps([
+        {"name": "zoom_in", "type": "macro", "steps": ["ctrl+="]},
+        {"name": "typo", "type": "macro", "steps": ["ctrl+shfit+t"]},
+    ]))
+    registry = ActionRegistry()
+
+    errors = registry.load_plugins(str(path))
+    assert errors == ["Action typo: Unknown key: shfit"]
+    assert registry.resolve("typo") is None
+    assert registry.execute("zoom_in")
+    assert events(recording) == [("hotkey", ("ctrl", "="))]
@@ -0,0 +1,90 @@
+import pytest
+
+from desktop_controller import DesktopController
+from os_helpers import FakeHelper, HelperError
+
+
+@pytest.fixture
+def helper():
+    helper = FakeHelper()
+    yield helper
+    helper.close()
+
+
+def test_warm_up_caches_levels(helper):
+    helper.warm_up()
+    requests = helper.process.requests
+
+    assert helper.adjust_level("volume", 8) == (50, 58)
+    assert helper.adjust_level("volume", -20) == (58, 38)
+    # Only the two writes reached the helper; the current level came from the cache.
+    assert helper.process.requests == requests + 2
+    assert helper.run("get volume") == "38"
+    assert helper.snapshot()["levels"] == {"volume": 38, "brightness": 50}
+
+
+def test_levels_are_clamped(helper):
+    assert helper.adjust_level("brightness", 80) == (50, 100)
+    assert helper.adjust_level("brightness", -150) == (100, 0)
+
+
+def test_expired_cache_reads_the_level_again():
+    helper = FakeHelper(cache_ttl=0)
+    try:
+        helper.adjust_level("volume", 10)
+        helper.run("set volume 20")
+        requests = helper.process.requests
+        assert helper.adjust_level("volume", 10) == (20, 30)
+        assert helper.process.requests == requests + 2
+    finally:
+        helper.close()
+
+
+def test_invalidate_drops_a_cached_level(helper):
+    helper.warm_up()
+    helper.run("set volume 20")
+    assert helper.adjust_level("volume", 1) == (50, 51)
+
+    helper.run("set volume 20")
+    helper.invalidate("volume")
+    assert helper.adjust_level("volume", 1) == (20, 21)
+
+
+def test_dead_helper_is_restarted(helper):
+    assert helper.run("get volume") == "50"
+    helper.process._process.kill()
+    helper.process._process.wait()
+
+    assert helper.run("get volume") == "50"
+    snapshot = helper.snapshot()
+    assert snapshot["alive"]
+    assert snapshot["restarts"] == 1
+    assert snapshot["failures"] == 0
+
+
+def test_command_that_kills_the_helper_fails_after_one_retry(helper):
+    with pytest.raises(HelperError):
+        helper.run("crash")
+    assert helper.snapshot()["failures"] == 1
+
+    # The next request starts a fresh helper.
+    assert helper.run("echo") == "echo"
+    assert helper.snapshot()["alive"]
+
+
+def test_failed_write_forgets_the_cached_level(helper):
+    helper.warm_up()
+    helper.set_level_command = lambda kind, value: "crash"
+    with pytest.raises(HelperError):
+        helper.adjust_level("volume", 5)
+    assert "volume" not in helper.snapshot()["levels"]
+
+
+def test_brightness_without_helper_is_unsupported(capsys):
+    controller = DesktopController()
+    controller.close()
+    controller._helper = None
+    controller._system = "Windows"
+
+    controller.adjust_brightness(1)
+    assert "unsupported" in capsys.readouterr().out
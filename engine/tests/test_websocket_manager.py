@@ -0,0 +1,62 @@
+import asyncio
+
+from websocket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, stuck=False):
+        self.stuck = stuck
+        self.sent = []
+        self.closed = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.stuck:
+            await asyncio.sleep(3600)
+        self.sent.append(text)
+
+    async def close(self, code=1000):
+        self.closed = code
+
+
+def test_events_are_never_dropped_and_stuck_clients_are_evicted():
+    async def scenario():
+        manager = ConnectionManager(max_pending=4, evict_after=0.2, send_timeout=10)
+        fast, stuck = FakeWebSocket(), FakeWebSocket(stuck=True)
+        await manager.connect(fast)
+        await manager.connect(stuck)
+
+        for i in range(10):
+            manager.publish({"type": "training_progress", "data": {"progress": i}})
+        await asyncio.sleep(0.05)
+        assert len(fast.sent) == 10
+        # One message is stuck in send_text, the other nine are still queued.
+        assert len(manager.clients[stuck].pending) == 9
+
+        # Nothing else is published: the backlog timer alone evicts the stuck client.
+        await asyncio.sleep(0.3)
+        assert list(manager.clients) == [fast]
+        assert manager.evicted == 1
+        assert stuck.closed == 1013
+
+    asyncio.run(scenario())
+
+
+def test_status_messages_are_coalesced():
+    async def scenario():
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket)
+
+        for fps in range(5):
+            manager.publish(manager.status_message(fps=fps))
+        manager.publish(manager.detection_message("1", "Thumbs Up", 0.9, "play_pause"))
+        await asyncio.sleep(0.05)
+
+        assert len(websocket.sent) == 2
+        assert '"fps": 4' in websocket.sent[1]
+        assert manager.snapshot()["coalesced"] == 4
+
+    asyncio.run(scenario())
@@ -0,0 +1,111 @@
+import multiprocessing
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _report(stage, percent, **extra):
+    if _progress_queue is not None:
+        _progress_queue.put(dict(stage=stage, progress=percent, timestamp=time.time(), **extra))
+
+
+def run_training(backend, augmentations, validate=False, data_root="data"):
+    """
+    Retrain the gesture model from the dataset store. Runs inside the worker process,
+    writes the new model to disk and returns a summary; the server process then loads it.
+    Held-out validation fits a second model from scratch, so it only runs when asked for;
+    otherwise the summary's accuracy is None.
+    """
+    from dataset_store import DatasetStore
+    from gesture_classifier import GestureClassifier
+
+    _report("loading", 0)
+    X, y = DatasetStore(data_root).matrix()
+    gestures = sorted(set(y.tolist()) - {""})
+    if not gestures:
+        return {"status": "empty"}
+
+    classifier = GestureClassifier(backend=backend, augmentations=augmentations)
+    classifier.backend_name = backend
+
+    accuracy = None
+    if validate:
+        _report("validate", 0)
+        accuracy = classifier.validate(X, y)
+        _report("validate", 100, accuracy=accuracy)
+
+    mode = classifier.train_matrix(X, y, progress=_report)
+    _report("done", 100)
+
+    return {
+        "status": "success",
+        "mode": mode,
+        "accuracy": accuracy,
+        "samples": int(np.count_nonzero(y != "")),
+        "gestures": gestures,
+    }
+
+
+def run_benchmark(backends, augmentations, data_root="data"):
+    """Compare classifier backends on the dataset store inside the worker process; returns their results."""
+    from dataset_store import DatasetStore
+    from gesture_classifier import GestureClassifier
+
+    X, y = DatasetStore(data_root).matrix()
+    live = y != ""
+    classifier = GestureClassifier(augmentations=augmentations, load=False)
+    return classifier.benchmark(X[live], y[live], backends=backends)
+
+
+def run_template_selection(sequences):
+    """Pick a motion gesture's templates and threshold (sequence_recognizer.build_templates)."""
+    from sequence_recognizer import build_templates
+    return build_templates(sequences)
+
+
+class TrainingRunner:
+    """
+    Single-slot process pool for model training, backend benchmarks and motion template
+    selection, so fitting never competes with the camera and detection threads for the
+    GIL. Progress events from the worker arrive on `progress_queue`.
+    """
+
+    def __init__(self):
+        self._ctx = multiprocessing.get_context("spawn")
+        self.progress_queue = self._ctx.Queue()
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=self._ctx,
+                initializer=_init_worker,
+                initargs=(self.progress_queue,),
+            )
+        return self._executor
+
+    def submit(self, backend, augmentations, validate=False):
+        return self._get_executor().submit(run_training, backend, list(augmentations), validate)
+
+    def submit_benchmark(self, backends, augmentations):
+        return self._get_executor().submit(run_benchmark, backends, list(augmentations))
+
+    def submit_templates(self, sequences):
+        return self._get_executor().submit(run_template_selection, sequences)
+
+    def reset(self):
+        """Drop a broken pool (e.g. the worker crashed); the next submit starts a fresh one."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self):
+        self.reset()
@@ -1,32 +1,191 @@
 from fastapi import WebSocket
-from typing import List
+from collections import deque
+from typing import Dict
+import asyncio
 import json
+import threading
 import time
 
+from frame_pipeline import LatencyStats
+
+# Messages of these types replace an unsent one of the same type instead of queueing.
+COALESCED_TYPES = ("status",)
+
+
+class _Client:
+    """One WebSocket with its own outbound queue and sender task."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.pending = deque()
+        self.latest = {}
+        self.wake = asyncio.Event()
+        self.task = None
+        self.backlog_since = None
+        self.sent = 0
+        self.coalesced = 0
+
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    """
+    Broadcasts to WebSocket clients without letting one client hold up the others.
+
+    Every client has a queue and a sender task. Events (detections, training progress)
+    are queued in order and never dropped; a status message replaces any status the
+    client has not been sent yet. A client whose queue stays at or above `max_pending`
+    for `evict_after` seconds, or whose send fails or takes longer than `send_timeout`,
+    is disconnected; a timer checks the backlog, so an otherwise idle client is evicted too.
+
+    Engine threads hand messages over with `submit`, which schedules them on the event
+    loop with call_soon_threadsafe, so there is no polling delay between a decision and
+    the send.
+    """
+
+    def __init__(self, max_pending=64, evict_after=2.0, send_timeout=2.0):
+        self.max_pending = max_pending
+        self.evict_after = evict_after
+        self.send_timeout = send_timeout
+        self.clients: Dict[WebSocket, _Client] = {}
+        self._loop = None
+        self._early = []
+        self._early_lock = threading.Lock()
+        self.evicted = 0
+        self.delivery = LatencyStats()
+
+    @property
+    def active_connections(self):
+        return list(self.clients)
+
+    def attach_loop(self, loop):
+        with self._early_lock:
+            self._loop = loop
+            early, self._early = self._early, []
+        for message in early:
+            loop.call_soon_threadsafe(self._dispatch, message, time.time())
+
+    def submit(self, message):
+        """Thread-safe: queue a message dict from any thread for all clients."""
+        loop = self._loop
+        if loop is None:
+            with self._early_lock:
+                if self._loop is None:
+                    self._early.append(message)
+                    return
+                loop = self._loop
+        try:
+            loop.call_soon_threadsafe(self._dispatch, message, time.time())
+        except RuntimeError:
+            # The event loop has closed (shutdown).
+            pass
+
+    # Same interface as the queue.Queue it replaces.
+    put = submit
+
+    def _dispatch(self, message, submitted):
+        try:
+            if message["type"] == "status":
+                message = self.status_message(**message["data"])
+            elif message["type"] == "detection":
+                message = self.detection_message(**message["data"])
+            self.publish(message, submitted)
+        except Exception as e:
+            print(f"Error dispatching message: {e}")
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        client = _Client(websocket)
+        self.clients[websocket] = client
+        client.task = asyncio.create_task(self._sender(client))
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: dict):
+        client = self.clients.pop(websocket, None)
+        if client is not None and client.task is not None and client.task is not asyncio.current_task():
+            client.task.cancel()
 
+    def publish(self, message: dict, submitted=None):
+        """Queue a message for every client; must be called on the event loop."""
         if "timestamp" not in message:
             message["timestamp"] = time.time() * 1000
-
         json_msg = json.dumps(message)
-        for connection in self.active_connections:
+        item = (json_msg, submitted if submitted is not None else time.time())
+        kind = message.get("type")
+        now = time.time()
+
+        for client in list(self.clients.values()):
+            if kind in COALESCED_TYPES:
+                if kind in client.latest:
+                    client.coalesced += 1
+                client.latest[kind] = item
+            else:
+                client.pending.append(item)
+                if len(client.pending) >= self.max_pending and client.backlog_since is None:
+                    client.backlog_since = now
+                    asyncio.get_running_loop().call_later(self.evict_after, self._check_backlog, client)
+            client.wake.set()
+
+    def _check_backlog(self, client):
+        """
+        Timer set when a client's queue fills up: evict it if the queue has stayed full since.
+        If the backlog cleared and built up again meanwhile, that later backlog has its own timer.
+        """
+        if self.clients.get(client.websocket) is not client or client.backlog_since is None:
+            return
+        if time.time() - client.backlog_since >= self.evict_after:
+            self._evict(client, "too slow")
+
+    async def broadcast(self, message: dict):
+        self.publish(message)
+
+    async def _sender(self, client):
+        websocket = client.websocket
+        try:
+            while True:
+                await client.wake.wait()
+                client.wake.clear()
+                while client.pending or client.latest:
+                    if client.pending:
+                        json_msg, submitted = client.pending.popleft()
+                    else:
+                        kind = next(iter(client.latest))
+                        json_msg, submitted = client.latest.pop(kind)
+                    try:
+                        await asyncio.wait_for(websocket.send_text(json_msg), self.send_timeout)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        self._evict(client, f"send failed: {e!r}")
+                        return
+                    client.sent += 1
+                    self.delivery.add(time.time() - submitted)
+                    if len(client.pending) < self.max_pending:
+                        client.backlog_since = None
+        except asyncio.CancelledError:
+            pass
+
+    def _evict(self, client, reason):
+        print(f"Disconnecting WebSocket client: {reason}")
+        self.evicted += 1
+        self.disconnect(client.websocket)
+
+        async def close():
             try:
-                await connection.send_text(json_msg)
-            except Exception as e:
-                print(f"Error sending to websocket: {e}")
+                await client.websocket.close(code=1013)
+            except Exception:
+                pass
 
-    async def send_status(self, camera_status="on", model_status="ready", detection_active=True, fps=0, total_detections=0, actions_executed=0, avg_confidence=0, confidence_threshold=0.80, speed_factor=1.0, cursor_mode=False):
+        asyncio.get_running_loop().create_task(close())
+
+    def snapshot(self):
+        return {
+            "clients": len(self.clients),
+            "evicted": self.evicted,
+            "queued": sum(len(c.pending) + len(c.latest) for c in self.clients.values()),
+            "coalesced": sum(c.coalesced for c in self.clients.values()),
+            "delivery": self.delivery.snapshot(),
+        }
+
+    @staticmethod
+    def status_message(camera_status="on", model_status="ready", detection_active=True, fps=0, total_detections=0, actions_executed=0, avg_confidence=0, confidence_threshold=0.80, speed_factor=1.0, cursor_mode=False, pipeline=None, governor=None, subsystems=None, tracker=None, memory=None):
         msg = {
             "type": "status",
             "data": {
@@ -42,9 +201,20 @@ class ConnectionManager:
                 "cursorMode": cursor_mode
             }
         }
-        await self.broadcast(msg)
+        if pipeline is not None:
+            msg["data"]["pipeline"] = pipeline
+        if governor is not None:
+            msg["data"]["governor"] = governor
+        if subsystems is not None:
+            msg["data"]["subsystems"] = subsystems
+        if tracker is not None:
+            msg["data"]["tracker"] = tracker
+        if memory is not None:
+            msg["data"]["memory"] = memory
+        return msg
 
-    async def send_detection(self, gesture_id, gesture_name, confidence, action, executed=False):
+    @staticmethod
+    def detection_message(gesture_id, gesture_name, confidence, action, executed=False, hand=None):
         msg = {
             "type": "detection",
             "data": {
@@ -55,6 +225,14 @@ class ConnectionManager:
                 "executed": executed
             }
         }
-        await self.broadcast(msg)
+        if hand is not None:
+            msg["data"]["hand"] = hand
+        return msg
+
+    async def send_status(self, **status):
+        self.publish(self.status_message(**status))
+
+    async def send_detection(self, **detection):
+        self.publish(self.detection_message(**detection))
 
 manager = ConnectionManager()